@@ -1,22 +1,29 @@
-import inspect
-from typing import Dict, Final
+from typing import TYPE_CHECKING, Final
 
-import fundus_evaluation
-from fundus_evaluation.scorers import Scorer
-from fundus_evaluation.scrapers import Scraper
+from fundus_evaluation.registry import LazyRegistry
+
+if TYPE_CHECKING:
+    from fundus_evaluation.scorers import Scorer
+    from fundus_evaluation.scrapers import Scraper
 
 __version__: Final[str] = "0.2.0"
 
 SCRAPER_PREFIX: Final[str] = "scrape_"
-SCRAPERS: Dict[str, Scraper] = {
-    name[len(SCRAPER_PREFIX) :]: function
-    for name, function in inspect.getmembers(fundus_evaluation.scrapers, lambda x: isinstance(x, Scraper))
-    if name.startswith(SCRAPER_PREFIX)
-}
+SCRAPER_ENTRY_POINT_GROUP: Final[str] = "fundus_evaluation.scrapers"
+SCRAPERS: "LazyRegistry[Scraper]" = LazyRegistry(
+    {
+        name: f"fundus_evaluation.scrapers:{SCRAPER_PREFIX}{name}"
+        for name in ("boilernet", "boilerpipe", "bte", "fundus", "justext", "newsplease", "trafilatura")
+    },
+    entry_point_group=SCRAPER_ENTRY_POINT_GROUP,
+)
 
 SCORER_PREFIX: Final[str] = "score_"
-SCORERS: Dict[str, Scorer] = {
-    name[len(SCORER_PREFIX) :]: function
-    for name, function in inspect.getmembers(fundus_evaluation.scorers, lambda x: isinstance(x, Scorer))
-    if name.startswith(SCORER_PREFIX)
-}
+SCORER_ENTRY_POINT_GROUP: Final[str] = "fundus_evaluation.scorers"
+SCORERS: "LazyRegistry[Scorer]" = LazyRegistry(
+    {
+        name: f"fundus_evaluation.scorers:{SCORER_PREFIX}{name}"
+        for name in ("fuzzy_paragraph_match", "paragraph_match", "rouge_lsum", "token_f1", "wer")
+    },
+    entry_point_group=SCORER_ENTRY_POINT_GROUP,
+)
@@ -1,10 +1,16 @@
 import argparse
+import contextlib
+import re
 import sys
 from pathlib import Path
-from typing import Any, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Match, Optional, Sequence, Union
 
 import fundus_evaluation
 
+if TYPE_CHECKING:
+    from fundus_evaluation.profiling import Profiler
+    from fundus_evaluation.telemetry import Telemetry
+
 
 class RawTextArgumentDefaultsHelpFormatter(argparse.RawTextHelpFormatter, argparse.ArgumentDefaultsHelpFormatter):
     pass
@@ -14,38 +20,141 @@ def none_or_int(value: str) -> Optional[int]:
     return None if value == "None" else int(value)
 
 
+class RangeAction(argparse.Action):
+    """Stores one value `X` or two values `MIN MAX` as the range `(MIN, MAX)`."""
+
+    def __call__(
+        self,
+        parser: argparse.ArgumentParser,
+        namespace: argparse.Namespace,
+        values: Union[str, Sequence[Any], None],
+        option_string: Optional[str] = None,
+    ) -> None:
+        assert isinstance(values, list)
+        if len(values) not in (1, 2):
+            raise argparse.ArgumentError(self, f"expected MIN or MIN MAX, but got {len(values)} values")
+        if values[0] > values[-1]:
+            raise argparse.ArgumentError(self, f"MIN {values[0]} is larger than MAX {values[-1]}")
+        setattr(namespace, self.dest, (values[0], values[-1]))
+
+
+_MEMORY_UNITS: Dict[str, int] = {"": 1, "K": 1024, "M": 1024**2, "G": 1024**3, "T": 1024**4}
+
+
+def memory_size(value: str) -> int:
+    """Parses a memory size in bytes with an optional binary unit, e.g. `512M` or `1.5G`."""
+    match: Optional[Match[str]] = re.fullmatch(r"\s*(\d+(?:\.\d+)?)\s*([KMGT]?)i?B?\s*", value, flags=re.IGNORECASE)
+    if match is None:
+        raise argparse.ArgumentTypeError(f"invalid memory size: {value!r}")
+    return int(float(match.group(1)) * _MEMORY_UNITS[match.group(2).upper()])
+
+
+def get_profiler(args: argparse.Namespace, default_directory: Path) -> Optional["Profiler"]:
+    if args.profile is None:
+        return None
+
+    from fundus_evaluation.profiling import Profiler
+
+    return Profiler(
+        default_directory if args.profile_directory is None else args.profile_directory,
+        mode=args.profile,
+        memory_top_n=args.profile_memory,
+    )
+
+
+def get_telemetry(args: argparse.Namespace) -> Optional["Telemetry"]:
+    if args.metrics_directory is None:
+        return None
+
+    from fundus_evaluation.telemetry import Telemetry
+
+    return Telemetry(args.metrics_directory, flush_interval=args.metrics_interval)
+
+
 def call_complexity(args: argparse.Namespace) -> None:
     from fundus_evaluation.entry_points.complexity import complexity
 
-    complexity(
-        ground_truth_path=args.ground_truth_path,
-        html_directory=args.html_directory,
-        output_path=args.output_path,
-    )
+    profiler: Optional["Profiler"] = get_profiler(args, args.output_path.parent / "profiles")
+    with profiler or contextlib.nullcontext():
+        complexity(
+            ground_truth_path=args.ground_truth_path,
+            html_directory=args.html_directory,
+            output_path=args.output_path,
+            num_workers=args.num_workers,
+            cache_path=args.cache_path,
+            extended=args.extended,
+            profiler=profiler,
+        )
 
 
 def call_scrape(args: argparse.Namespace) -> None:
     from fundus_evaluation.entry_points.scrape import scrape
 
-    scrape(
-        ground_truth_path=args.ground_truth_path,
-        html_directory=args.html_directory,
-        output_directory=args.output_directory,
-        scrapers=None if args.scrapers is None else set(args.scrapers),
-        exclude_scrapers=set(args.exclude_scrapers),
-    )
+    profiler: Optional["Profiler"] = get_profiler(args, args.output_directory / "profiles")
+    telemetry: Optional["Telemetry"] = get_telemetry(args)
+    with profiler or contextlib.nullcontext(), telemetry or contextlib.nullcontext():
+        scrape(
+            ground_truth_path=args.ground_truth_path,
+            html_directory=args.html_directory,
+            output_directory=args.output_directory,
+            scrapers=None if args.scrapers is None else set(args.scrapers),
+            exclude_scrapers=set(args.exclude_scrapers),
+            server=args.server,
+            profiler=profiler,
+            telemetry=telemetry,
+            num_workers=args.num_workers,
+            timings_path=args.timings_path,
+            memory_budget=args.memory_budget,
+            preload_workers=args.preload_workers,
+        )
 
 
 def call_score(args: argparse.Namespace) -> None:
     from fundus_evaluation.entry_points.score import score
 
-    score(
-        ground_truth_path=args.ground_truth_path,
-        extractions_directory=args.extractions_directory,
-        output_directory=args.output_directory,
-        scorers=None if args.scorers is None else set(args.scorers),
-        max_optional_paragraphs=args.max_optional_paragraphs,
-    )
+    profiler: Optional["Profiler"] = get_profiler(args, args.output_directory / "profiles")
+    telemetry: Optional["Telemetry"] = get_telemetry(args)
+    with profiler or contextlib.nullcontext(), telemetry or contextlib.nullcontext():
+        score(
+            ground_truth_path=args.ground_truth_path,
+            extractions_directory=args.extractions_directory,
+            output_directory=args.output_directory,
+            scorers=None if args.scorers is None else set(args.scorers),
+            max_optional_paragraphs=args.max_optional_paragraphs,
+            cache_path=args.cache_path,
+            persist_references=args.persist_references,
+            server=args.server,
+            profiler=profiler,
+            telemetry=telemetry,
+            batch_size=args.batch_size,
+            num_workers=args.num_workers,
+            timings_path=args.timings_path,
+            memory_budget=args.memory_budget,
+            preload_workers=args.preload_workers,
+            fast=args.fast,
+            calibration_size=args.calibration_size,
+        )
+
+
+def call_run(args: argparse.Namespace) -> None:
+    from fundus_evaluation.entry_points.run import run
+
+    telemetry: Optional["Telemetry"] = get_telemetry(args)
+    with telemetry or contextlib.nullcontext():
+        run(
+            ground_truth_path=args.ground_truth_path,
+            html_directory=args.html_directory,
+            output_directory=args.output_directory,
+            scrapers=None if args.scrapers is None else set(args.scrapers),
+            exclude_scrapers=set(args.exclude_scrapers),
+            scorers=None if args.scorers is None else set(args.scorers),
+            max_optional_paragraphs=args.max_optional_paragraphs,
+            cache_path=args.cache_path,
+            batch_size=args.batch_size,
+            num_resamples=args.num_resamples,
+            force=args.force,
+            telemetry=telemetry,
+        )
 
 
 def call_analysis(args: argparse.Namespace) -> None:
@@ -55,6 +164,182 @@ def call_analysis(args: argparse.Namespace) -> None:
         output_directory=args.output_directory,
         complexity_path=args.complexity_path,
         rouge_lsum_path=args.rouge_lsum_path,
+        num_resamples=args.num_resamples,
+        stratify=args.stratify,
+    )
+
+
+def call_aggregate(args: argparse.Namespace) -> None:
+    from fundus_evaluation.entry_points.aggregate import aggregate
+
+    aggregate(
+        output_directory=args.output_directory,
+        score_paths=args.score_paths,
+        summary_paths=args.summary_paths,
+        name=args.name,
+        chunk_size=args.chunk_size,
+        relative_accuracy=args.relative_accuracy,
+    )
+
+
+def call_serve(args: argparse.Namespace) -> None:
+    from fundus_evaluation.service import serve
+
+    serve(
+        host=args.host,
+        port=args.port,
+        scrapers=args.scrapers,
+        scorers=args.scorers,
+        num_workers=args.num_workers,
+        ground_truth_paths=args.ground_truth_paths,
+    )
+
+
+def call_convert(args: argparse.Namespace) -> None:
+    from fundus_evaluation.storage import convert
+
+    convert(input_path=args.input_path, output_path=args.output_path)
+
+
+def call_benchmark(args: argparse.Namespace) -> None:
+    from fundus_evaluation.entry_points.benchmark import benchmark
+
+    regressions = benchmark(
+        ground_truth_path=args.ground_truth_path,
+        html_directory=args.html_directory,
+        extractions_directory=args.extractions_directory,
+        scores_directory=args.scores_directory,
+        output_path=args.output_path,
+        baseline_path=args.baseline_path,
+        threshold=args.threshold,
+        select=args.select,
+        scales=args.scales,
+        repeats=args.repeats,
+        min_time=args.min_time,
+        update_baseline=args.update_baseline,
+    )
+    if regressions:
+        sys.exit(1)
+
+
+def call_synth(args: argparse.Namespace) -> None:
+    from fundus_evaluation.entry_points.synth import synth
+    from fundus_evaluation.synthesis import SynthesisConfig
+
+    synth(
+        ground_truth_path=args.ground_truth_path,
+        html_directory=args.html_directory,
+        output_directory=args.output_directory,
+        num_articles=args.num_articles,
+        extractions_directory=args.extractions_directory,
+        config=SynthesisConfig(
+            shuffle_rate=args.shuffle_rate,
+            duplicate_rate=args.duplicate_rate,
+            splice_rate=args.splice_rate,
+            perturb_rate=args.perturb_rate,
+            size_factor=args.size_factor,
+            optional_paragraphs=args.optional_paragraphs,
+            boilerplate_duplicates=args.boilerplate_duplicates,
+        ),
+        seed=args.seed,
+        allow_missing_publishers=args.allow_missing_publishers,
+    )
+
+
+def add_server_argument(parser: Any) -> None:
+    parser.add_argument(
+        "--server",
+        type=str,
+        default=None,
+        help=(
+            "URL of a running evaluation service, e.g. http://127.0.0.1:8765, to delegate the work to\n"
+            "(see the 'serve' entry point); per default, the work is performed in this process"
+        ),
+    )
+
+
+def add_profile_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--profile",
+        choices=("deterministic", "sampling"),
+        default=None,
+        help=(
+            "profile each scraper/scorer call separately, either deterministically with cProfile (<name>.pstats)\n"
+            "or by sampling the call stacks (<name>.collapsed, e.g. for flame graphs); per default, no profiling"
+        ),
+    )
+    parser.add_argument(
+        "--profile-directory",
+        type=Path,
+        default=None,
+        help="directory to save the profiles; per default, the 'profiles' directory next to the output",
+    )
+    parser.add_argument(
+        "--profile-memory",
+        type=int,
+        default=None,
+        metavar="N",
+        help="additionally report the top N allocation sites per profile with tracemalloc (<name>.memory.txt)",
+    )
+
+
+def add_telemetry_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "--metrics-directory",
+        type=Path,
+        default=None,
+        help=(
+            "directory to export the metrics in the Prometheus text format (metrics.prom)\n"
+            "and the trace spans as JSON lines (traces.jsonl); per default, no metrics are recorded"
+        ),
+    )
+    parser.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=10.0,
+        help="minimum number of seconds between updates of the metrics file",
+    )
+
+
+def add_scheduling_arguments(parser: Any) -> None:
+    parser.add_argument(
+        "-w",
+        "--num-workers",
+        type=int,
+        default=1,
+        help=(
+            "number of worker processes; the longest predicted tasks are dispatched first\n"
+            "per default, the work is performed in this process"
+        ),
+    )
+    parser.add_argument(
+        "--timings-path",
+        type=Path,
+        default=None,
+        help=(
+            "path to the recorded task timings that predict the tasks' run times with multiple workers;\n"
+            "per default, <ground_truth>.timings.json next to the ground truth file"
+        ),
+    )
+    parser.add_argument(
+        "--memory-budget",
+        type=memory_size,
+        default=None,
+        help=(
+            "maximum resident memory of all processes with multiple workers, e.g. 8G;\n"
+            "each worker runs a single scraper or scorer and workers are only started while the scrapers' or scorers'\n"
+            "declared or measured memory footprints fit into the budget\n"
+            "per default, the memory is not limited"
+        ),
+    )
+    parser.add_argument(
+        "--preload-workers",
+        action="store_true",
+        help=(
+            "load the scrapers' and scorers' models in the main process and fork the workers from it,\n"
+            "such that the workers share the loaded memory copy-on-write and start instantly (requires fork);\n"
+            "scrapers whose runtimes do not survive a fork, e.g. the JVM of boilerpipe, are loaded in each worker"
+        ),
     )
 
 
@@ -90,6 +375,30 @@ def add_complexity(subparsers: Any) -> None:
         required=True,
         help="path to save the complexity scores as TSV",
     )
+    scrape.add_argument(
+        "-w",
+        "--num-workers",
+        type=int,
+        default=1,
+        help="number of worker processes to parse the HTML files",
+    )
+    scrape.add_argument(
+        "-c",
+        "--cache-path",
+        type=Path,
+        default=None,
+        help="path to a JSON cache of DOM text token counts per HTML hash; per default, no cache will be used",
+    )
+    scrape.add_argument(
+        "-x",
+        "--extended",
+        action="store_true",
+        help=(
+            "additionally collect page structure statistics (DOM node count, maximum depth, leaf count,\n"
+            "text-to-markup ratio, link density, script/style share and DOM text token count)"
+        ),
+    )
+    add_profile_arguments(scrape)
 
 
 def add_scrape(subparsers: Any) -> None:
@@ -140,6 +449,10 @@ def add_scrape(subparsers: Any) -> None:
         default=set(),
         help="excluded scrapers from the evaluation; per default, no scrapers will be excluded",
     )
+    add_server_argument(scrape)
+    add_profile_arguments(scrape)
+    add_telemetry_arguments(scrape)
+    add_scheduling_arguments(scrape)
 
 
 def add_score(subparsers: Any) -> None:
@@ -186,6 +499,142 @@ def add_score(subparsers: Any) -> None:
         default=4,
         help="maximum number of variants of optional paragraphs from its powerset to include in the score calculation",
     )
+    score.add_argument(
+        "-c",
+        "--cache-path",
+        type=Path,
+        default=None,
+        help=(
+            "path to a persistent score cache; per default, no cache will be used\n"
+            "(only scores of changed reference or hypothesis articles will be recalculated)"
+        ),
+    )
+    score.add_argument(
+        "--persist-references",
+        action="store_true",
+        help=(
+            "persist the prepared reference articles next to the ground truth file\n"
+            "(reused on subsequent runs as long as the ground truth does not change)"
+        ),
+    )
+    score.add_argument(
+        "--batch-size",
+        type=int,
+        default=1024,
+        help="number of articles of an extraction file loaded and scored at once",
+    )
+    score.add_argument(
+        "--fast",
+        action="store_true",
+        help=(
+            "approximate the slow scorers, e.g. for quick checks of scraper changes; the deviation from the exact\n"
+            "scores is reported on a calibration subset and saved to fast_calibration.json in the output directory"
+        ),
+    )
+    score.add_argument(
+        "--calibration-size",
+        type=int,
+        default=50,
+        help="number of articles per scraper to compare the fast to the exact scores on; 0 disables the calibration",
+    )
+    add_server_argument(score)
+    add_profile_arguments(score)
+    add_telemetry_arguments(score)
+    add_scheduling_arguments(score)
+
+
+def add_run(subparsers: Any) -> None:
+    run = subparsers.add_parser(
+        "run",
+        help="run the scrape, score and analysis steps in one pass, skipping unchanged work",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    run.set_defaults(func=call_run)
+
+    run.add_argument(
+        "-t",
+        "--ground-truth-path",
+        type=Path,
+        required=True,
+        help="path to the dataset's ground truth file",
+    )
+    run.add_argument(
+        "-d",
+        "--html-directory",
+        type=Path,
+        required=True,
+        help=(
+            "path to dataset's HTML directory containing compressed HTML files "
+            "corresponding to ground truth article extractions"
+        ),
+    )
+    run.add_argument(
+        "-o",
+        "--output-directory",
+        type=Path,
+        required=True,
+        help=(
+            "directory to save the extractions, scores and analysis results\n"
+            "together with a manifest of the steps' input and output hashes"
+        ),
+    )
+    run.add_argument(
+        "-s",
+        "--scrapers",
+        nargs="+",
+        choices=fundus_evaluation.SCRAPERS.keys(),
+        default=None,
+        help="effective scrapers for the evaluation; per default, all available scrapers will be included",
+    )
+    run.add_argument(
+        "-e",
+        "--exclude-scrapers",
+        nargs="+",
+        choices=fundus_evaluation.SCRAPERS.keys(),
+        default=set(),
+        help="excluded scrapers from the evaluation; per default, no scrapers will be excluded",
+    )
+    run.add_argument(
+        "--scorers",
+        nargs="+",
+        choices=fundus_evaluation.SCORERS.keys(),
+        default=None,
+        help="effective scorers for the evaluation; per default, all available scorers will be included",
+    )
+    run.add_argument(
+        "-p",
+        "--max-optional-paragraphs",
+        type=none_or_int,
+        default=4,
+        help="maximum number of variants of optional paragraphs from its powerset to include in the score calculation",
+    )
+    run.add_argument(
+        "-c",
+        "--cache-path",
+        type=Path,
+        default=None,
+        help="path to a persistent score cache; per default, score_cache.sqlite in the output directory",
+    )
+    run.add_argument(
+        "--batch-size",
+        type=int,
+        default=16,
+        help="number of articles extracted and scored at once",
+    )
+    run.add_argument(
+        "-b",
+        "--num-resamples",
+        type=int,
+        default=10_000,
+        help="number of resamples for the analysis' bootstrap confidence intervals and paired significance tests",
+    )
+    run.add_argument(
+        "-f",
+        "--force",
+        action="store_true",
+        help="ignore the manifest of the previous run and recompute all steps",
+    )
+    add_telemetry_arguments(run)
 
 
 def add_analysis(subparsers: Any) -> None:
@@ -217,6 +666,349 @@ def add_analysis(subparsers: Any) -> None:
         default=None,
         help="path to calculated ROUGE-LSum scores as TSV",
     )
+    score.add_argument(
+        "-b",
+        "--num-resamples",
+        type=int,
+        default=10_000,
+        help=(
+            "number of resamples for the bootstrap confidence intervals and paired significance tests "
+            "of the ROUGE-LSum scores; 0 disables them"
+        ),
+    )
+    score.add_argument(
+        "--no-stratification",
+        dest="stratify",
+        action="store_false",
+        help="resample articles across all publishers instead of per publisher",
+    )
+
+
+def add_aggregate(subparsers: Any) -> None:
+    aggregate = subparsers.add_parser(
+        "aggregate",
+        help="summarize large or sharded score files with mergeable statistics",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    aggregate.set_defaults(func=call_aggregate)
+
+    aggregate.add_argument(
+        "-o",
+        "--output-directory",
+        type=Path,
+        required=True,
+        help=(
+            "directory to save the mergeable summary as <name>.summary.pkl and the summary tables as\n"
+            "<name>_scraper_summary.tsv and <name>_scraper_to_publisher_summary.tsv"
+        ),
+    )
+    aggregate.add_argument(
+        "-i",
+        "--score-paths",
+        nargs="+",
+        type=Path,
+        default=[],
+        help="paths to score files (.tsv, .arrow, .parquet) of the same scorer, e.g. shards, read in chunks",
+    )
+    aggregate.add_argument(
+        "-m",
+        "--summary-paths",
+        nargs="+",
+        type=Path,
+        default=[],
+        help="paths to summaries of previous runs or other shards to merge, e.g. rouge_lsum.summary.pkl",
+    )
+    aggregate.add_argument(
+        "-n",
+        "--name",
+        type=str,
+        default=None,
+        help="name of the output files; per default, the name of the first input file",
+    )
+    aggregate.add_argument(
+        "--chunk-size",
+        type=int,
+        default=100_000,
+        help="maximum number of score rows read at once",
+    )
+    aggregate.add_argument(
+        "--relative-accuracy",
+        type=float,
+        default=0.01,
+        help="relative accuracy of the quantile estimates",
+    )
+
+
+def add_serve(subparsers: Any) -> None:
+    from fundus_evaluation.service import DEFAULT_HOST, DEFAULT_PORT
+
+    serve = subparsers.add_parser(
+        "serve",
+        help="run a local evaluation service with warm scrapers and scorers",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    serve.set_defaults(func=call_serve)
+
+    serve.add_argument("--host", type=str, default=DEFAULT_HOST, help="host to bind the service to")
+    serve.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to bind the service to")
+    serve.add_argument(
+        "-s",
+        "--scrapers",
+        nargs="+",
+        choices=fundus_evaluation.SCRAPERS.keys(),
+        default=None,
+        help="scrapers to keep loaded; per default, all available scrapers will be loaded",
+    )
+    serve.add_argument(
+        "-c",
+        "--scorers",
+        nargs="+",
+        choices=fundus_evaluation.SCORERS.keys(),
+        default=None,
+        help="scorers to keep loaded; per default, all available scorers will be loaded",
+    )
+    serve.add_argument(
+        "-w",
+        "--num-workers",
+        type=int,
+        default=0,
+        help="number of warm worker processes; per default, requests are handled in the service process",
+    )
+    serve.add_argument(
+        "-t",
+        "--ground-truth-paths",
+        nargs="+",
+        type=Path,
+        default=None,
+        help=(
+            "ground truth files that clients may refer to by path, such that the references are prepared once;\n"
+            "per default, clients send the references with each request"
+        ),
+    )
+
+
+def add_convert(subparsers: Any) -> None:
+    convert = subparsers.add_parser(
+        "convert",
+        help="convert articles or scores between the JSON/TSV and columnar Arrow/Parquet formats",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    convert.set_defaults(func=call_convert)
+
+    convert.add_argument(
+        "-i",
+        "--input-path",
+        type=Path,
+        required=True,
+        help="path to the articles (.json, .arrow, .parquet) or scores (.tsv, .arrow, .parquet) to convert",
+    )
+    convert.add_argument(
+        "-o",
+        "--output-path",
+        type=Path,
+        required=True,
+        help="path to save the converted file; the format is determined by the file suffix",
+    )
+
+
+def add_benchmark(subparsers: Any) -> None:
+    benchmark = subparsers.add_parser(
+        "benchmark",
+        help="run the performance benchmarks and fail on regressions compared to a baseline",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    benchmark.set_defaults(func=call_benchmark)
+
+    benchmark.add_argument(
+        "-t",
+        "--ground-truth-path",
+        type=Path,
+        required=True,
+        help="path to the dataset's ground truth file",
+    )
+    benchmark.add_argument(
+        "-d",
+        "--html-directory",
+        type=Path,
+        required=True,
+        help="path to the dataset's HTML directory",
+    )
+    benchmark.add_argument(
+        "-e",
+        "--extractions-directory",
+        type=Path,
+        default=None,
+        help=(
+            "path to the extractions directory to benchmark the extraction loading;\n"
+            "the scorers are benchmarked with the BTE extractions, if present, and the ground truth otherwise"
+        ),
+    )
+    benchmark.add_argument(
+        "--scores-directory",
+        type=Path,
+        default=None,
+        help="path to the scores directory to benchmark the score loading",
+    )
+    benchmark.add_argument(
+        "-o",
+        "--output-path",
+        type=Path,
+        default=None,
+        help="path to save the results as JSON",
+    )
+    benchmark.add_argument(
+        "-b",
+        "--baseline-path",
+        type=Path,
+        default=None,
+        help=(
+            "path to the baseline results as JSON; if the file does not exist, the results are saved as the baseline.\n"
+            "The command fails if a benchmark's minimum time exceeds its baseline by more than the threshold"
+        ),
+    )
+    benchmark.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="maximum tolerated relative slowdown compared to the baseline, e.g. 0.25 for 25%%",
+    )
+    benchmark.add_argument(
+        "-k",
+        "--select",
+        type=str,
+        default=None,
+        help="regular expression to select the benchmarks by name, e.g. 'scrape/bte|score/'",
+    )
+    benchmark.add_argument(
+        "--scales",
+        type=int,
+        nargs="*",
+        default=[10],
+        help="factors of the synthetic inputs with the articles' bodies repeated accordingly",
+    )
+    benchmark.add_argument(
+        "-r",
+        "--repeats",
+        type=int,
+        default=5,
+        help="number of timed repeats per benchmark",
+    )
+    benchmark.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="minimum time in seconds per repeat; fast benchmarks are called multiple times per repeat",
+    )
+    benchmark.add_argument(
+        "-u",
+        "--update-baseline",
+        action="store_true",
+        help="replace the baseline of the run benchmarks with the results",
+    )
+
+
+def add_synth(subparsers: Any) -> None:
+    synth = subparsers.add_parser(
+        "synth",
+        help="generate a large synthetic corpus from the dataset for scale testing",
+        formatter_class=RawTextArgumentDefaultsHelpFormatter,
+    )
+    synth.set_defaults(func=call_synth)
+
+    synth.add_argument(
+        "-t",
+        "--ground-truth-path",
+        type=Path,
+        required=True,
+        help="path to the dataset's ground truth file",
+    )
+    synth.add_argument(
+        "-d",
+        "--html-directory",
+        type=Path,
+        required=True,
+        help="path to the dataset's HTML directory",
+    )
+    synth.add_argument(
+        "-e",
+        "--extractions-directory",
+        type=Path,
+        default=None,
+        help="path to the dataset's extractions directory to generate synthetic extractions of each scraper",
+    )
+    synth.add_argument(
+        "-o",
+        "--output-directory",
+        type=Path,
+        required=True,
+        help="directory to save the synthetic corpus (ground_truth.json, html/ and extractions/)",
+    )
+    synth.add_argument(
+        "-n",
+        "--num-articles",
+        type=int,
+        required=True,
+        help="number of synthetic articles",
+    )
+    synth.add_argument(
+        "--seed",
+        type=int,
+        default=0,
+        help="random seed; the corpus is deterministic given the seed, the options and the dataset",
+    )
+    synth.add_argument(
+        "--shuffle-rate",
+        type=float,
+        default=0.1,
+        help="share of paragraphs that are shuffled among each other",
+    )
+    synth.add_argument(
+        "--duplicate-rate",
+        type=float,
+        default=0.05,
+        help="probability of duplicating a paragraph",
+    )
+    synth.add_argument(
+        "--splice-rate",
+        type=float,
+        default=0.1,
+        help="probability of replacing a paragraph with a paragraph (and DOM subtree) of another page of the publisher",
+    )
+    synth.add_argument(
+        "--perturb-rate",
+        type=float,
+        default=0.1,
+        help="probability of perturbing a paragraph's text by swapping two words",
+    )
+    synth.add_argument(
+        "--size-factor",
+        type=float,
+        nargs="+",
+        action=RangeAction,
+        default=(1.0, 1.0),
+        metavar=("MIN", "MAX"),
+        help=(
+            "number of paragraphs relative to the source page, or a range to sample from;\n"
+            "larger pages are filled with paragraphs of other pages of the publisher"
+        ),
+    )
+    synth.add_argument(
+        "--optional-paragraphs",
+        type=int,
+        default=None,
+        help="exact number of optional paragraphs per article; per default, the source page's optional paragraphs",
+    )
+    synth.add_argument(
+        "--boilerplate-duplicates",
+        type=int,
+        default=0,
+        help="number of duplicated boilerplate DOM subtrees per page to increase the page size",
+    )
+    synth.add_argument(
+        "--allow-missing-publishers",
+        action="store_true",
+        help="leave out publishers whose pages are all skipped instead of failing",
+    )
 
 
 def parse_args(argv: List[str]) -> argparse.Namespace:
@@ -232,7 +1024,13 @@ def parse_args(argv: List[str]) -> argparse.Namespace:
     add_complexity(subparsers)
     add_scrape(subparsers)
     add_score(subparsers)
+    add_run(subparsers)
     add_analysis(subparsers)
+    add_aggregate(subparsers)
+    add_serve(subparsers)
+    add_convert(subparsers)
+    add_benchmark(subparsers)
+    add_synth(subparsers)
 
     return parser.parse_args(argv)
 
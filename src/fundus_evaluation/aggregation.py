@@ -0,0 +1,238 @@
+import dataclasses
+import math
+import pickle
+from pathlib import Path
+from typing import Final, Iterable, List, Optional, Sequence, Tuple, Union
+
+import more_itertools
+import numpy as np
+import numpy.typing as npt
+import pandas as pd
+
+from fundus_evaluation.storage import iter_scores
+
+GROUP_LEVELS: Final[Tuple[str, ...]] = ("scraper", "publisher")
+DEFAULT_QUANTILES: Final[Tuple[float, ...]] = (0.25, 0.5, 0.75)
+DEFAULT_RELATIVE_ACCURACY: Final[float] = 0.01
+
+# The number of summaries folded into the running summary at once
+MERGE_GROUP_SIZE: Final[int] = 16
+
+_MOMENT_LEVELS: Final[List[str]] = [*GROUP_LEVELS, "column"]
+_SKETCH_LEVELS: Final[List[str]] = [*_MOMENT_LEVELS, "bucket"]
+
+# Values below the minimum indexable value are counted in a dedicated bucket and estimated as zero
+_MIN_INDEXABLE_VALUE: Final[float] = 1e-9
+_ZERO_BUCKET: Final[int] = int(np.iinfo(np.int64).min)
+
+
+def get_publishers(articles: "pd.Series[str]") -> "pd.Series[str]":
+    """Derives the publishers from the article identifiers, e.g. "APNews" from "APNews_0.html.gz".
+
+    The identifier pattern is only matched once per unique article identifier.
+    """
+    codes, unique_articles = pd.factorize(articles)
+    publishers: "pd.Index[str]" = pd.Index(unique_articles).str.replace(r"_\d+\.html\.gz", "", regex=True)
+    result: "pd.Series[str]" = pd.Series(np.asarray(publishers)[codes], index=articles.index, name=articles.name)
+    return result
+
+
+def _combine_moments(moments: pd.DataFrame, levels: List[str]) -> pd.DataFrame:
+    """Combines the count, mean and M2 of all partial states sharing the given index levels.
+
+    The partial states are pooled with the parallel algorithm of Chan et al.
+    """
+    grouped_counts = moments["count"].groupby(levels)
+    counts: "pd.Series[float]" = grouped_counts.transform("sum")
+    means: "pd.Series[float]" = (moments["count"] * moments["mean"]).groupby(levels).transform("sum") / counts
+
+    combined: pd.DataFrame = pd.DataFrame(
+        {
+            "count": grouped_counts.sum(),
+            "mean": means.groupby(levels).first(),
+            "m2": (moments["m2"] + moments["count"] * (moments["mean"] - means) ** 2).groupby(levels).sum(),
+        }
+    )
+    return combined
+
+
+@dataclasses.dataclass
+class ScoreSummary:
+    """Mergeable summary statistics of score columns per scraper and publisher.
+
+    For each (scraper, publisher, column) group, the summary keeps the count, mean and sum of squared deviations
+    (M2) of the scores and a logarithmically bucketed quantile sketch with bounded relative error (cf. DDSketch).
+    Summaries of chunks, shards or previous runs can be merged without rereading the scores.
+    """
+
+    moments: pd.DataFrame  # Index: (scraper, publisher, column); Columns: count, mean, m2
+    sketches: "pd.Series[int]"  # Index: (scraper, publisher, column, bucket); Values: bucket counts
+    columns: List[str]
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY
+
+    @property
+    def gamma(self) -> float:
+        return (1 + self.relative_accuracy) / (1 - self.relative_accuracy)
+
+    @classmethod
+    def from_scores(cls, scores: pd.DataFrame, relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY) -> "ScoreSummary":
+        """Summarizes scores with the columns "scraper", "article" and any numeric score columns.
+
+        Raises:
+            ValueError: If the scores contain negative values.
+        """
+        columns: List[str] = [
+            str(column) for column in scores.select_dtypes("number").columns if column not in ("scraper", "article")
+        ]
+        values: pd.DataFrame = (
+            scores[["scraper", *columns]]
+            .assign(publisher=get_publishers(scores["article"]))
+            .melt(id_vars=list(GROUP_LEVELS), value_vars=columns, var_name="column", value_name="value")
+            .dropna(subset=["value"])
+        )
+
+        moments: pd.DataFrame = values.groupby(_MOMENT_LEVELS, sort=True)["value"].agg(["count", "mean", "var"])
+        moments["m2"] = moments.pop("var").fillna(0.0) * (moments["count"] - 1)
+        moments["count"] = moments["count"].astype(np.float64)
+
+        array: npt.NDArray[np.float64] = values["value"].to_numpy(dtype=np.float64)
+        if (array < 0).any():
+            raise ValueError("The quantile sketches only support non-negative scores")
+
+        gamma: float = (1 + relative_accuracy) / (1 - relative_accuracy)
+        buckets: npt.NDArray[np.int64] = np.full(len(array), _ZERO_BUCKET, dtype=np.int64)
+        indexable: npt.NDArray[np.bool_] = array >= _MIN_INDEXABLE_VALUE
+        buckets[indexable] = np.ceil(np.log(array[indexable]) / math.log(gamma)).astype(np.int64)
+        sketches: "pd.Series[int]" = values[_MOMENT_LEVELS].assign(bucket=buckets).value_counts(sort=False).sort_index()
+
+        return cls(moments=moments, sketches=sketches, columns=columns, relative_accuracy=relative_accuracy)
+
+    @classmethod
+    def from_files(
+        cls,
+        paths: Iterable[Union[str, Path]],
+        chunk_size: int = 100_000,
+        relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+    ) -> "ScoreSummary":
+        """Summarizes score files chunk by chunk, such that only one chunk is kept in memory.
+
+        Args:
+            paths: The paths to the `.tsv`, `.arrow` or `.parquet` score files of a single scorer, e.g. shards.
+            chunk_size: The maximum number of rows per chunk.
+            relative_accuracy: The relative accuracy of the quantile sketches.
+
+        Returns:
+            The summary of all scores.
+        """
+        return cls.merge_all(
+            cls.from_scores(chunk, relative_accuracy)
+            for path in paths
+            for chunk in iter_scores(path, chunk_size=chunk_size)
+        )
+
+    @classmethod
+    def merge_all(cls, summaries: Iterable["ScoreSummary"]) -> "ScoreSummary":
+        """Merges summaries, e.g. of chunks, shards or previous runs.
+
+        The summaries are consumed lazily and folded into the running summary in groups of `MERGE_GROUP_SIZE`,
+        such that the memory usage does not grow with the number of summaries.
+
+        Raises:
+            ValueError: If no summaries are given or their relative accuracies differ.
+        """
+        merged: Optional[ScoreSummary] = None
+        for group in more_itertools.chunked(summaries, MERGE_GROUP_SIZE):
+            merged = cls._merge_group(group if merged is None else [merged, *group])
+
+        if merged is None:
+            raise ValueError("At least one summary is required")
+        return merged
+
+    @classmethod
+    def _merge_group(cls, summaries: List["ScoreSummary"]) -> "ScoreSummary":
+        relative_accuracies = {summary.relative_accuracy for summary in summaries}
+        if len(relative_accuracies) != 1:
+            raise ValueError(f"Cannot merge summaries with different relative accuracies {sorted(relative_accuracies)}")
+
+        if len(summaries) == 1:
+            return summaries[0]
+
+        columns: List[str] = list(dict.fromkeys(column for summary in summaries for column in summary.columns))
+        return cls(
+            moments=_combine_moments(pd.concat([summary.moments for summary in summaries]), _MOMENT_LEVELS),
+            sketches=pd.concat([summary.sketches for summary in summaries]).groupby(_SKETCH_LEVELS).sum(),
+            columns=columns,
+            relative_accuracy=relative_accuracies.pop(),
+        )
+
+    def merge(self, other: "ScoreSummary") -> "ScoreSummary":
+        return self.merge_all([self, other])
+
+    def quantiles(
+        self, levels: Sequence[str] = GROUP_LEVELS, quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> pd.DataFrame:
+        """Estimates quantiles from the merged sketches of the groups with the given levels.
+
+        Returns:
+            The quantiles indexed by the levels and the column with one column per quantile.
+        """
+        sketches: "pd.Series[int]" = self.sketches.groupby([*levels, "column", "bucket"]).sum()
+
+        records: List[List[float]] = []
+        for _, sketch in sketches.groupby([*levels, "column"], sort=True):
+            buckets: npt.NDArray[np.int64] = sketch.index.get_level_values("bucket").to_numpy()
+            cumulative_counts: npt.NDArray[np.int64] = np.cumsum(sketch.to_numpy())
+            # Nearest-rank estimation of the quantiles' buckets
+            ranks: npt.NDArray[np.float64] = np.asarray(quantiles) * (cumulative_counts[-1] - 1)
+            quantile_buckets: npt.NDArray[np.int64] = buckets[np.searchsorted(cumulative_counts, ranks, side="right")]
+            records.append(
+                [
+                    0.0 if bucket == _ZERO_BUCKET else 2 * self.gamma**bucket / (self.gamma + 1)
+                    for bucket in quantile_buckets
+                ]
+            )
+
+        return pd.DataFrame(
+            records,
+            index=sketches.index.droplevel("bucket").unique(),
+            columns=[f"p{quantile * 100:g}" for quantile in quantiles],
+        )
+
+    def summarize(
+        self, levels: Sequence[str] = GROUP_LEVELS, quantiles: Sequence[float] = DEFAULT_QUANTILES
+    ) -> pd.DataFrame:
+        """Returns the count, mean, sample standard deviation and quantiles of each column per group.
+
+        Args:
+            levels: The group levels, e.g. ("scraper",) or ("scraper", "publisher").
+            quantiles: The quantiles to estimate.
+
+        Returns:
+            The summary indexed by the levels with a (column, statistic) column index.
+        """
+        moments: pd.DataFrame = _combine_moments(self.moments, [*levels, "column"])
+        statistics: pd.DataFrame = pd.concat(
+            [
+                moments["count"].astype(np.int64),
+                moments["mean"],
+                np.sqrt(moments["m2"] / (moments["count"] - 1)).where(moments["count"] > 1).rename("std"),
+                self.quantiles(levels, quantiles),
+            ],
+            axis=1,
+        )
+        summary = statistics.unstack("column")
+        assert isinstance(summary, pd.DataFrame)
+        summary.columns = pd.MultiIndex.from_arrays(
+            [summary.columns.get_level_values(1).to_numpy(), summary.columns.get_level_values(0).to_numpy()]
+        )
+        return summary[[column for column in self.columns if column in summary.columns.get_level_values(0)]]
+
+    def save(self, path: Union[str, Path]) -> None:
+        with Path(path).open("wb") as summary_file:
+            pickle.dump(self, summary_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "ScoreSummary":
+        with Path(path).open("rb") as summary_file:
+            summary: ScoreSummary = pickle.load(summary_file)
+        return summary
@@ -1,13 +1,19 @@
+import dataclasses
+import functools
+import itertools
 from pathlib import Path
-from typing import Dict, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple, Union
 
 import numpy as np
+import numpy.typing as npt
 import pandas as pd
-import seaborn as sns
-from matplotlib import pyplot as plt
 
-# Set plot theme
-sns.set_theme(style="whitegrid", palette="muted")
+from fundus_evaluation.aggregation import get_publishers
+
+if TYPE_CHECKING:
+    import seaborn as sns
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
 
 SCRAPER_DISPLAY_NAMES: Dict[str, str] = {
     "boilernet": "BoilerNet",
@@ -19,16 +25,266 @@ SCRAPER_DISPLAY_NAMES: Dict[str, str] = {
     "trafilatura": "Trafilatura",
 }
 
+SCORE_COLUMNS: Tuple[str, ...] = ("precision", "recall", "f1_score")
+
+# Upper bound of elements of a resampling weight matrix per batch
+_MAX_RESAMPLING_BATCH_ELEMENTS: int = 2**24
+
+# Number of rows above which the strip plots are rendered from aggregated score distributions
+MAX_STRIPPLOT_ROWS: int = 10_000
+
+
+@functools.lru_cache(maxsize=None)
+def _set_plot_theme() -> None:
+    """Sets the plot theme once before the first plot is drawn."""
+    import seaborn as sns
+
+    sns.set_theme(style="whitegrid", palette="muted")
+
+
+@dataclasses.dataclass(frozen=True)
+class ScoreHistograms:
+    """Per-scraper histograms of score columns."""
+
+    scrapers: List[str]
+    columns: List[str]
+    bin_edges: npt.NDArray[np.float64]  # Shape: (num_bins + 1,)
+    counts: npt.NDArray[np.int64]  # Shape: (num_columns, num_scrapers, num_bins)
+    means: npt.NDArray[np.float64]  # Shape: (num_columns, num_scrapers)
+
+    @classmethod
+    def from_scores(
+        cls,
+        scores: pd.DataFrame,
+        columns: Tuple[str, ...] = SCORE_COLUMNS,
+        num_bins: int = 100,
+        value_range: Tuple[float, float] = (0.0, 1.0),
+    ) -> "ScoreHistograms":
+        """Computes the histograms and means of all scrapers and columns in one vectorized pass.
+
+        Args:
+            scores: The scores with a "scraper" column and the score columns.
+            columns: The score columns to aggregate.
+            num_bins: The number of equal-width bins.
+            value_range: The lower and upper bound of the bins. Values outside the range are clipped.
+
+        Returns:
+            The histograms. NaN scores are ignored.
+        """
+        codes, scrapers = pd.factorize(scores["scraper"], sort=True)
+        values: npt.NDArray[np.float64] = scores[list(columns)].to_numpy(dtype=np.float64)
+        valid: npt.NDArray[np.bool_] = ~np.isnan(values)
+
+        lower, upper = value_range
+        bin_indices: npt.NDArray[np.int64] = np.clip(
+            ((np.nan_to_num(values, nan=lower) - lower) / (upper - lower) * num_bins).astype(np.int64), 0, num_bins - 1
+        )
+        # Flat index of each (column, scraper) group and of each (column, scraper, bin) cell
+        groups: npt.NDArray[np.int64] = np.arange(len(columns)) * len(scrapers) + codes[:, np.newaxis]
+        cells: npt.NDArray[np.int64] = groups * num_bins + bin_indices
+
+        num_groups: int = len(columns) * len(scrapers)
+        counts: npt.NDArray[np.int64] = np.bincount(cells[valid], minlength=num_groups * num_bins)
+        sums: npt.NDArray[np.float64] = np.bincount(groups[valid], weights=values[valid], minlength=num_groups).astype(
+            np.float64
+        )
+        num_valid: npt.NDArray[np.int64] = np.bincount(groups[valid], minlength=num_groups)
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means: npt.NDArray[np.float64] = sums / num_valid
+
+        return cls(
+            scrapers=[str(scraper) for scraper in scrapers],
+            columns=list(columns),
+            bin_edges=np.linspace(lower, upper, num_bins + 1),
+            counts=counts.reshape(len(columns), len(scrapers), num_bins),
+            means=means.reshape(len(columns), len(scrapers)),
+        )
+
+    def quantiles(self, q: npt.ArrayLike) -> npt.NDArray[np.float64]:
+        """Approximates quantiles from the histograms by linear interpolation within the bins.
+
+        Returns:
+            The quantiles with the shape (num_columns, num_scrapers, len(q)).
+        """
+        q = np.asarray(q, dtype=np.float64)
+        cumulative: npt.NDArray[np.float64] = np.cumsum(self.counts, axis=-1, dtype=np.float64)
+        cumulative = np.concatenate([np.zeros((*cumulative.shape[:-1], 1)), cumulative], axis=-1)
+
+        result: npt.NDArray[np.float64] = np.full((*self.counts.shape[:-1], len(q)), np.nan)
+        for index in np.ndindex(*self.counts.shape[:-1]):
+            total: float = cumulative[index][-1]
+            if total > 0:
+                result[index] = np.interp(q * total, cumulative[index], self.bin_edges)
+        return result
+
+    def order(self, column: str) -> List[str]:
+        """Returns the scrapers sorted in descending order by their mean score of the given column."""
+        means: npt.NDArray[np.float64] = self.means[self.columns.index(column)]
+        return [self.scrapers[index] for index in np.argsort(-np.nan_to_num(means, nan=-np.inf), kind="stable")]
+
+
+def _draw_aggregated_violins(
+    ax: "Axes", histograms: ScoreHistograms, column: str, order: List[str], width: float = 0.8
+) -> None:
+    """Draws violins with inner boxes from the histograms of one column, similar to seaborn's violin plot."""
+    column_index: int = histograms.columns.index(column)
+    bin_centers: npt.NDArray[np.float64] = (histograms.bin_edges[:-1] + histograms.bin_edges[1:]) / 2
+    quartiles: npt.NDArray[np.float64] = histograms.quantiles([0.25, 0.5, 0.75])[column_index]
+
+    for position, scraper in enumerate(order):
+        scraper_index: int = histograms.scrapers.index(scraper)
+        counts: npt.NDArray[np.int64] = histograms.counts[column_index, scraper_index]
+        if counts.max(initial=0) == 0:
+            continue
+
+        half_widths: npt.NDArray[np.float64] = counts / counts.max() * width / 2
+        ax.fill_betweenx(
+            bin_centers, position - half_widths, position + half_widths, color=f"C{position}", alpha=0.7, linewidth=0
+        )
+
+        first_quartile, median, third_quartile = quartiles[scraper_index]
+        ax.vlines(position, first_quartile, third_quartile, color="0.25", linewidth=4)
+        ax.scatter([position], [median], color="white", s=12, zorder=3)
+
+    ax.set_xticks(range(len(order)))
+    ax.set_xticklabels([SCRAPER_DISPLAY_NAMES.get(scraper, scraper) for scraper in order], rotation=45)
+
+
+def _show_or_save(figure: "Figure", path: Optional[Path]) -> None:
+    from matplotlib import pyplot as plt
+
+    if path is None:
+        plt.show()
+    else:
+        figure.savefig(path, dpi=300)
+    plt.close(figure)
+
+
+def _to_score_matrix(scores: pd.DataFrame, column: str) -> pd.DataFrame:
+    """Pivots the scores of a column to an article-by-scraper matrix."""
+    return scores.pivot(index="article", columns="scraper", values=column).sort_index(axis=0).sort_index(axis=1)
+
+
+def _draw_bootstrap_weights(
+    rng: np.random.Generator, strata: npt.NDArray[np.int64], num_resamples: int
+) -> npt.NDArray[np.int64]:
+    """Draws bootstrap resamples as weight matrix of shape (num_resamples, num_articles).
+
+    Each row contains how often each article has been drawn. The articles are resampled within their stratum,
+    so that each resample preserves the number of articles per stratum.
+    """
+    num_articles: int = len(strata)
+    order: npt.NDArray[np.int64] = np.argsort(strata, kind="stable")
+    sorted_strata: npt.NDArray[np.int64] = strata[order]
+    stratum_sizes: npt.NDArray[np.int64] = np.bincount(strata)
+    stratum_starts: npt.NDArray[np.int64] = np.cumsum(stratum_sizes) - stratum_sizes
+
+    # Draw a position within the stratum of each sorted article position for all resamples at once
+    offsets: npt.NDArray[np.int64] = (rng.random((num_resamples, num_articles)) * stratum_sizes[sorted_strata]).astype(
+        np.int64
+    )
+    drawn: npt.NDArray[np.int64] = order[stratum_starts[sorted_strata] + offsets]
+
+    flat_indices: npt.NDArray[np.int64] = (np.arange(num_resamples)[:, np.newaxis] * num_articles + drawn).ravel()
+    return np.bincount(flat_indices, minlength=num_resamples * num_articles).reshape(num_resamples, num_articles)
+
+
+def _iter_batch_sizes(num_resamples: int, num_articles: int) -> List[int]:
+    batch_size: int = max(1, min(num_resamples, _MAX_RESAMPLING_BATCH_ELEMENTS // max(1, num_articles)))
+    return [min(batch_size, num_resamples - start) for start in range(0, num_resamples, batch_size)]
+
+
+def bootstrap_means(
+    matrix: npt.NDArray[np.float64],
+    strata: Optional[npt.NDArray[np.int64]] = None,
+    num_resamples: int = 10_000,
+    seed: int = 1,
+) -> npt.NDArray[np.float64]:
+    """Calculates the column means of bootstrap resamples of the matrix's rows.
+
+    Each batch of resamples is evaluated with a single matrix multiplication of the resampling weights
+    with the score matrix. NaN values are ignored.
+
+    Args:
+        matrix: The score matrix of shape (num_articles, num_scrapers).
+        strata: Optional stratum codes of shape (num_articles,), e.g. the articles' publishers.
+            If provided, the articles are resampled within their stratum.
+        num_resamples: The number of bootstrap resamples.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The resampled means of shape (num_resamples, num_scrapers).
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+    if strata is None:
+        strata = np.zeros(len(matrix), dtype=np.int64)
+
+    valid: npt.NDArray[np.float64] = (~np.isnan(matrix)).astype(np.float64)
+    filled: npt.NDArray[np.float64] = np.nan_to_num(matrix, nan=0.0)
+
+    means: List[npt.NDArray[np.float64]] = []
+    for batch_size in _iter_batch_sizes(num_resamples, len(matrix)):
+        weights: npt.NDArray[np.float64] = _draw_bootstrap_weights(rng, strata, batch_size).astype(np.float64)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means.append((weights @ filled) / (weights @ valid))
+    return np.concatenate(means)
+
+
+def approximate_randomization_p_values(
+    differences: npt.NDArray[np.float64], num_resamples: int = 10_000, seed: int = 1
+) -> npt.NDArray[np.float64]:
+    """Calculates two-sided approximate randomization p-values of paired score differences.
+
+    Under the null hypothesis, the scores of both systems are exchangeable for each article.
+    Thus, each resample randomly flips the sign of the articles' differences.
+    Each batch of resamples is evaluated with a single matrix multiplication for all pairs at once.
+
+    Args:
+        differences: The paired differences of shape (num_articles, num_pairs). NaN values are ignored.
+        num_resamples: The number of random permutations.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The p-values of shape (num_pairs,).
+    """
+    rng: np.random.Generator = np.random.default_rng(seed)
+
+    counts: npt.NDArray[np.float64] = (~np.isnan(differences)).sum(axis=0).astype(np.float64)
+    filled: npt.NDArray[np.float64] = np.nan_to_num(differences, nan=0.0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        observed: npt.NDArray[np.float64] = np.abs(filled.sum(axis=0) / counts)
+
+    num_extreme: npt.NDArray[np.int64] = np.zeros(differences.shape[1], dtype=np.int64)
+    for batch_size in _iter_batch_sizes(num_resamples, len(differences)):
+        signs: npt.NDArray[np.float64] = rng.choice([-1.0, 1.0], size=(batch_size, len(differences)))
+        with np.errstate(invalid="ignore", divide="ignore"):
+            permuted: npt.NDArray[np.float64] = np.abs((signs @ filled) / counts)
+        # Tolerance against floating point noise for permutations equivalent to the observation
+        num_extreme += (permuted >= observed - 1e-12).sum(axis=0)
+
+    return (num_extreme + 1) / (num_resamples + 1)
+
 
 def draw_complexity_boxplot(complexity: pd.DataFrame, out: Union[str, Path, None] = None) -> None:
-    complexity = complexity.rename(
-        columns={
-            "complexity_with_optional_paragraphs": "With Optional\nParagraphs",
-            "complexity_without_optional_paragraphs": "Without Optional\nParagraphs",
-        }
-    ).sort_index(axis=1)
+    import seaborn as sns
+    from matplotlib import pyplot as plt
 
-    facet_grid: sns.FacetGrid = sns.catplot(
+    _set_plot_theme()
+
+    # Ignore the page statistics of extended complexity results
+    complexity = (
+        complexity[["article", "complexity_with_optional_paragraphs", "complexity_without_optional_paragraphs"]]
+        .rename(
+            columns={
+                "complexity_with_optional_paragraphs": "With Optional\nParagraphs",
+                "complexity_without_optional_paragraphs": "Without Optional\nParagraphs",
+            }
+        )
+        .sort_index(axis=1)
+    )
+
+    facet_grid: "sns.FacetGrid" = sns.catplot(
         complexity.melt(["article"], var_name="complexity_type", value_name="complexity_value"),
         x="complexity_type",
         y="complexity_value",
@@ -52,7 +308,37 @@ def draw_complexity_boxplot(complexity: pd.DataFrame, out: Union[str, Path, None
         plt.savefig(Path(out) / "complexity_boxplot.pdf", dpi=300)
 
 
-def draw_rouge_lsum_stripplot(rouge_lsum: pd.DataFrame, out: Union[str, Path, None] = None) -> None:
+def draw_rouge_lsum_stripplot(
+    rouge_lsum: pd.DataFrame, out: Union[str, Path, None] = None, aggregate: Optional[bool] = None
+) -> None:
+    """Draws the ROUGE-LSum precision, recall and F1-score per scraper.
+
+    Args:
+        rouge_lsum: The ROUGE-LSum scores.
+        out: The output directory. Per default, the plot is shown instead.
+        aggregate: If True, violins are rendered from per-scraper histograms instead of plotting every score.
+            Per default, the scores are aggregated if there are more than `MAX_STRIPPLOT_ROWS` rows.
+    """
+    import seaborn as sns
+    from matplotlib import pyplot as plt
+
+    _set_plot_theme()
+
+    if aggregate or (aggregate is None and len(rouge_lsum) > MAX_STRIPPLOT_ROWS):
+        histograms: ScoreHistograms = ScoreHistograms.from_scores(rouge_lsum)
+        order: List[str] = histograms.order("f1_score")
+
+        figure, axes = plt.subplots(1, len(SCORE_COLUMNS), sharey=True, figsize=(12, 4))
+        for ax, column, title in zip(axes, SCORE_COLUMNS, ("Precision", "Recall", "F1-Score")):
+            _draw_aggregated_violins(ax, histograms, column, order)
+            ax.set_title(f"Variant = {title}")
+            ax.set(ylim=(0, 1))
+        axes[0].set_ylabel("ROUGE-LSum")
+
+        plt.tight_layout()
+        _show_or_save(figure, None if out is None else Path(out) / "rouge_lsum_stripplot.pdf")
+        return
+
     np.random.seed(1)
 
     rouge_lsum = rouge_lsum.rename(
@@ -63,7 +349,7 @@ def draw_rouge_lsum_stripplot(rouge_lsum: pd.DataFrame, out: Union[str, Path, No
         }
     ).replace(SCRAPER_DISPLAY_NAMES)
 
-    facet_grid: sns.FacetGrid = sns.catplot(
+    facet_grid: "sns.FacetGrid" = sns.catplot(
         rouge_lsum.melt(["scraper", "article"], var_name="Variant", value_name="ROUGE-LSum"),
         x="scraper",
         y="ROUGE-LSum",
@@ -85,12 +371,32 @@ def draw_rouge_lsum_stripplot(rouge_lsum: pd.DataFrame, out: Union[str, Path, No
         plt.savefig(Path(out) / "rouge_lsum_stripplot.pdf", dpi=300)
 
 
-def draw_rouge_lsum_f1_score_stripplot(rouge_lsum: pd.DataFrame, out: Union[str, Path, None] = None) -> None:
+def draw_rouge_lsum_f1_score_stripplot(
+    rouge_lsum: pd.DataFrame, out: Union[str, Path, None] = None, aggregate: Optional[bool] = None
+) -> None:
+    """Draws the ROUGE-LSum F1-score per scraper (see `draw_rouge_lsum_stripplot` for the arguments)."""
+    import seaborn as sns
+    from matplotlib import pyplot as plt
+
+    _set_plot_theme()
+
+    if aggregate or (aggregate is None and len(rouge_lsum) > MAX_STRIPPLOT_ROWS):
+        histograms: ScoreHistograms = ScoreHistograms.from_scores(rouge_lsum, columns=("f1_score",))
+
+        figure, ax = plt.subplots()
+        _draw_aggregated_violins(ax, histograms, "f1_score", histograms.order("f1_score"))
+        ax.set_ylabel("ROUGE-LSum F1-Score")
+        ax.set(ylim=(0, 1))
+
+        plt.tight_layout()
+        _show_or_save(figure, None if out is None else Path(out) / "rouge_lsum_f1_score_stripplot.pdf")
+        return
+
     np.random.seed(1)
 
     rouge_lsum = rouge_lsum.replace(SCRAPER_DISPLAY_NAMES)
 
-    facet_grid: sns.FacetGrid = sns.catplot(
+    facet_grid: "sns.FacetGrid" = sns.catplot(
         rouge_lsum[["scraper", "article", "f1_score"]],
         x="scraper",
         y="f1_score",
@@ -131,7 +437,7 @@ def compute_rouge_lsum_scraper_to_publisher_summary(
     rouge_lsum: pd.DataFrame, out: Union[str, Path, None] = None
 ) -> pd.DataFrame:
     summary = (
-        rouge_lsum.assign(publisher=rouge_lsum["article"].str.replace("_\d+\.html\.gz", "", regex=True))[
+        rouge_lsum.assign(publisher=get_publishers(rouge_lsum["article"]))[
             ["scraper", "publisher", "precision", "recall", "f1_score"]
         ]
         .set_index(["scraper", "publisher"])
@@ -145,3 +451,115 @@ def compute_rouge_lsum_scraper_to_publisher_summary(
     if out:
         summary.to_csv(Path(out) / "rouge_lsum_scraper_to_publisher_summary.tsv", sep="\t")
     return summary
+
+
+def compute_rouge_lsum_scraper_bootstrap_summary(
+    rouge_lsum: pd.DataFrame,
+    out: Union[str, Path, None] = None,
+    num_resamples: int = 10_000,
+    confidence_level: float = 0.95,
+    stratify: bool = True,
+    seed: int = 1,
+) -> pd.DataFrame:
+    """Calculates percentile bootstrap confidence intervals of the scrapers' mean scores.
+
+    Args:
+        rouge_lsum: The ROUGE-LSum scores.
+        out: Optional output directory to save the summary as TSV.
+        num_resamples: The number of bootstrap resamples.
+        confidence_level: The confidence level of the intervals.
+        stratify: If True, the articles are resampled per publisher.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The mean and the lower and upper bound of the confidence interval for each scraper and score column.
+    """
+    alpha: float = (1 - confidence_level) / 2
+
+    columns: Dict[Tuple[str, str], "pd.Series[float]"] = {}
+    for column in SCORE_COLUMNS:
+        matrix: pd.DataFrame = _to_score_matrix(rouge_lsum, column)
+        strata: Optional[npt.NDArray[np.int64]] = (
+            pd.factorize(get_publishers(matrix.index.to_series()))[0] if stratify else None
+        )
+        means: npt.NDArray[np.float64] = bootstrap_means(
+            matrix.to_numpy(dtype=np.float64), strata, num_resamples=num_resamples, seed=seed
+        )
+
+        columns[(column, "mean")] = matrix.mean(axis=0)
+        columns[(column, "ci_lower")] = pd.Series(np.nanquantile(means, alpha, axis=0), index=matrix.columns)
+        columns[(column, "ci_upper")] = pd.Series(np.nanquantile(means, 1 - alpha, axis=0), index=matrix.columns)
+
+    summary: pd.DataFrame = (
+        pd.DataFrame(columns)
+        .rename_axis("scraper")
+        .mul(100)
+        .round(2)
+        .sort_values(("f1_score", "mean"), ascending=False)
+    )
+
+    if out:
+        summary.to_csv(Path(out) / "rouge_lsum_scraper_bootstrap_summary.tsv", sep="\t")
+    return summary
+
+
+def compute_rouge_lsum_scraper_significance(
+    rouge_lsum: pd.DataFrame,
+    out: Union[str, Path, None] = None,
+    column: str = "f1_score",
+    num_resamples: int = 10_000,
+    stratify: bool = True,
+    seed: int = 1,
+) -> pd.DataFrame:
+    """Calculates paired significance tests of the mean score differences between all pairs of scrapers.
+
+    The two-sided paired bootstrap p-value is the fraction of bootstrap differences
+    that deviate at least as much from the observed difference as the observed difference from zero.
+    The two-sided approximate randomization p-value is obtained by randomly swapping the paired scores per article.
+
+    Args:
+        rouge_lsum: The ROUGE-LSum scores.
+        out: Optional output directory to save the test results as TSV.
+        column: The score column to test.
+        num_resamples: The number of resamples of both tests.
+        stratify: If True, the articles are resampled per publisher in the paired bootstrap test.
+        seed: The seed of the random number generator.
+
+    Returns:
+        The observed mean difference and p-values for each pair of scrapers.
+    """
+    matrix: pd.DataFrame = _to_score_matrix(rouge_lsum, column)
+    values: npt.NDArray[np.float64] = matrix.to_numpy(dtype=np.float64)
+    strata: Optional[npt.NDArray[np.int64]] = (
+        pd.factorize(get_publishers(matrix.index.to_series()))[0] if stratify else None
+    )
+
+    pairs: List[Tuple[int, int]] = list(itertools.combinations(range(len(matrix.columns)), 2))
+    first: npt.NDArray[np.int64] = np.array([index for index, _ in pairs], dtype=np.int64)
+    second: npt.NDArray[np.int64] = np.array([index for _, index in pairs], dtype=np.int64)
+    differences: npt.NDArray[np.float64] = values[:, first] - values[:, second]
+
+    # Resampling the differences is equivalent to resampling the score matrix and taking the differences afterwards
+    observed: npt.NDArray[np.float64] = np.nanmean(differences, axis=0)
+    bootstrap_differences: npt.NDArray[np.float64] = bootstrap_means(
+        differences, strata, num_resamples=num_resamples, seed=seed
+    )
+    bootstrap_p_values: npt.NDArray[np.float64] = (
+        np.sum(np.abs(bootstrap_differences - observed) >= np.abs(observed), axis=0) + 1
+    ) / (num_resamples + 1)
+
+    significance: pd.DataFrame = pd.DataFrame(
+        {
+            "scraper_a": matrix.columns[first],
+            "scraper_b": matrix.columns[second],
+            "mean_difference": np.round(observed * 100, 2),
+            "paired_bootstrap_p_value": bootstrap_p_values,
+            "approximate_randomization_p_value": approximate_randomization_p_values(
+                differences, num_resamples=num_resamples, seed=seed
+            ),
+        }
+    ).set_index(["scraper_a", "scraper_b"])
+
+    if out:
+        significance.to_csv(Path(out) / "rouge_lsum_scraper_significance.tsv", sep="\t")
+    return significance
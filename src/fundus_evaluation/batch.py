@@ -0,0 +1,112 @@
+import dataclasses
+from typing import Dict, Iterable, Iterator, List, Mapping, Sequence
+
+import numpy as np
+import numpy.typing as npt
+
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    is_optional_paragraph,
+    remove_optional_paragraph_marker,
+)
+
+
+@dataclasses.dataclass(frozen=True)
+class ArticleBatch:
+    """Columnar representation of a batch of article bodies.
+
+    The paragraphs of all articles are stored in one flat array. The paragraphs of the i-th article
+    are `paragraphs[offsets[i] : offsets[i + 1]]`. Optional paragraph markers are removed from the paragraphs
+    and stored as boolean flags in `optional` instead.
+    """
+
+    identifiers: npt.NDArray[np.object_]  # Shape: (num_articles,)
+    offsets: npt.NDArray[np.int64]  # Shape: (num_articles + 1,)
+    paragraphs: npt.NDArray[np.object_]  # Shape: (num_paragraphs,)
+    optional: npt.NDArray[np.bool_]  # Shape: (num_paragraphs,)
+
+    @classmethod
+    def from_bodies(cls, identifiers: Sequence[str], bodies: Iterable[Sequence[str]]) -> "ArticleBatch":
+        """Creates a batch from the article bodies, e.g. streamed from an extraction file.
+
+        Args:
+            identifiers: The article identifiers.
+            bodies: The article bodies as lists of paragraphs in the order of the identifiers.
+                Optional paragraphs are marked with surrounding brackets.
+
+        Returns:
+            The article batch.
+        """
+        lengths: List[int] = []
+        flat_paragraphs: List[str] = []
+        for body in bodies:
+            lengths.append(len(body))
+            flat_paragraphs.extend(body)
+
+        if len(lengths) != len(identifiers):
+            raise ValueError(f"Got {len(identifiers)} identifiers, but {len(lengths)} bodies")
+
+        offsets: npt.NDArray[np.int64] = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        return cls(
+            identifiers=np.array(identifiers, dtype=object),
+            offsets=offsets,
+            paragraphs=np.array([remove_optional_paragraph_marker(p) for p in flat_paragraphs], dtype=object),
+            optional=np.fromiter((is_optional_paragraph(p) for p in flat_paragraphs), dtype=bool),
+        )
+
+    @classmethod
+    def from_articles(cls, articles: Mapping[str, EvaluationArticle]) -> "ArticleBatch":
+        return cls.from_bodies(list(articles), (article["body"] for article in articles.values()))
+
+    @property
+    def lengths(self) -> npt.NDArray[np.int64]:
+        """The number of paragraphs per article."""
+        return np.diff(self.offsets)
+
+    def get_body(self, index: int) -> List[str]:
+        """Returns the body of the article at the given index, including the optional paragraph markers."""
+        start, end = self.offsets[index], self.offsets[index + 1]
+        return [
+            f"[{paragraph}]" if optional else paragraph
+            for paragraph, optional in zip(self.paragraphs[start:end], self.optional[start:end])
+        ]
+
+    def iter_bodies(self) -> Iterator[List[str]]:
+        return (self.get_body(index) for index in range(len(self)))
+
+    def take(self, indices: Sequence[int]) -> "ArticleBatch":
+        """Returns a new batch of the articles at the given indices in the given order."""
+        article_indices: npt.NDArray[np.int64] = np.asarray(indices, dtype=np.int64)
+        lengths: npt.NDArray[np.int64] = self.lengths[article_indices]
+        offsets: npt.NDArray[np.int64] = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+
+        paragraph_indices: npt.NDArray[np.int64] = np.concatenate(
+            [np.arange(self.offsets[index], self.offsets[index + 1]) for index in article_indices]
+            or [np.empty(0, dtype=np.int64)]
+        )
+        return ArticleBatch(
+            identifiers=self.identifiers[article_indices],
+            offsets=offsets,
+            paragraphs=self.paragraphs[paragraph_indices],
+            optional=self.optional[paragraph_indices],
+        )
+
+    def align(self, identifiers: Sequence[str]) -> "ArticleBatch":
+        """Returns the batch reordered to the given article identifiers."""
+        position: Dict[str, int] = {identifier: index for index, identifier in enumerate(self.identifiers)}
+        if len(position) != len(identifiers) or any(identifier not in position for identifier in identifiers):
+            raise ValueError("The batch's article identifiers do not match the given identifiers")
+        return self.take([position[identifier] for identifier in identifiers])
+
+    def to_articles(self) -> Dict[str, EvaluationArticle]:
+        """Converts the batch to article dictionaries. The URL and crawl date are not part of a batch and left empty."""
+        return {
+            identifier: {"url": "", "body": body, "crawl_date": ""}
+            for identifier, body in zip(self.identifiers, self.iter_bodies())
+        }
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
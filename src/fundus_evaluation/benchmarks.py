@@ -0,0 +1,396 @@
+import dataclasses
+import json
+import os
+import platform
+import re
+import statistics
+import time
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import fundus_evaluation
+from fundus_evaluation import SCORERS, SCRAPERS
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    get_reference_bodies,
+    load_evaluation_articles,
+    load_zipped_html,
+    preload,
+    remove_optional_paragraph_marker,
+    tokenize_words,
+)
+
+DEFAULT_THRESHOLD: Final[float] = 0.25
+DEFAULT_SCALES: Final[Tuple[int, ...]] = (10,)
+DEFAULT_MAX_OPTIONAL_PARAGRAPHS: Final[int] = 4
+
+
+@dataclasses.dataclass(frozen=True)
+class Benchmark:
+    """A benchmarked function without arguments, e.g. scraping all pages with a scraper."""
+
+    name: str
+    function: Callable[[], Any]
+
+
+@dataclasses.dataclass(frozen=True)
+class BenchmarkResult:
+    """Timings of a benchmark in seconds per call."""
+
+    name: str
+    median: float
+    minimum: float
+    number: int  # Calls per repeat
+    repeats: int
+
+
+@dataclasses.dataclass(frozen=True)
+class Comparison:
+    """Comparison of a benchmark's minimum time to its baseline.
+
+    The minimum is compared instead of the median, since it is the least affected by other processes.
+    """
+
+    name: str
+    baseline: float
+    current: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+    def is_regression(self, threshold: float) -> bool:
+        return self.ratio > 1 + threshold
+
+
+@dataclasses.dataclass
+class BenchmarkInputs:
+    """The benchmarks' inputs loaded once upfront, such that only the benchmarked functions are timed."""
+
+    ground_truth_path: Path
+    html_directory: Path
+    extractions_directory: Optional[Path]
+    scores_directory: Optional[Path]
+    articles: Dict[str, EvaluationArticle]
+    htmls: Dict[str, str]
+    hypotheses: Dict[str, EvaluationArticle]
+    hypothesis_source: str
+
+    @classmethod
+    def load(
+        cls,
+        ground_truth_path: Union[str, Path],
+        html_directory: Union[str, Path],
+        extractions_directory: Union[str, Path, None] = None,
+        scores_directory: Union[str, Path, None] = None,
+        hypothesis_scraper: str = "bte",
+    ) -> "BenchmarkInputs":
+        """Loads the dataset and the hypothesis articles of the scorer benchmarks.
+
+        The hypothesis articles are the scraper's extractions, if available, and the ground truth otherwise.
+        """
+        articles: Dict[str, EvaluationArticle] = load_evaluation_articles(ground_truth_path)
+        html_directory = Path(html_directory)
+        htmls: Dict[str, str] = {
+            article_identifier: load_zipped_html(html_directory / article_identifier) for article_identifier in articles
+        }
+
+        hypotheses: Dict[str, EvaluationArticle] = articles
+        hypothesis_source: str = "ground_truth"
+        if extractions_directory is not None:
+            extraction_path: Path = Path(extractions_directory) / f"{hypothesis_scraper}.json"
+            if extraction_path.exists():
+                hypotheses = load_evaluation_articles(extraction_path)
+                hypothesis_source = hypothesis_scraper
+
+        return cls(
+            ground_truth_path=Path(ground_truth_path),
+            html_directory=html_directory,
+            extractions_directory=None if extractions_directory is None else Path(extractions_directory),
+            scores_directory=None if scores_directory is None else Path(scores_directory),
+            articles=articles,
+            htmls=htmls,
+            hypotheses=hypotheses,
+            hypothesis_source=hypothesis_source,
+        )
+
+    def scale(self, factor: int) -> "BenchmarkInputs":
+        """Returns synthetic inputs with the articles' bodies repeated the given number of times.
+
+        The synthetic HTML pages consist of the scaled ground truth paragraphs and the original pages' markup,
+        such that the extraction, scoring and complexity calculation process proportionally more text.
+        """
+        articles: Dict[str, EvaluationArticle] = {
+            article_identifier: {**article, "body": article["body"] * factor}
+            for article_identifier, article in self.articles.items()
+        }
+        hypotheses: Dict[str, EvaluationArticle] = {
+            article_identifier: {**article, "body": article["body"] * factor}
+            for article_identifier, article in self.hypotheses.items()
+        }
+        htmls: Dict[str, str] = {
+            article_identifier: _scale_html(html, articles[article_identifier]["body"])
+            for article_identifier, html in self.htmls.items()
+        }
+        return dataclasses.replace(self, articles=articles, htmls=htmls, hypotheses=hypotheses)
+
+
+def _scale_html(html: str, body: List[str]) -> str:
+    paragraphs: str = "".join(f"<p>{remove_optional_paragraph_marker(paragraph)}</p>" for paragraph in body)
+    match: Optional[re.Match[str]] = re.search(r"</body\s*>", html, flags=re.IGNORECASE)
+    if match is None:
+        return f"{html}<article>{paragraphs}</article>"
+    return f"{html[: match.start()]}<article>{paragraphs}</article>{html[match.start():]}"
+
+
+def _scrape_all(scraper_identifier: str, inputs: BenchmarkInputs) -> Callable[[], Any]:
+    def function() -> List[List[str]]:
+        scraper = SCRAPERS[scraper_identifier]
+        return [
+            scraper(
+                url=inputs.articles[article_identifier]["url"],
+                html=html,
+                publisher_identifier=article_identifier.split("_")[0],
+                crawl_date=datetime.fromisoformat(inputs.articles[article_identifier]["crawl_date"]),
+            )
+            for article_identifier, html in inputs.htmls.items()
+        ]
+
+    return function
+
+
+def _score_all(scorer_identifier: str, inputs: BenchmarkInputs) -> Callable[[], Any]:
+    # The raw reference articles are passed, such that the reference preparation is included in each call
+    return lambda: SCORERS[scorer_identifier](inputs.articles, inputs.hypotheses, DEFAULT_MAX_OPTIONAL_PARAGRAPHS)
+
+
+def _get_reference_bodies_all(inputs: BenchmarkInputs) -> Callable[[], Any]:
+    return lambda: [
+        list(get_reference_bodies(article["body"], DEFAULT_MAX_OPTIONAL_PARAGRAPHS))
+        for article in inputs.articles.values()
+    ]
+
+
+def _confusion_matrices_all(inputs: BenchmarkInputs) -> Callable[[], Any]:
+    from fundus_evaluation.scorers import ConfusionMatrix
+
+    token_pairs: List[Tuple[List[str], List[str]]] = [
+        (
+            tokenize_words("\n\n".join(article["body"])),
+            tokenize_words("\n\n".join(inputs.hypotheses[article_identifier]["body"])),
+        )
+        for article_identifier, article in inputs.articles.items()
+    ]
+    return lambda: [ConfusionMatrix.from_evaluation(reference, hypothesis) for reference, hypothesis in token_pairs]
+
+
+def _complexity_all(inputs: BenchmarkInputs) -> Callable[[], Any]:
+    from fundus_evaluation.complexity import compute_complexity
+
+    texts: Dict[str, str] = {
+        article_identifier: " ".join(article["body"]) for article_identifier, article in inputs.articles.items()
+    }
+    return lambda: [
+        compute_complexity(html, texts[article_identifier]) for article_identifier, html in inputs.htmls.items()
+    ]
+
+
+def _boilernet_preprocess_all(inputs: BenchmarkInputs) -> Callable[[], Any]:
+    import warnings
+
+    from bs4 import BeautifulSoup
+
+    from fundus_evaluation.scrapers.boilernet import BOILERNET_ROOT_PATH
+    from fundus_evaluation.scrapers.boilernet.net.preprocess import (
+        get_feature_vector,
+        process,
+    )
+
+    with open(os.path.join(BOILERNET_ROOT_PATH, "words.json"), encoding="utf-8") as words_file:
+        word_map: Dict[str, int] = json.load(words_file)
+    with open(os.path.join(BOILERNET_ROOT_PATH, "tags.json"), encoding="utf-8") as tags_file:
+        tag_map: Dict[str, int] = json.load(tags_file)
+
+    def function() -> List[Any]:
+        features: List[Any] = []
+        for html in inputs.htmls.values():
+            tags: Dict[str, int] = defaultdict(int)
+            words: Dict[str, int] = defaultdict(int)
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                document = BeautifulSoup(html, features="html5lib")
+            features.append([get_feature_vector(w, t, word_map, tag_map) for w, t, _ in process(document, tags, words)])
+        return features
+
+    return function
+
+
+def _load_artifacts(inputs: BenchmarkInputs) -> Dict[str, Callable[[], Any]]:
+    from fundus_evaluation.storage import ARTICLES_SUFFIXES, load_scores
+
+    benchmarks: Dict[str, Callable[[], Any]] = {
+        "load/ground_truth": lambda: load_evaluation_articles(inputs.ground_truth_path),
+        "load/html": lambda: [
+            load_zipped_html(inputs.html_directory / article_identifier) for article_identifier in inputs.articles
+        ],
+    }
+    if inputs.extractions_directory is not None:
+        extraction_paths: List[Path] = [
+            path for path in sorted(inputs.extractions_directory.iterdir()) if path.suffix in ARTICLES_SUFFIXES
+        ]
+        benchmarks["load/extractions"] = lambda: [load_evaluation_articles(path) for path in extraction_paths]
+    if inputs.scores_directory is not None:
+        score_paths: List[Path] = sorted(inputs.scores_directory.glob("*.tsv"))
+        benchmarks["load/scores"] = lambda: [load_scores(path) for path in score_paths]
+    return benchmarks
+
+
+def collect_benchmarks(
+    inputs: BenchmarkInputs, scales: Sequence[int] = DEFAULT_SCALES
+) -> Tuple[List[Benchmark], Dict[str, str]]:
+    """Collects the benchmarks of all registered scrapers and scorers, the complexity and the artifact loading.
+
+    The scraper, scorer, complexity and preprocessing benchmarks are additionally run on synthetic inputs
+    with the articles scaled by each of the given factors, e.g. `synthetic/x10/scrape/bte`.
+    Benchmarks whose dependencies are not installed are skipped.
+
+    Returns:
+        The benchmarks and the skipped benchmarks' names mapped to the reasons.
+    """
+    skipped: Dict[str, str] = {}
+
+    def create(name: str, factory: Callable[[], Callable[[], Any]]) -> Optional[Benchmark]:
+        try:
+            return Benchmark(name, factory())
+        except Exception as error:  # Missing dependencies, models or data
+            skipped[name] = f"{type(error).__name__}: {error}"
+            return None
+
+    def preloaded(function: Callable[..., Any], factory: Callable[[], Callable[[], Any]]) -> Callable[[], Any]:
+        preload(function)
+        return factory()
+
+    def collect(prefix: str, scaled_inputs: BenchmarkInputs) -> List[Optional[Benchmark]]:
+        candidates: List[Optional[Benchmark]] = []
+        for scraper_identifier in SCRAPERS:
+            candidates.append(
+                create(
+                    f"{prefix}scrape/{scraper_identifier}",
+                    lambda: preloaded(
+                        SCRAPERS[scraper_identifier], lambda: _scrape_all(scraper_identifier, scaled_inputs)
+                    ),
+                )
+            )
+        for scorer_identifier in SCORERS:
+            candidates.append(
+                create(
+                    f"{prefix}score/{scorer_identifier}",
+                    lambda: preloaded(SCORERS[scorer_identifier], lambda: _score_all(scorer_identifier, scaled_inputs)),
+                )
+            )
+        candidates.extend(
+            (
+                create(f"{prefix}utils/get_reference_bodies", lambda: _get_reference_bodies_all(scaled_inputs)),
+                create(f"{prefix}scorers/confusion_matrix", lambda: _confusion_matrices_all(scaled_inputs)),
+                create(f"{prefix}complexity/compute_complexity", lambda: _complexity_all(scaled_inputs)),
+                create(f"{prefix}boilernet/preprocess", lambda: _boilernet_preprocess_all(scaled_inputs)),
+            )
+        )
+        return candidates
+
+    benchmarks: List[Optional[Benchmark]] = [
+        Benchmark(name, function) for name, function in _load_artifacts(inputs).items()
+    ]
+    benchmarks.extend(collect("", inputs))
+    for factor in scales:
+        benchmarks.extend(collect(f"synthetic/x{factor}/", inputs.scale(factor)))
+
+    return [benchmark for benchmark in benchmarks if benchmark is not None], skipped
+
+
+def time_benchmark(benchmark: Benchmark, repeats: int = 5, min_time: float = 0.2) -> BenchmarkResult:
+    """Times a benchmark like `timeit`, calibrating the number of calls per repeat to last at least `min_time`.
+
+    The first call is a warm-up call and is not included in the timings.
+    """
+    start: float = time.perf_counter()
+    benchmark.function()
+    warm_up: float = time.perf_counter() - start
+    number: int = max(1, int(min_time / warm_up)) if warm_up > 0 else 1
+
+    timings: List[float] = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        for _ in range(number):
+            benchmark.function()
+        timings.append((time.perf_counter() - start) / number)
+
+    return BenchmarkResult(
+        name=benchmark.name,
+        median=statistics.median(timings),
+        minimum=min(timings),
+        number=number,
+        repeats=repeats,
+    )
+
+
+def get_environment(inputs: BenchmarkInputs) -> Dict[str, Any]:
+    """Returns the machine, software and inputs of the benchmarks, which should match those of the baseline."""
+    return {
+        "hypotheses": inputs.hypothesis_source,
+        "num_articles": len(inputs.articles),
+        "machine": platform.machine(),
+        "system": platform.system(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "fundus_evaluation": fundus_evaluation.__version__,
+    }
+
+
+def save_results(path: Union[str, Path], results: Iterable[BenchmarkResult], environment: Dict[str, Any]) -> None:
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w", encoding="utf-8") as results_file:
+        json.dump(
+            {
+                "environment": environment,
+                "date": datetime.now().isoformat(timespec="seconds"),
+                "results": {result.name: dataclasses.asdict(result) for result in results},
+            },
+            results_file,
+            indent=4,
+        )
+
+
+def load_results(path: Union[str, Path]) -> Tuple[Dict[str, Any], Dict[str, BenchmarkResult]]:
+    """Loads benchmark results.
+
+    Returns:
+        The environment (see `get_environment`) and the results by benchmark name.
+    """
+    with Path(path).open("r", encoding="utf-8") as results_file:
+        content: Dict[str, Any] = json.load(results_file)
+    return content["environment"], {name: BenchmarkResult(**result) for name, result in content["results"].items()}
+
+
+def compare(results: Iterable[BenchmarkResult], baseline: Dict[str, BenchmarkResult]) -> List[Comparison]:
+    """Compares the minimum times of the benchmarks that are part of the baseline."""
+    return [
+        Comparison(result.name, baseline[result.name].minimum, result.minimum)
+        for result in results
+        if result.name in baseline
+    ]
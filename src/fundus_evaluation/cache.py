@@ -0,0 +1,215 @@
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from types import TracebackType
+from typing import Dict, Iterable, List, Mapping, Optional, Tuple, Type, Union
+
+import pandas as pd
+
+import fundus_evaluation
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.scorers import Scorer
+from fundus_evaluation.scrapers import Scraper
+from fundus_evaluation.utils import EvaluationArticle
+
+ScoreRow = Dict[str, float]
+
+
+def hash_body(body: List[str]) -> str:
+    """Calculates a content hash of an article's body.
+
+    Args:
+        body: The list of paragraphs to hash.
+
+    Returns:
+        The hexadecimal SHA-256 digest of the JSON serialized body.
+    """
+    serialized: bytes = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(serialized).hexdigest()
+
+
+def hash_article(article: EvaluationArticle) -> str:
+    """Calculates a content hash of an article's body (see `hash_body`).
+
+    Only the body is considered, since the article's URL and crawl date do not influence any score.
+    """
+    return hash_body(article["body"])
+
+
+def get_scorer_version(scorer: Scorer) -> str:
+    """Returns the version of a scorer.
+
+    Scorers declare their version with a `__version__` attribute, e.g. with `utils.with_version`.
+    Otherwise, e.g. for third-party scorers, the version of the fundus-evaluation package is used.
+    """
+    return str(getattr(scorer, "__version__", fundus_evaluation.__version__))
+
+
+def get_scraper_version(scraper: Scraper) -> str:
+    """Returns the version of a scraper (see `get_scorer_version`)."""
+    return str(getattr(scraper, "__version__", fundus_evaluation.__version__))
+
+
+class ScoreCache:
+    """Content-addressed persistent cache of per-article scores backed by SQLite.
+
+    A cache entry is keyed by the content hashes of the reference and hypothesis article,
+    the scorer's identifier and version and the maximum number of optional paragraphs.
+    Thus, entries never have to be invalidated explicitly.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+
+        self._connection: sqlite3.Connection = sqlite3.connect(self.path)
+        self._connection.execute("CREATE TABLE IF NOT EXISTS scores (key TEXT PRIMARY KEY, row TEXT NOT NULL)")
+        self._connection.commit()
+
+    @staticmethod
+    def make_key(
+        reference_hash: str,
+        hypothesis_hash: str,
+        scorer_identifier: str,
+        scorer_version: str,
+        max_optional_paragraphs: Optional[int],
+    ) -> str:
+        """Creates a cache key from the article hashes (see `hash_article`) and the scorer configuration."""
+        components: Tuple[str, ...] = (
+            reference_hash,
+            hypothesis_hash,
+            scorer_identifier,
+            scorer_version,
+            str(max_optional_paragraphs),
+        )
+        return hashlib.sha256("\0".join(components).encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, ScoreRow]:
+        """Looks up the cached score rows of the given keys. Missing keys are not part of the result."""
+        rows: Dict[str, ScoreRow] = {}
+        key_list: List[str] = list(keys)
+
+        # Stay below SQLite's limit of host parameters per statement
+        batch_size: int = 500
+        for start in range(0, len(key_list), batch_size):
+            batch: List[str] = key_list[start : start + batch_size]
+            placeholders: str = ", ".join("?" * len(batch))
+            for key, row in self._connection.execute(
+                f"SELECT key, row FROM scores WHERE key IN ({placeholders})", batch
+            ):
+                rows[key] = json.loads(row)
+        return rows
+
+    def put_many(self, rows: Mapping[str, ScoreRow]) -> None:
+        self._connection.executemany(
+            "INSERT OR REPLACE INTO scores (key, row) VALUES (?, ?)",
+            ((key, json.dumps(row)) for key, row in rows.items()),
+        )
+        self._connection.commit()
+
+    def close(self) -> None:
+        self._connection.close()
+
+    def __enter__(self) -> "ScoreCache":
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.close()
+
+
+def lookup_scores(
+    scorer: Scorer,
+    scorer_identifier: str,
+    article_identifiers: Iterable[str],
+    reference_hashes: Dict[str, str],
+    hypothesis_hashes: Dict[str, str],
+    max_optional_paragraphs: Optional[int],
+    cache: ScoreCache,
+) -> Tuple[Dict[str, str], Dict[str, ScoreRow], List[str]]:
+    """Looks up the cached score rows of the articles.
+
+    Returns:
+        The cache keys of the articles, the cached rows by their key and the identifiers of the articles to score.
+    """
+    scorer_version: str = get_scorer_version(scorer)
+    keys: Dict[str, str] = {
+        article_identifier: ScoreCache.make_key(
+            reference_hashes[article_identifier],
+            hypothesis_hashes[article_identifier],
+            scorer_identifier,
+            scorer_version,
+            max_optional_paragraphs,
+        )
+        for article_identifier in article_identifiers
+    }
+
+    rows: Dict[str, ScoreRow] = cache.get_many(keys.values())
+    missing_articles: List[str] = [article_identifier for article_identifier, key in keys.items() if key not in rows]
+    return keys, rows, missing_articles
+
+
+def merge_scores(
+    keys: Dict[str, str], rows: Dict[str, ScoreRow], computed: Optional[pd.DataFrame], cache: ScoreCache
+) -> pd.DataFrame:
+    """Adds the computed scores to the cache and combines them with the cached rows (see `lookup_scores`).
+
+    Returns:
+        The scores in the order of the keys' articles.
+    """
+    if computed is not None:
+        computed_rows: Dict[str, ScoreRow] = {
+            keys[article_identifier]: {str(column): value for column, value in row.items()}
+            for article_identifier, row in zip(computed.index, computed.to_dict(orient="records"))
+        }
+        cache.put_many(computed_rows)
+        rows = {**rows, **computed_rows}
+
+    return pd.DataFrame.from_records([rows[key] for key in keys.values()], index=pd.Index(list(keys), name="article"))
+
+
+def score_with_cache(
+    scorer: Scorer,
+    scorer_identifier: str,
+    references: ReferenceIndex,
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    reference_hashes: Dict[str, str],
+    hypothesis_hashes: Dict[str, str],
+    max_optional_paragraphs: Optional[int],
+    cache: ScoreCache,
+) -> Tuple[pd.DataFrame, int]:
+    """Scores the articles, only calculating the rows that are not already part of the cache.
+
+    Args:
+        scorer: The scorer.
+        scorer_identifier: The scorer's identifier, e.g. "rouge_lsum".
+        references: The prepared reference articles of the hypothesis articles.
+        hypothesis_articles: The hypothesis articles.
+        reference_hashes: The content hashes of (at least) the reference articles (see `hash_body`).
+        hypothesis_hashes: The content hashes of (at least) the hypothesis articles (see `hash_article`).
+        max_optional_paragraphs: The maximum number of variants of optional paragraphs.
+        cache: The score cache.
+
+    Returns:
+        The scores and the number of reused cached rows.
+    """
+    assert references.keys() == hypothesis_articles.keys()
+
+    keys, rows, missing_articles = lookup_scores(
+        scorer, scorer_identifier, references, reference_hashes, hypothesis_hashes, max_optional_paragraphs, cache
+    )
+
+    computed: Optional[pd.DataFrame] = None
+    if missing_articles:
+        computed = scorer(
+            references.subset(missing_articles),
+            {article_identifier: hypothesis_articles[article_identifier] for article_identifier in missing_articles},
+            max_optional_paragraphs,
+        )
+
+    return merge_scores(keys, rows, computed, cache), len(keys) - len(missing_articles)
@@ -1,6 +1,19 @@
-from typing import List, Sequence
+import concurrent.futures
+import dataclasses
+import hashlib
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    MutableMapping,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+)
 
-from resiliparse.parse.html import HTMLTree
+from resiliparse.parse.html import DOMNode, HTMLTree, NodeType
 
 from fundus_evaluation.utils import (
     get_optional_paragraph_indices,
@@ -8,6 +21,21 @@ from fundus_evaluation.utils import (
     tokenize_words,
 )
 
+T = TypeVar("T")
+
+
+@dataclasses.dataclass
+class PageStatistics:
+    """Structural statistics of an HTML page that predict the extraction cost and difficulty."""
+
+    num_dom_nodes: int  # All nodes, including text and comment nodes
+    max_depth: int  # Depth of the deepest node, with the document at depth 0
+    num_leaves: int  # Nodes without children
+    text_to_markup_ratio: float  # Visible text bytes per markup byte
+    link_density: float  # Share of the visible text bytes inside links
+    script_style_share: float  # Share of the HTML bytes inside script and style elements
+    num_dom_text_tokens: int  # See `count_dom_text_tokens`
+
 
 def compute_complexity(html: str, text: str) -> float:
     """Calculates the HTML page complexity based on the pages extracted ground truth text.
@@ -29,17 +57,146 @@ def compute_complexity(html: str, text: str) -> float:
     Returns:
         The page complexity.
     """
-    num_ground_truth_tokens: int = len(tokenize_words(text))
+    return compute_complexity_from_counts(len(tokenize_words(text)), count_dom_text_tokens(html))
+
+
+def count_dom_text_tokens(html: str) -> int:
+    """Counts the word tokens of the HTML's body text, excluding scripts and styles.
+
+    Args:
+        html: The HTML as string.
+
+    Returns:
+        The number of DOM text tokens.
+    """
+    tree: HTMLTree = HTMLTree.parse(html)
+    for e in tree.body.query_selector_all("script, style"):
+        e.decompose()
+    return len(tokenize_words(tree.body.text))
+
 
+def compute_page_statistics(html: str) -> PageStatistics:
+    """Collects the page statistics of the HTML in a single traversal of its DOM.
+
+    The HTML is parsed once. After the traversal, the scripts and styles are removed from the same tree
+    to count the DOM text tokens as in `count_dom_text_tokens`.
+
+    Args:
+        html: The HTML as string.
+
+    Returns:
+        The page statistics.
+    """
     tree: HTMLTree = HTMLTree.parse(html)
+    num_html_bytes: int = len(html.encode("utf-8"))
+
+    num_dom_nodes: int = 0
+    max_depth: int = 0
+    num_leaves: int = 0
+    num_text_bytes: int = 0
+    num_link_text_bytes: int = 0
+    num_script_style_bytes: int = 0
+
+    # Stack entries: (node, depth, inside a link, inside a script or style element)
+    stack: List[Tuple[DOMNode, int, bool, bool]] = [(tree.document, 0, False, False)]
+    while stack:
+        node, depth, in_link, in_script_style = stack.pop()
+        num_dom_nodes += 1
+        max_depth = max(max_depth, depth)
+
+        if node.type == NodeType.TEXT:
+            num_bytes: int = len(node.text.encode("utf-8"))
+            if in_script_style:
+                num_script_style_bytes += num_bytes
+            else:
+                num_text_bytes += num_bytes
+                if in_link:
+                    num_link_text_bytes += num_bytes
+        elif node.type == NodeType.ELEMENT:
+            in_link = in_link or node.tag == "a"
+            in_script_style = in_script_style or node.tag in ("script", "style")
+
+        child: Optional[DOMNode] = node.first_child
+        if child is None:
+            num_leaves += 1
+        while child is not None:
+            stack.append((child, depth + 1, in_link, in_script_style))
+            child = child.next
+
     for e in tree.body.query_selector_all("script, style"):
         e.decompose()
     num_dom_text_tokens: int = len(tokenize_words(tree.body.text))
 
+    num_markup_bytes: int = max(1, num_html_bytes - num_text_bytes)
+    return PageStatistics(
+        num_dom_nodes=num_dom_nodes,
+        max_depth=max_depth,
+        num_leaves=num_leaves,
+        text_to_markup_ratio=num_text_bytes / num_markup_bytes,
+        link_density=num_link_text_bytes / num_text_bytes if num_text_bytes else 0.0,
+        script_style_share=num_script_style_bytes / num_html_bytes if num_html_bytes else 0.0,
+        num_dom_text_tokens=num_dom_text_tokens,
+    )
+
+
+def compute_complexity_from_counts(num_ground_truth_tokens: int, num_dom_text_tokens: int) -> float:
+    """Calculates the page complexity (see `compute_complexity`) from the token counts."""
     complexity: float = 1 - num_ground_truth_tokens / num_dom_text_tokens
     return max(0.0, min(complexity, 1.0))  # Restrict score to [0; 1]
 
 
+def hash_html(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+def count_dataset_dom_text_tokens(
+    htmls: Sequence[str],
+    num_workers: int = 1,
+    cache: Optional[MutableMapping[str, int]] = None,
+) -> List[int]:
+    """Counts the DOM text tokens of each HTML (see `count_dom_text_tokens`).
+
+    Args:
+        htmls: The HTMLs as strings.
+        num_workers: The number of worker processes. With one worker, the HTMLs are processed in this process.
+        cache: Optional mapping of HTML hashes (see `hash_html`) to DOM text token counts.
+            Only the HTMLs missing from the cache are parsed. The cache is updated with their counts.
+
+    Returns:
+        The DOM text token counts in the order of the HTMLs.
+    """
+    if cache is None:
+        cache = {}
+
+    hashes: List[str] = [hash_html(html) for html in htmls]
+    missing: Dict[str, str] = {html_hash: html for html_hash, html in zip(hashes, htmls) if html_hash not in cache}
+
+    counts: List[int] = _map_htmls(count_dom_text_tokens, list(missing.values()), num_workers)
+    cache.update(zip(missing, counts))
+    return [cache[html_hash] for html_hash in hashes]
+
+
+def compute_dataset_page_statistics(htmls: Sequence[str], num_workers: int = 1) -> List[PageStatistics]:
+    """Collects the page statistics of each HTML (see `compute_page_statistics`).
+
+    Args:
+        htmls: The HTMLs as strings.
+        num_workers: The number of worker processes. With one worker, the HTMLs are processed in this process.
+
+    Returns:
+        The page statistics in the order of the HTMLs.
+    """
+    return _map_htmls(compute_page_statistics, htmls, num_workers)
+
+
+def _map_htmls(function: Callable[[str], T], htmls: Sequence[str], num_workers: int) -> List[T]:
+    if num_workers > 1 and len(htmls) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=num_workers) as executor:
+            chunksize: int = max(1, len(htmls) // (4 * num_workers))
+            return list(executor.map(function, htmls, chunksize=chunksize))
+    return [function(html) for html in htmls]
+
+
 def compute_dataset_complexities(
     htmls: Sequence[str],
     bodies: Sequence[List[str]],
@@ -47,13 +204,52 @@ def compute_dataset_complexities(
 ) -> List[float]:
     assert len(htmls) == len(bodies)
     return [
-        compute_complexity(
-            html=html,
-            text=" ".join(
-                prepare_body(body)
-                if include_optional_paragraphs
-                else prepare_body(body, remove_paragraphs=set(get_optional_paragraph_indices(body)))
-            ),
-        )
+        compute_complexity(html=html, text=_get_ground_truth_text(body, include_optional_paragraphs))
         for html, body in zip(htmls, bodies)
     ]
+
+
+def compute_dataset_complexity_variants(
+    htmls: Sequence[str],
+    bodies: Sequence[List[str]],
+    num_workers: int = 1,
+    cache: Optional[MutableMapping[str, int]] = None,
+) -> Tuple[List[float], List[float]]:
+    """Calculates the page complexities without and with optional paragraphs.
+
+    Each HTML is parsed only once, since the DOM text token count is independent of the ground truth variant.
+
+    Args:
+        htmls: The HTMLs as strings.
+        bodies: The ground truth bodies corresponding to the HTMLs.
+        num_workers: The number of worker processes to parse the HTMLs.
+        cache: Optional cache of DOM text token counts (see `count_dataset_dom_text_tokens`).
+
+    Returns:
+        The page complexities without optional paragraphs and with optional paragraphs.
+    """
+    assert len(htmls) == len(bodies)
+    num_dom_text_tokens: List[int] = count_dataset_dom_text_tokens(htmls, num_workers=num_workers, cache=cache)
+    return compute_dataset_complexity_variants_from_counts(bodies, num_dom_text_tokens)
+
+
+def compute_dataset_complexity_variants_from_counts(
+    bodies: Sequence[List[str]], num_dom_text_tokens: Iterable[int]
+) -> Tuple[List[float], List[float]]:
+    """Calculates the page complexities without and with optional paragraphs from the DOM text token counts."""
+    complexities: Tuple[List[float], List[float]] = ([], [])
+    for body, num_tokens in zip(bodies, num_dom_text_tokens):
+        for complexity_variant, include_optional_paragraphs in zip(complexities, (False, True)):
+            num_ground_truth_tokens: int = len(
+                tokenize_words(_get_ground_truth_text(body, include_optional_paragraphs))
+            )
+            complexity_variant.append(compute_complexity_from_counts(num_ground_truth_tokens, num_tokens))
+    return complexities
+
+
+def _get_ground_truth_text(body: List[str], include_optional_paragraphs: bool) -> str:
+    return " ".join(
+        prepare_body(body)
+        if include_optional_paragraphs
+        else prepare_body(body, remove_paragraphs=set(get_optional_paragraph_indices(body)))
+    )
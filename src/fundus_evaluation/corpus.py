@@ -0,0 +1,199 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import numpy as np
+import numpy.typing as npt
+
+from fundus_evaluation.storage import find_articles_files
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    is_optional_paragraph,
+    load_evaluation_articles,
+    remove_optional_paragraph_marker,
+)
+
+
+class ParagraphTable:
+    """Deduplicated paragraph texts, each stored once and referenced by an integer identifier.
+
+    Equal paragraphs interned into the same table have the same identifier, such that paragraphs can be compared
+    by their identifiers instead of their texts.
+    """
+
+    __slots__ = ("_texts", "_identifiers")
+
+    def __init__(self) -> None:
+        self._texts: List[str] = []
+        self._identifiers: Dict[str, int] = {}
+
+    def intern(self, text: str) -> int:
+        """Returns the identifier of the paragraph, adding the paragraph to the table if necessary."""
+        identifier: Optional[int] = self._identifiers.get(text)
+        if identifier is None:
+            identifier = self._identifiers[text] = len(self._texts)
+            self._texts.append(text)
+        return identifier
+
+    def lookup(self, text: str) -> Optional[int]:
+        """Returns the identifier of the paragraph or None if the paragraph is not part of the table."""
+        return self._identifiers.get(text)
+
+    def __getitem__(self, identifier: int) -> str:
+        return self._texts[identifier]
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+
+class ArticleMetadata:
+    """The URL and crawl date of an article."""
+
+    __slots__ = ("url", "crawl_date")
+
+    def __init__(self, url: str, crawl_date: str) -> None:
+        self.url = url
+        self.crawl_date = crawl_date
+
+
+class CompactArticles(Mapping[str, EvaluationArticle]):
+    """Compact representation of articles whose paragraphs are interned into a shared `ParagraphTable`.
+
+    The paragraph identifiers of all articles are stored in one flat array. The paragraphs of the i-th article
+    are `paragraph_ids[offsets[i] : offsets[i + 1]]`. Optional paragraph markers are removed from the interned
+    paragraphs and stored as boolean flags in `optional` instead (see `batch.ArticleBatch`).
+
+    The mapping materializes the `EvaluationArticle` of an identifier on access, such that compact articles can
+    be used in place of the output of `utils.load_evaluation_articles`.
+
+    Args:
+        paragraphs: The paragraph table shared by the articles.
+        identifiers: The article identifiers.
+        offsets: The start offsets of the articles' paragraphs in `paragraph_ids`, followed by the total length.
+        paragraph_ids: The paragraph identifiers of all articles.
+        optional: The optional paragraph flags of all articles.
+        metadata: The URL and crawl date of the articles.
+    """
+
+    __slots__ = ("paragraphs", "identifiers", "offsets", "paragraph_ids", "optional", "metadata", "_positions")
+
+    def __init__(
+        self,
+        paragraphs: ParagraphTable,
+        identifiers: List[str],
+        offsets: npt.NDArray[np.int64],
+        paragraph_ids: npt.NDArray[np.int32],
+        optional: npt.NDArray[np.bool_],
+        metadata: List[ArticleMetadata],
+    ) -> None:
+        self.paragraphs = paragraphs
+        self.identifiers = identifiers
+        self.offsets = offsets
+        self.paragraph_ids = paragraph_ids
+        self.optional = optional
+        self.metadata = metadata
+        self._positions: Dict[str, int] = {identifier: position for position, identifier in enumerate(identifiers)}
+
+    @classmethod
+    def from_articles(
+        cls, articles: Mapping[str, EvaluationArticle], paragraphs: Optional[ParagraphTable] = None
+    ) -> "CompactArticles":
+        """Converts articles, e.g. loaded with `utils.load_evaluation_articles`, to their compact representation.
+
+        Args:
+            articles: The articles.
+            paragraphs: The paragraph table to intern the paragraphs into. Per default, a new table is created.
+
+        Returns:
+            The compact articles in the order of the given articles.
+        """
+        paragraphs = ParagraphTable() if paragraphs is None else paragraphs
+        offsets: npt.NDArray[np.int64] = np.zeros(len(articles) + 1, dtype=np.int64)
+        np.cumsum([len(article["body"]) for article in articles.values()], out=offsets[1:])
+
+        paragraph_ids: npt.NDArray[np.int32] = np.empty(offsets[-1], dtype=np.int32)
+        optional: npt.NDArray[np.bool_] = np.empty(offsets[-1], dtype=bool)
+        metadata: List[ArticleMetadata] = []
+        position: int = 0
+        for article in articles.values():
+            for paragraph in article["body"]:
+                paragraph_ids[position] = paragraphs.intern(remove_optional_paragraph_marker(paragraph))
+                optional[position] = is_optional_paragraph(paragraph)
+                position += 1
+            metadata.append(ArticleMetadata(article["url"], article["crawl_date"]))
+
+        return cls(paragraphs, list(articles), offsets, paragraph_ids, optional, metadata)
+
+    def get_position(self, article_identifier: str) -> int:
+        """Returns the position of the article, e.g. to slice its paragraphs with the offsets."""
+        return self._positions[article_identifier]
+
+    def get_paragraph_ids(self, article_identifier: str) -> Tuple[npt.NDArray[np.int32], npt.NDArray[np.bool_]]:
+        """Returns views of the paragraph identifiers and optional paragraph flags of the article."""
+        position: int = self._positions[article_identifier]
+        start, end = self.offsets[position], self.offsets[position + 1]
+        return self.paragraph_ids[start:end], self.optional[start:end]
+
+    def get_body(self, article_identifier: str) -> List[str]:
+        """Returns the body of the article, including the optional paragraph markers."""
+        paragraph_ids, optional = self.get_paragraph_ids(article_identifier)
+        return [
+            f"[{self.paragraphs[paragraph_id]}]" if is_optional else self.paragraphs[paragraph_id]
+            for paragraph_id, is_optional in zip(paragraph_ids.tolist(), optional.tolist())
+        ]
+
+    def __getitem__(self, article_identifier: str) -> EvaluationArticle:
+        metadata: ArticleMetadata = self.metadata[self._positions[article_identifier]]
+        return {"url": metadata.url, "body": self.get_body(article_identifier), "crawl_date": metadata.crawl_date}
+
+    def __contains__(self, article_identifier: object) -> bool:
+        return article_identifier in self._positions
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.identifiers)
+
+    def __len__(self) -> int:
+        return len(self.identifiers)
+
+
+class Corpus:
+    """The ground truth and extractions of a dataset sharing one paragraph table.
+
+    Paragraphs extracted by several scrapers and contained in the ground truth are only stored once.
+
+    Example:
+        >>> corpus = Corpus.load("dataset/ground_truth.json", "dataset/extractions")
+        >>> corpus.extractions["trafilatura"]["CNBC_1.html.gz"]["body"]
+    """
+
+    __slots__ = ("paragraphs", "ground_truth", "extractions")
+
+    def __init__(
+        self,
+        paragraphs: ParagraphTable,
+        ground_truth: CompactArticles,
+        extractions: Optional[Dict[str, CompactArticles]] = None,
+    ) -> None:
+        self.paragraphs = paragraphs
+        self.ground_truth = ground_truth
+        self.extractions: Dict[str, CompactArticles] = {} if extractions is None else extractions
+
+    @classmethod
+    def load(
+        cls, ground_truth_path: Union[str, Path], extractions_directory: Union[str, Path, None] = None
+    ) -> "Corpus":
+        """Loads the ground truth and the extraction files of the extractions directory by their scraper identifier.
+
+        The files are loaded and converted one at a time, such that only one file is held as raw articles.
+        """
+        paragraphs: ParagraphTable = ParagraphTable()
+        ground_truth: CompactArticles = CompactArticles.from_articles(
+            load_evaluation_articles(ground_truth_path), paragraphs
+        )
+
+        extractions: Dict[str, CompactArticles] = {}
+        if extractions_directory is not None:
+            for scraper_identifier, extraction_path in find_articles_files(extractions_directory).items():
+                extractions[scraper_identifier] = CompactArticles.from_articles(
+                    load_evaluation_articles(extraction_path), paragraphs
+                )
+        return cls(paragraphs, ground_truth, extractions)
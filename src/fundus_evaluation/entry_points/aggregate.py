@@ -0,0 +1,39 @@
+import itertools
+from pathlib import Path
+from typing import Iterator, Optional, Sequence, Union
+
+from fundus_evaluation.aggregation import DEFAULT_RELATIVE_ACCURACY, ScoreSummary
+
+
+def aggregate(
+    output_directory: Union[str, Path],
+    score_paths: Sequence[Union[str, Path]] = (),
+    summary_paths: Sequence[Union[str, Path]] = (),
+    name: Optional[str] = None,
+    chunk_size: int = 100_000,
+    relative_accuracy: float = DEFAULT_RELATIVE_ACCURACY,
+) -> ScoreSummary:
+    if not score_paths and not summary_paths:
+        raise ValueError("At least one score file or summary is required")
+
+    if name is None:
+        name = Path(score_paths[0] if score_paths else summary_paths[0]).name.split(".")[0]
+
+    output_directory = Path(output_directory)
+    output_directory.mkdir(parents=True, exist_ok=True)
+
+    # The summaries are loaded one at a time while merging
+    summaries: Iterator[ScoreSummary] = (ScoreSummary.load(summary_path) for summary_path in summary_paths)
+    if score_paths:
+        summaries = itertools.chain(
+            summaries,
+            (ScoreSummary.from_files(score_paths, chunk_size=chunk_size, relative_accuracy=relative_accuracy),),
+        )
+    summary: ScoreSummary = ScoreSummary.merge_all(summaries)
+
+    summary.save(output_directory / f"{name}.summary.pkl")
+    summary.summarize(["scraper"]).to_csv(output_directory / f"{name}_scraper_summary.tsv", sep="\t")
+    summary.summarize(["scraper", "publisher"]).to_csv(
+        output_directory / f"{name}_scraper_to_publisher_summary.tsv", sep="\t"
+    )
+    return summary
@@ -5,31 +5,36 @@ from typing import Union
 import pandas as pd
 
 from fundus_evaluation.analysis import (
+    compute_rouge_lsum_scraper_bootstrap_summary,
+    compute_rouge_lsum_scraper_significance,
     compute_rouge_lsum_scraper_summary,
     compute_rouge_lsum_scraper_to_publisher_summary,
     draw_complexity_boxplot,
     draw_rouge_lsum_f1_score_stripplot,
     draw_rouge_lsum_stripplot,
 )
+from fundus_evaluation.storage import load_scores
 
 
 def analysis(
     output_directory: Union[str, Path],
     complexity_path: Union[str, Path, None] = None,
     rouge_lsum_path: Union[str, Path, None] = None,
+    num_resamples: int = 10_000,
+    stratify: bool = True,
 ) -> None:
     output_directory = Path(output_directory)
     output_directory.mkdir(parents=True, exist_ok=True)
 
     if complexity_path is not None:
-        complexity: pd.DataFrame = pd.read_csv(complexity_path, sep="\t")
+        complexity: pd.DataFrame = load_scores(complexity_path)
         if complexity.isna().any(axis=None):
             warnings.warn("NaN values detected in complexity results.")
 
         draw_complexity_boxplot(complexity, out=output_directory)
 
     if rouge_lsum_path:
-        rouge_lsum: pd.DataFrame = pd.read_csv(rouge_lsum_path, sep="\t")
+        rouge_lsum: pd.DataFrame = load_scores(rouge_lsum_path)
         if rouge_lsum.isna().any(axis=None):
             warnings.warn("NaN values detected in ROUGE-LSum results.")
 
@@ -37,3 +42,11 @@ def analysis(
         draw_rouge_lsum_f1_score_stripplot(rouge_lsum, out=output_directory)
         compute_rouge_lsum_scraper_summary(rouge_lsum, out=output_directory)
         compute_rouge_lsum_scraper_to_publisher_summary(rouge_lsum, out=output_directory)
+
+        if num_resamples > 0:
+            compute_rouge_lsum_scraper_bootstrap_summary(
+                rouge_lsum, out=output_directory, num_resamples=num_resamples, stratify=stratify
+            )
+            compute_rouge_lsum_scraper_significance(
+                rouge_lsum, out=output_directory, num_resamples=num_resamples, stratify=stratify
+            )
@@ -0,0 +1,105 @@
+import re
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+from fundus_evaluation.benchmarks import (
+    DEFAULT_SCALES,
+    DEFAULT_THRESHOLD,
+    BenchmarkInputs,
+    BenchmarkResult,
+    Comparison,
+    collect_benchmarks,
+    compare,
+    get_environment,
+    load_results,
+    save_results,
+    time_benchmark,
+)
+
+
+def benchmark(
+    ground_truth_path: Union[str, Path],
+    html_directory: Union[str, Path],
+    extractions_directory: Union[str, Path, None] = None,
+    scores_directory: Union[str, Path, None] = None,
+    output_path: Union[str, Path, None] = None,
+    baseline_path: Union[str, Path, None] = None,
+    threshold: float = DEFAULT_THRESHOLD,
+    select: Optional[str] = None,
+    scales: Sequence[int] = DEFAULT_SCALES,
+    repeats: int = 5,
+    min_time: float = 0.2,
+    update_baseline: bool = False,
+) -> List[Comparison]:
+    """Runs the benchmark suite and compares the results to the baseline.
+
+    Args:
+        ground_truth_path: The path to the dataset's ground truth file.
+        html_directory: The dataset's HTML directory.
+        extractions_directory: The extractions directory. If set, the extraction loading is benchmarked
+            and the scorers are benchmarked with the BTE extractions instead of the ground truth.
+        scores_directory: The scores directory. If set, the score loading is benchmarked.
+        output_path: If set, the results are saved to this path.
+        baseline_path: The path to the baseline results to compare to.
+        threshold: The maximum tolerated relative slowdown of a benchmark's minimum time, e.g. 0.25 for 25%.
+        select: If set, only benchmarks whose names match this regular expression are run.
+        scales: The factors of the synthetic inputs.
+        repeats: The number of repeats per benchmark.
+        min_time: The minimum time in seconds per repeat.
+        update_baseline: If True, the baseline is replaced with the results.
+
+    Returns:
+        The regressions beyond the threshold.
+    """
+    inputs: BenchmarkInputs = BenchmarkInputs.load(
+        ground_truth_path, html_directory, extractions_directory, scores_directory
+    )
+    benchmarks, skipped = collect_benchmarks(inputs, scales)
+    if select is not None:
+        pattern: re.Pattern[str] = re.compile(select)
+        benchmarks = [case for case in benchmarks if pattern.search(case.name)]
+        skipped = {name: reason for name, reason in skipped.items() if pattern.search(name)}
+
+    environment: Dict[str, Any] = get_environment(inputs)
+    baseline: Dict[str, BenchmarkResult] = {}
+    if baseline_path is not None and Path(baseline_path).exists():
+        baseline_environment: Dict[str, Any]
+        baseline_environment, baseline = load_results(baseline_path)
+        if baseline_environment != environment:
+            print(f"Warning: The baseline was recorded in a different environment: {baseline_environment}")
+
+    results: List[BenchmarkResult] = []
+    for case in benchmarks:
+        try:
+            result: BenchmarkResult = time_benchmark(case, repeats=repeats, min_time=min_time)
+        except Exception as error:  # E.g. missing models or data of installed dependencies
+            skipped[case.name] = f"{type(error).__name__}: {error}"
+            continue
+
+        results.append(result)
+        relative: str = ""
+        if result.name in baseline:
+            relative = f"{result.minimum / baseline[result.name].minimum:>7.2f}x baseline"
+        print(f"{result.name:<50} {result.median * 1000:>12.2f} ms (min {result.minimum * 1000:.2f} ms) {relative}")
+
+    for name, reason in sorted(skipped.items()):
+        print(f"{name:<50} skipped ({' '.join(reason.split())[:100]})")
+
+    if output_path is not None:
+        save_results(output_path, results, environment)
+
+    regressions: List[Comparison] = [
+        comparison for comparison in compare(results, baseline) if comparison.is_regression(threshold)
+    ]
+    for regression in regressions:
+        print(
+            f"Regression: {regression.name!r} took {regression.current * 1000:.2f} ms "
+            f"({regression.ratio:.2f}x the baseline {regression.baseline * 1000:.2f} ms)"
+        )
+
+    if baseline_path is not None and (update_baseline or not baseline):
+        # Benchmarks that were not run keep their baseline
+        save_results(baseline_path, {**baseline, **{result.name: result for result in results}}.values(), environment)
+        print(f"Saved the baseline to {str(baseline_path)!r}")
+
+    return regressions
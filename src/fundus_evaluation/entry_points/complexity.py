@@ -1,9 +1,20 @@
+import contextlib
+import dataclasses
+import json
+import warnings
 from pathlib import Path
-from typing import Dict, List, Union
+from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 
-from fundus_evaluation.complexity import compute_dataset_complexities
+from fundus_evaluation.complexity import (
+    PageStatistics,
+    compute_dataset_complexity_variants,
+    compute_dataset_complexity_variants_from_counts,
+    compute_dataset_page_statistics,
+    hash_html,
+)
+from fundus_evaluation.profiling import Profiler
 from fundus_evaluation.utils import (
     EvaluationArticle,
     load_evaluation_articles,
@@ -15,6 +26,10 @@ def complexity(
     ground_truth_path: Union[str, Path],
     html_directory: Union[str, Path],
     output_path: Union[str, Path],
+    num_workers: int = 1,
+    cache_path: Union[str, Path, None] = None,
+    extended: bool = False,
+    profiler: Optional[Profiler] = None,
 ) -> None:
     html_directory = Path(html_directory)
     output_path = Path(output_path)
@@ -27,15 +42,44 @@ def complexity(
     ]
     bodies: List[List[str]] = [article["body"] for article in evaluation_articles.values()]
 
+    # The cache maps HTML hashes to their DOM text token counts
+    cache: Dict[str, int] = {}
+    if cache_path is not None and Path(cache_path).exists():
+        with open(cache_path, "r", encoding="utf-8") as cache_file:
+            cache = json.load(cache_file)
+
+    if profiler is not None and num_workers > 1:
+        warnings.warn("Profiling calculates the complexities in this process instead of worker processes.")
+        num_workers = 1
+
+    complexities: Tuple[List[float], List[float]]
+    page_statistics: List[PageStatistics] = []
+    with profiler.profile("complexity") if profiler is not None else contextlib.nullcontext():
+        if extended:
+            # The page statistics include the DOM text token counts, so that each page is only parsed once
+            page_statistics = compute_dataset_page_statistics(htmls, num_workers=num_workers)
+            num_dom_text_tokens: List[int] = [statistics.num_dom_text_tokens for statistics in page_statistics]
+            cache.update(zip(map(hash_html, htmls), num_dom_text_tokens))
+            complexities = compute_dataset_complexity_variants_from_counts(bodies, num_dom_text_tokens)
+        else:
+            complexities = compute_dataset_complexity_variants(htmls, bodies, num_workers=num_workers, cache=cache)
+
+    if cache_path is not None:
+        with open(cache_path, "w", encoding="utf-8") as cache_file:
+            json.dump(cache, cache_file)
+
     df: pd.DataFrame = pd.DataFrame(
         {
-            "complexity_without_optional_paragraphs": compute_dataset_complexities(
-                htmls, bodies, include_optional_paragraphs=False
-            ),
-            "complexity_with_optional_paragraphs": compute_dataset_complexities(
-                htmls, bodies, include_optional_paragraphs=True
-            ),
+            "complexity_without_optional_paragraphs": complexities[0],
+            "complexity_with_optional_paragraphs": complexities[1],
         },
         index=pd.Index(evaluation_articles, name="article"),
     )
+    if extended:
+        df = df.join(
+            pd.DataFrame(
+                [dataclasses.asdict(statistics) for statistics in page_statistics],
+                index=pd.Index(evaluation_articles, name="article"),
+            )
+        )
     df.sort_index().to_csv(output_path, sep="\t")
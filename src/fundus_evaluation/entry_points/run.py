@@ -0,0 +1,502 @@
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+from datetime import datetime
+from pathlib import Path
+from typing import (
+    IO,
+    AbstractSet,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+from tqdm import tqdm
+
+from fundus_evaluation import SCORERS, SCRAPERS
+from fundus_evaluation.cache import (
+    ScoreCache,
+    get_scorer_version,
+    get_scraper_version,
+    hash_article,
+    hash_body,
+    score_with_cache,
+)
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.scorers import Scorer
+from fundus_evaluation.scrapers import Scraper
+from fundus_evaluation.storage import iter_evaluation_articles
+from fundus_evaluation.telemetry import Telemetry
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    get_html_input,
+    load_evaluation_articles,
+    load_zipped_html_bytes,
+)
+
+
+def _hash_file(path: Path) -> Optional[str]:
+    if not path.exists():
+        return None
+    digest = hashlib.sha256()
+    with path.open("rb") as file:
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _hash_json(content: Any) -> str:
+    return hashlib.sha256(json.dumps(content, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+class Manifest:
+    """Input and output hashes of the pipeline stages of the previous run, e.g. `extraction/fundus`."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        if path.exists():
+            with path.open("r", encoding="utf-8") as manifest_file:
+                self.stages = json.load(manifest_file)
+
+    def is_fresh(self, stage: str, input_hash: str, output_path: Path) -> bool:
+        """Returns whether the stage's input and output are unchanged since the previous run."""
+        entry: Dict[str, Any] = self.stages.get(stage, {})
+        return entry.get("input_hash") == input_hash and entry.get("output_hash") == _hash_file(output_path)
+
+    def save(self) -> None:
+        with self.path.open("w", encoding="utf-8") as manifest_file:
+            json.dump(self.stages, manifest_file, indent=4, sort_keys=True)
+
+
+def _hash_article_inputs(evaluation_articles: Dict[str, EvaluationArticle], html_directory: Path) -> Dict[str, str]:
+    """Hashes the compressed HTML, URL and crawl date of each article, i.e. the inputs of the scrapers."""
+    input_hashes: Dict[str, str] = {}
+    for article_identifier, article in evaluation_articles.items():
+        digest = hashlib.sha256((html_directory / article_identifier).read_bytes())
+        digest.update(f"\0{article['url']}\0{article['crawl_date']}".encode("utf-8"))
+        input_hashes[article_identifier] = digest.hexdigest()
+    return input_hashes
+
+
+class _ReusableExtractions:
+    """Looks up the reusable extractions of a scraper without loading them at once.
+
+    Extractions are reused from the journal of an interrupted run or the extraction file of the previous run
+    if the article's inputs and the scraper version did not change. Only the byte offsets of the journal's entries
+    are kept in memory. The extraction file is streamed, such that the lookups have to follow the order of its
+    article identifiers, i.e. the order of the ground truth.
+
+    The extraction file is only kept as is if all extractions are reused from it (see `is_complete`).
+    Otherwise, it is rewritten from the reused and fresh extractions and the journal is removed afterwards.
+    """
+
+    def __init__(
+        self,
+        manifest: Manifest,
+        scraper_identifier: str,
+        extraction_path: Path,
+        journal_path: Path,
+        input_hashes: Dict[str, str],
+        version: str,
+    ) -> None:
+        self.extraction_path = extraction_path
+        self.journal_path = journal_path
+        self._num_articles: int = len(input_hashes)
+
+        entry: Dict[str, Any] = manifest.stages.get(f"extraction/{scraper_identifier}", {})
+        self._previous: Set[str] = set()
+        if entry.get("version") == version and entry.get("output_hash") == _hash_file(extraction_path):
+            previous_input_hashes: Dict[str, str] = entry.get("articles", {})
+            self._previous = {
+                article_identifier
+                for article_identifier, input_hash in input_hashes.items()
+                if previous_input_hashes.get(article_identifier) == input_hash
+            }
+        self._previous_items: Optional[Iterator[Tuple[str, EvaluationArticle]]] = None
+        self._previous_item: Optional[Tuple[str, EvaluationArticle]] = None
+
+        self._journal_offsets: Dict[str, int] = {}
+        if journal_path.exists():
+            with journal_path.open("rb") as journal_file:
+                offset: int = 0
+                for line in journal_file:
+                    try:
+                        journal_entry: Dict[str, Any] = json.loads(line)
+                    except ValueError:  # The last entry of an interrupted run may be incomplete
+                        break
+                    if (
+                        journal_entry["version"] == version
+                        and input_hashes.get(journal_entry["article"]) == journal_entry["input_hash"]
+                    ):
+                        self._journal_offsets[journal_entry["article"]] = offset
+                    offset += len(line)
+
+    @property
+    def is_complete(self) -> bool:
+        """Whether the extraction file of the previous run contains the reusable extractions of all articles."""
+        return len(self._previous) == self._num_articles
+
+    def get(self, article_identifier: str) -> Optional[EvaluationArticle]:
+        """Returns the reusable extraction of the article or None if the article has to be extracted."""
+        offset: Optional[int] = self._journal_offsets.get(article_identifier)
+        if offset is not None:
+            with self.journal_path.open("rb") as journal_file:
+                journal_file.seek(offset)
+                article: EvaluationArticle = json.loads(journal_file.readline())["extraction"]
+            return article
+
+        if article_identifier not in self._previous:
+            return None
+        if self._previous_items is None:
+            self._previous_items = (
+                item for batch in iter_evaluation_articles(self.extraction_path) for item in batch.items()
+            )
+            self._previous_item = next(self._previous_items, None)
+        while self._previous_item is not None and self._previous_item[0] < article_identifier:
+            self._previous_item = next(self._previous_items, None)
+        if self._previous_item is not None and self._previous_item[0] == article_identifier:
+            return self._previous_item[1]
+        return None
+
+
+def _write_json_item(file: IO[str], key: str, value: Any, first: bool) -> None:
+    """Writes an item of a JSON object formatted like `json.dump(..., indent=4)` of the entire object."""
+    file.write("{\n" if first else ",\n")
+    file.write(json.dumps({key: value}, indent=4, ensure_ascii=False)[2:-2])
+
+
+def run(
+    ground_truth_path: Union[str, Path],
+    html_directory: Union[str, Path],
+    output_directory: Union[str, Path],
+    scrapers: Optional[AbstractSet[str]] = None,
+    exclude_scrapers: AbstractSet[str] = frozenset(),
+    scorers: Optional[AbstractSet[str]] = None,
+    max_optional_paragraphs: Optional[int] = 4,
+    cache_path: Union[str, Path, None] = None,
+    batch_size: int = 16,
+    num_resamples: int = 10_000,
+    force: bool = False,
+    telemetry: Optional[Telemetry] = None,
+) -> None:
+    """Runs the extraction, scoring and analysis in one pass over the articles.
+
+    Each batch of articles is extracted by all scrapers and immediately scored by all scorers.
+    The extractions and scores are written after each batch, such that only one batch is held in memory.
+    The pipeline keeps a manifest of the stages' input and output hashes in the output directory.
+    On subsequent runs, unchanged extractions are reused, unchanged scorer stages are skipped and
+    the remaining scores are looked up in the score cache.
+
+    The output directory contains the `extractions`, `scores` and `analysis` directories of the
+    `scrape`, `score` and `analysis` entry points. The analysis requires the ROUGE-LSum scorer.
+
+    Args:
+        ground_truth_path: The path to the dataset's ground truth file.
+        html_directory: The dataset's HTML directory.
+        output_directory: The pipeline's output directory.
+        scrapers: The effective scrapers. Per default, all available scrapers are included.
+        exclude_scrapers: The excluded scrapers.
+        scorers: The effective scorers. Per default, all available scorers are included.
+        max_optional_paragraphs: The maximum number of variants of optional paragraphs.
+        cache_path: The path to the score cache. Per default, `score_cache.sqlite` in the output directory.
+        batch_size: The number of articles extracted and scored at once.
+        num_resamples: The number of resamples of the analysis' confidence intervals and significance tests.
+        force: If True, the manifest is ignored and all stages are recomputed.
+        telemetry: If set, the run's metrics and traces are recorded.
+    """
+    scraper_identifiers: List[str] = [
+        scraper_identifier
+        for scraper_identifier in SCRAPERS
+        if (scrapers is None or scraper_identifier in scrapers) and scraper_identifier not in exclude_scrapers
+    ]
+    scorer_identifiers: List[str] = [
+        scorer_identifier for scorer_identifier in SCORERS if scorers is None or scorer_identifier in scorers
+    ]
+
+    html_directory = Path(html_directory)
+    output_directory = Path(output_directory)
+    extractions_directory: Path = output_directory / "extractions"
+    scores_directory: Path = output_directory / "scores"
+    extractions_directory.mkdir(parents=True, exist_ok=True)
+    scores_directory.mkdir(parents=True, exist_ok=True)
+
+    manifest: Manifest = Manifest(output_directory / "manifest.json")
+    if force:
+        manifest.stages = {}
+
+    evaluation_articles: Dict[str, EvaluationArticle] = load_evaluation_articles(ground_truth_path)
+    input_hashes: Dict[str, str] = _hash_article_inputs(evaluation_articles, html_directory)
+
+    # Plan the extraction stages: Reuse the extractions of unchanged articles
+    scraper_versions: Dict[str, str] = {}
+    reusable_extractions: Dict[str, _ReusableExtractions] = {}
+    for scraper_identifier in scraper_identifiers:
+        scraper_versions[scraper_identifier] = get_scraper_version(SCRAPERS[scraper_identifier])
+        reusable_extractions[scraper_identifier] = _ReusableExtractions(
+            manifest,
+            scraper_identifier,
+            extractions_directory / f"{scraper_identifier}.json",
+            extractions_directory / f"{scraper_identifier}.journal.jsonl",
+            input_hashes,
+            scraper_versions[scraper_identifier],
+        )
+    stale_scrapers: Dict[str, Scraper] = {
+        scraper_identifier: SCRAPERS[scraper_identifier]
+        for scraper_identifier in scraper_identifiers
+        if not reusable_extractions[scraper_identifier].is_complete
+    }
+
+    # Plan the score stages: A scorer's inputs are the ground truth and the scrapers' inputs
+    extraction_input_hash: str = _hash_json(
+        {
+            scraper_identifier: {"version": scraper_versions[scraper_identifier], "articles": input_hashes}
+            for scraper_identifier in scraper_identifiers
+        }
+    )
+    ground_truth_hash: Optional[str] = _hash_file(Path(ground_truth_path))
+    score_input_hashes: Dict[str, str] = {}
+    stale_scorers: Dict[str, Scorer] = {}
+    for scorer_identifier in scorer_identifiers:
+        scorer: Scorer = SCORERS[scorer_identifier]
+        score_input_hashes[scorer_identifier] = _hash_json(
+            {
+                "ground_truth": ground_truth_hash,
+                "extractions": extraction_input_hash,
+                "max_optional_paragraphs": max_optional_paragraphs,
+                "version": get_scorer_version(scorer),
+            }
+        )
+        if not manifest.is_fresh(
+            f"score/{scorer_identifier}",
+            score_input_hashes[scorer_identifier],
+            scores_directory / f"{scorer_identifier}.tsv",
+        ):
+            stale_scorers[scorer_identifier] = scorer
+
+    if telemetry is not None:
+        stale_scrapers = {
+            scraper_identifier: telemetry.instrument_scraper(scraper_identifier, scraper)
+            for scraper_identifier, scraper in stale_scrapers.items()
+        }
+        stale_scorers = {
+            scorer_identifier: telemetry.instrument_scorer(scorer_identifier, scorer)
+            for scorer_identifier, scorer in stale_scorers.items()
+        }
+
+    # Stream the articles through the extraction and scoring stages. The outputs are written after each batch
+    # to partial files that replace the outputs at the end of the run. The fresh extractions are additionally
+    # appended to a journal, such that an interrupted run can reuse them. A scraper with journaled extractions
+    # is stale, such that its extraction file is rewritten from the reused extractions and the journal is removed.
+    references: ReferenceIndex = ReferenceIndex.from_articles(evaluation_articles, max_optional_paragraphs)
+    reference_hashes: Dict[str, str] = {
+        article_identifier: hash_body(article["body"]) for article_identifier, article in evaluation_articles.items()
+    }
+
+    def get_partial_path(path: Path) -> Path:
+        return path.with_name(f"{path.name}.partial")
+
+    extraction_paths: Dict[str, Path] = {
+        scraper_identifier: extractions_directory / f"{scraper_identifier}.json"
+        for scraper_identifier in scraper_identifiers
+    }
+    # The scores of each scorer are written to one partial file per scraper to group the rows by scraper
+    score_part_paths: Dict[Tuple[str, str], Path] = {
+        (scorer_identifier, scraper_identifier): scores_directory / f"{scorer_identifier}.{scraper_identifier}.partial"
+        for scorer_identifier in stale_scorers
+        for scraper_identifier in scraper_identifiers
+    }
+
+    if stale_scrapers or stale_scorers:
+        cache: ScoreCache = ScoreCache(output_directory / "score_cache.sqlite" if cache_path is None else cache_path)
+        article_identifiers: List[str] = list(evaluation_articles)
+
+        with contextlib.ExitStack() as stack, tqdm(total=len(article_identifiers), unit="Article") as progress_bar:
+            extraction_files: Dict[str, IO[str]] = {
+                scraper_identifier: stack.enter_context(
+                    get_partial_path(extraction_paths[scraper_identifier]).open("w", encoding="utf-8")
+                )
+                for scraper_identifier in stale_scrapers
+            }
+            journal_files: Dict[str, IO[str]] = {
+                scraper_identifier: stack.enter_context(
+                    reusable_extractions[scraper_identifier].journal_path.open("a", encoding="utf-8")
+                )
+                for scraper_identifier in stale_scrapers
+            }
+            score_files: Dict[Tuple[str, str], IO[str]] = {
+                key: stack.enter_context(path.open("w", encoding="utf-8", newline=""))
+                for key, path in score_part_paths.items()
+            }
+
+            for start in range(0, len(article_identifiers), batch_size):
+                batch: List[str] = article_identifiers[start : start + batch_size]
+
+                extractions: Dict[str, Dict[str, EvaluationArticle]] = {}
+                for scraper_identifier in scraper_identifiers:
+                    scraper: Optional[Scraper] = stale_scrapers.get(scraper_identifier)
+                    if scraper is None and not stale_scorers:
+                        continue
+
+                    if scraper is not None:
+                        progress_bar.set_description(f"Scraping with {scraper_identifier!r}")
+                    extractions[scraper_identifier] = {}
+                    with (
+                        telemetry.stage("scrape", scraper=scraper_identifier)
+                        if telemetry is not None and scraper is not None
+                        else contextlib.nullcontext()
+                    ):
+                        for article_identifier in batch:
+                            extraction: Optional[EvaluationArticle] = reusable_extractions[scraper_identifier].get(
+                                article_identifier
+                            )
+                            if extraction is None:
+                                if scraper is None:
+                                    raise RuntimeError(
+                                        f"The extraction file {str(extraction_paths[scraper_identifier])!r} "
+                                        f"is not sorted by article identifier. Rerun with --force."
+                                    )
+
+                                evaluation_article: EvaluationArticle = evaluation_articles[article_identifier]
+                                content: bytes = load_zipped_html_bytes(html_directory / article_identifier)
+                                if telemetry is not None:
+                                    telemetry.increment("decompressed_bytes_total", len(content))
+                                extraction = {
+                                    "url": evaluation_article["url"],
+                                    "body": scraper(
+                                        url=evaluation_article["url"],
+                                        html=get_html_input(scraper, content),
+                                        publisher_identifier=article_identifier.split("_")[0],
+                                        crawl_date=datetime.fromisoformat(evaluation_article["crawl_date"]),
+                                    ),
+                                    "crawl_date": evaluation_article["crawl_date"],
+                                }
+                                journal_entry: Dict[str, Any] = {
+                                    "article": article_identifier,
+                                    "input_hash": input_hashes[article_identifier],
+                                    "version": scraper_versions[scraper_identifier],
+                                    "extraction": extraction,
+                                }
+                                journal_files[scraper_identifier].write(
+                                    f"{json.dumps(journal_entry, ensure_ascii=False)}\n"
+                                )
+
+                            if scraper is not None:
+                                _write_json_item(
+                                    extraction_files[scraper_identifier],
+                                    article_identifier,
+                                    extraction,
+                                    first=start == 0 and article_identifier == batch[0],
+                                )
+                            extractions[scraper_identifier][article_identifier] = extraction
+
+                    if scraper is not None:
+                        journal_files[scraper_identifier].flush()
+                        extraction_files[scraper_identifier].flush()
+
+                batch_references: ReferenceIndex = references.subset(batch)
+                for scorer_identifier, scorer in stale_scorers.items():
+                    progress_bar.set_description(f"Evaluating with {scorer_identifier!r}")
+                    for scraper_identifier in scraper_identifiers:
+                        hypothesis_articles: Dict[str, EvaluationArticle] = extractions[scraper_identifier]
+                        with (
+                            telemetry.stage("score", scorer=scorer_identifier, scraper=scraper_identifier)
+                            if telemetry is not None
+                            else contextlib.nullcontext()
+                        ):
+                            scores, num_reused = score_with_cache(
+                                scorer,
+                                scorer_identifier,
+                                batch_references,
+                                hypothesis_articles,
+                                reference_hashes,
+                                {
+                                    article_identifier: hash_article(article)
+                                    for article_identifier, article in hypothesis_articles.items()
+                                },
+                                max_optional_paragraphs,
+                                cache,
+                            )
+
+                        score_file: IO[str] = score_files[scorer_identifier, scraper_identifier]
+                        scores.assign(scraper=scraper_identifier).set_index("scraper", append=True).reorder_levels(
+                            ["scraper", "article"]
+                        ).to_csv(score_file, sep="\t", header=score_file.tell() == 0)
+                        score_file.flush()
+
+                        if telemetry is not None:
+                            telemetry.increment("scored_articles_total", len(scores), scorer=scorer_identifier)
+                            telemetry.increment("cache_lookups_total", len(scores), scorer=scorer_identifier)
+                            telemetry.increment("cache_hits_total", num_reused, scorer=scorer_identifier)
+
+                progress_bar.update(len(batch))
+
+            for extraction_file in extraction_files.values():
+                extraction_file.write("\n}" if evaluation_articles else "{}")
+
+        cache.close()
+
+    # Replace the outputs of the recomputed stages
+    for scraper_identifier in scraper_identifiers:
+        extraction_path: Path = extraction_paths[scraper_identifier]
+        if scraper_identifier in stale_scrapers:
+            os.replace(get_partial_path(extraction_path), extraction_path)
+            reusable_extractions[scraper_identifier].journal_path.unlink()
+        manifest.stages[f"extraction/{scraper_identifier}"] = {
+            "version": scraper_versions[scraper_identifier],
+            "articles": input_hashes,
+            "output_hash": _hash_file(extraction_path),
+        }
+
+    for scorer_identifier in stale_scorers:
+        score_path: Path = scores_directory / f"{scorer_identifier}.tsv"
+        with get_partial_path(score_path).open("w", encoding="utf-8", newline="") as score_file:
+            for scraper_identifier in scraper_identifiers:
+                score_part_path: Path = score_part_paths[scorer_identifier, scraper_identifier]
+                with score_part_path.open("r", encoding="utf-8", newline="") as score_part_file:
+                    # Only the first non-empty part keeps its header
+                    header: str = score_part_file.readline()
+                    if score_file.tell() == 0:
+                        score_file.write(header)
+                    shutil.copyfileobj(score_part_file, score_file)
+                score_part_path.unlink()
+            if score_file.tell() == 0:  # Without any articles or scrapers
+                score_file.write("scraper\tarticle\n")
+        os.replace(get_partial_path(score_path), score_path)
+        manifest.stages[f"score/{scorer_identifier}"] = {
+            "input_hash": score_input_hashes[scorer_identifier],
+            "output_hash": _hash_file(score_path),
+        }
+
+    # Run the analysis if the ROUGE-LSum scores changed
+    rouge_lsum_path: Path = scores_directory / "rouge_lsum.tsv"
+    if "rouge_lsum" in scorer_identifiers:
+        analysis_directory: Path = output_directory / "analysis"
+        analysis_input_hash: str = _hash_json({"scores": _hash_file(rouge_lsum_path), "num_resamples": num_resamples})
+        summary_path: Path = analysis_directory / "rouge_lsum_scraper_summary.tsv"
+        if not manifest.is_fresh("analysis", analysis_input_hash, summary_path):
+            from fundus_evaluation.entry_points.analysis import analysis
+
+            with telemetry.stage("analysis") if telemetry is not None else contextlib.nullcontext():
+                analysis(analysis_directory, rouge_lsum_path=rouge_lsum_path, num_resamples=num_resamples)
+            manifest.stages["analysis"] = {"input_hash": analysis_input_hash, "output_hash": _hash_file(summary_path)}
+
+    manifest.save()
+
+    skipped_stages: Set[str] = {
+        *(f"extraction/{scraper_identifier}" for scraper_identifier in scraper_identifiers),
+        *(f"score/{scorer_identifier}" for scorer_identifier in scorer_identifiers),
+    } - {
+        *(f"extraction/{scraper_identifier}" for scraper_identifier in stale_scrapers),
+        *(f"score/{scorer_identifier}" for scorer_identifier in stale_scorers),
+    }
+    if skipped_stages:
+        print(f"Skipped {len(skipped_stages)} unchanged stages: {', '.join(sorted(skipped_stages))}")
@@ -1,49 +1,500 @@
+import contextlib
+import itertools
+import json
+import time
+import warnings
 from pathlib import Path
-from typing import Dict, List, Optional, Set, Union
+from typing import IO, Any, Dict, Iterator, List, Mapping, Optional, Set, Tuple, Union
 
 import pandas as pd
 from tqdm import tqdm
 
-from fundus_evaluation import SCORERS
-from fundus_evaluation.scorers import Scorer
-from fundus_evaluation.utils import EvaluationArticle, load_evaluation_articles
+from fundus_evaluation import SCORER_PREFIX, SCORERS
+from fundus_evaluation.cache import (
+    ScoreCache,
+    ScoreRow,
+    hash_article,
+    hash_body,
+    lookup_scores,
+    merge_scores,
+    score_with_cache,
+)
+from fundus_evaluation.profiling import Profiler
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.scheduling import (
+    CostModel,
+    Scheduler,
+    Task,
+    summarize_worker_memory,
+)
+from fundus_evaluation.scorers import Scorer, get_fast_scorer
+from fundus_evaluation.service import ServiceClient, warm_up
+from fundus_evaluation.storage import find_articles_files, iter_evaluation_articles
+from fundus_evaluation.telemetry import Telemetry
+from fundus_evaluation.utils import EvaluationArticle, get_memory_footprint
+
+_worker_references: Optional[ReferenceIndex] = None
+
+# Fast scores are cached separately from the exact scores
+FAST_CACHE_PREFIX: str = "fast:"
+
+
+def _initialize_score_worker(
+    ground_truth_path: Path,
+    max_optional_paragraphs: Optional[int],
+    persist_references: bool,
+    scorer_identifiers: List[str],
+    worker_scorer: Optional[str] = None,
+) -> None:
+    global _worker_references
+    # Preloaded workers inherit the references of the parent process
+    if _worker_references is None:
+        _worker_references = ReferenceIndex.load_or_create(
+            ground_truth_path, max_optional_paragraphs, persist=persist_references
+        )
+    # Workers of a memory-budgeted scheduler only run a single scorer
+    warm_up(scrapers=(), scorers=scorer_identifiers if worker_scorer is None else [worker_scorer])
+
+
+def _get_scorer(scorer_identifier: str, fast: bool) -> Scorer:
+    fast_scorer: Optional[Scorer] = get_fast_scorer(scorer_identifier) if fast else None
+    return SCORERS[scorer_identifier] if fast_scorer is None else fast_scorer
+
+
+def _get_cache_identifier(scorer_identifier: str, fast: bool) -> str:
+    return (
+        f"{FAST_CACHE_PREFIX}{scorer_identifier}" if fast and get_fast_scorer(scorer_identifier) else scorer_identifier
+    )
+
+
+def _score_task(
+    scorer_identifier: str,
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int],
+    fast: bool = False,
+) -> Tuple[pd.DataFrame, float]:
+    assert _worker_references is not None
+    start: float = time.perf_counter()
+    scores: pd.DataFrame = _get_scorer(scorer_identifier, fast)(
+        _worker_references.subset(hypothesis_articles), hypothesis_articles, max_optional_paragraphs
+    )
+    return scores, time.perf_counter() - start
+
+
+def _iter_scores_in_workers(
+    ground_truth_path: Path,
+    extraction_paths: List[Path],
+    references: ReferenceIndex,
+    scorer_identifiers: List[str],
+    max_optional_paragraphs: Optional[int],
+    persist_references: bool,
+    batch_size: int,
+    num_workers: int,
+    cost_model: CostModel,
+    cache: Optional[ScoreCache] = None,
+    telemetry: Optional[Telemetry] = None,
+    memory_budget: Optional[int] = None,
+    preload_workers: bool = False,
+    fast: bool = False,
+) -> Iterator[Tuple[str, str, pd.DataFrame, int]]:
+    """Scores the batches of the extraction files in worker processes, dispatching the longest predicted task first.
+
+    The cache is only accessed by this process. Only the articles missing from the cache are sent to the workers.
+    With `preload_workers`, the references and scorers are loaded in this process and shared with the forked workers.
+    With `fast`, the workers use the approximate variants of the scorers (see `scorers.get_fast_scorer`).
+
+    Yields:
+        The scorer identifier, scraper identifier, scores and number of reused cached rows of each scorer and batch
+        in the order of the extraction files.
+    """
+    reference_hashes: Dict[str, str] = {}
+    if cache is not None:
+        reference_hashes = {
+            article_identifier: hash_body(reference.body) for article_identifier, reference in references.items()
+        }
+
+    # The keys and cached rows of the submitted tasks and the results that wait for their predecessors
+    contexts: Dict[int, Tuple[str, str, Dict[str, str], Dict[str, ScoreRow], int]] = {}
+    completed: Dict[int, Tuple[str, str, pd.DataFrame, int]] = {}
+
+    def generate_tasks() -> Iterator[Tuple[int, Task, Tuple[Any, ...]]]:
+        sequence: Iterator[int] = itertools.count()
+        for extraction_path in extraction_paths:
+            scraper_identifier: str = extraction_path.stem
+            for hypothesis_articles in iter_evaluation_articles(extraction_path, batch_size=batch_size):
+                hypothesis_hashes: Dict[str, str] = {}
+                if cache is not None:
+                    hypothesis_hashes = {
+                        article_identifier: hash_article(article)
+                        for article_identifier, article in hypothesis_articles.items()
+                    }
+
+                for scorer_identifier in scorer_identifiers:
+                    index: int = next(sequence)
+                    keys: Dict[str, str] = {}
+                    rows: Dict[str, ScoreRow] = {}
+                    missing_articles: List[str] = list(hypothesis_articles)
+                    if cache is not None:
+                        keys, rows, missing_articles = lookup_scores(
+                            _get_scorer(scorer_identifier, fast),
+                            _get_cache_identifier(scorer_identifier, fast),
+                            hypothesis_articles,
+                            reference_hashes,
+                            hypothesis_hashes,
+                            max_optional_paragraphs,
+                            cache,
+                        )
+                        if not missing_articles:
+                            completed[index] = (
+                                scorer_identifier,
+                                scraper_identifier,
+                                merge_scores(keys, rows, None, cache),
+                                len(keys),
+                            )
+                            continue
+
+                    contexts[index] = (
+                        scorer_identifier,
+                        scraper_identifier,
+                        keys,
+                        rows,
+                        len(hypothesis_articles) - len(missing_articles),
+                    )
+                    size: int = sum(
+                        len(paragraph)
+                        for article_identifier in missing_articles
+                        for paragraph in (
+                            *hypothesis_articles[article_identifier]["body"],
+                            *references[article_identifier].body,
+                        )
+                    )
+                    missing_hypothesis_articles: Dict[str, EvaluationArticle] = {
+                        article_identifier: hypothesis_articles[article_identifier]
+                        for article_identifier in missing_articles
+                    }
+                    yield index, Task("score", scorer_identifier, size), (
+                        scorer_identifier,
+                        missing_hypothesis_articles,
+                        max_optional_paragraphs,
+                        fast,
+                    )
+
+    def preload() -> None:
+        global _worker_references
+        _worker_references = references
+        warm_up(scrapers=(), scorers=scorer_identifiers, fork_safe_only=True)
+
+    declared_footprints: Dict[str, Optional[int]] = {
+        scorer_identifier: get_memory_footprint(SCORERS[scorer_identifier]) for scorer_identifier in scorer_identifiers
+    }
+    scheduler: Scheduler = Scheduler(
+        cost_model,
+        num_workers,
+        initializer=_initialize_score_worker,
+        initargs=(ground_truth_path, max_optional_paragraphs, persist_references, scorer_identifiers),
+        # The window bounds the number of article batches held in memory
+        window_size=4 * num_workers,
+        memory_budget=memory_budget,
+        preload=preload if preload_workers else None,
+        footprints={
+            scorer_identifier: footprint
+            for scorer_identifier, footprint in declared_footprints.items()
+            if footprint is not None
+        },
+    )
+    next_index: int = 0
+    computed: pd.DataFrame
+    try:
+        for index, computed, seconds in scheduler.map(_score_task, generate_tasks()):
+            scorer_identifier, scraper_identifier, keys, rows, num_reused = contexts.pop(index)
+            if telemetry is not None:
+                telemetry.observe("score_duration_seconds", seconds, scorer=scorer_identifier)
+            scores: pd.DataFrame = computed if cache is None else merge_scores(keys, rows, computed, cache)
+            completed[index] = (scorer_identifier, scraper_identifier, scores, num_reused)
+
+            while next_index in completed:
+                yield completed.pop(next_index)
+                next_index += 1
+    finally:
+        global _worker_references
+        _worker_references = None
+
+    if scheduler.worker_memory:
+        tqdm.write(summarize_worker_memory(scheduler.worker_memory))
+
+    while next_index in completed:
+        yield completed.pop(next_index)
+        next_index += 1
 
 
 def score(
     ground_truth_path: Union[str, Path],
     extractions_directory: Union[str, Path],
     output_directory: Union[str, Path],
-    scorers: Union[Dict[str, Scorer], Set[str], None] = None,
+    scorers: Union[Mapping[str, Scorer], Set[str], None] = None,
     max_optional_paragraphs: Optional[int] = 4,
+    cache_path: Union[str, Path, None] = None,
+    persist_references: bool = False,
+    server: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+    telemetry: Optional[Telemetry] = None,
+    batch_size: int = 1024,
+    num_workers: int = 1,
+    timings_path: Union[str, Path, None] = None,
+    memory_budget: Optional[int] = None,
+    preload_workers: bool = False,
+    fast: bool = False,
+    calibration_size: int = 50,
 ) -> None:
-    if scorers is None:
-        scorers = SCORERS
-    elif isinstance(scorers, Set):
+    if fast and (server is not None or isinstance(scorers, Mapping)):
+        warnings.warn("Fast scoring is only available for the registered scorers calculated in this process.")
+        fast = False
+
+    if num_workers > 1 and (server is not None or profiler is not None or isinstance(scorers, Mapping)):
+        warnings.warn(
+            "Scoring with a server, a profiler or custom scorers calculates the scores in this process "
+            "instead of worker processes."
+        )
+        num_workers = 1
+
+    if scorers is None or isinstance(scorers, Set):
+        # Only the selected scorers are imported from the registry
+        scorer_identifiers: List[str] = [
+            scorer_identifier for scorer_identifier in SCORERS if scorers is None or scorer_identifier in scorers
+        ]
+    else:
+        scorer_identifiers = list(scorers)
+
+    if server is not None:
+        client: ServiceClient = ServiceClient(server)
+        scorers = {
+            scorer_identifier: client.scorer(scorer_identifier, ground_truth_path)
+            for scorer_identifier in scorer_identifiers
+        }
+    elif not isinstance(scorers, Mapping):
+        scorers = {scorer_identifier: _get_scorer(scorer_identifier, fast) for scorer_identifier in scorer_identifiers}
+
+    if profiler is not None:
+        scorers = {
+            scorer_identifier: profiler.wrap(f"{SCORER_PREFIX}{scorer_identifier}", scorer)
+            for scorer_identifier, scorer in scorers.items()
+        }
+
+    if telemetry is not None:
         scorers = {
-            scorer_identifier: scorer for scorer_identifier, scorer in SCORERS.items() if scorer_identifier in scorers
+            scorer_identifier: telemetry.instrument_scorer(scorer_identifier, scorer)
+            for scorer_identifier, scorer in scorers.items()
         }
 
     output_directory = Path(output_directory)
     output_directory.mkdir(parents=True, exist_ok=True)
 
-    reference_articles: Dict[str, EvaluationArticle] = load_evaluation_articles(ground_truth_path)
-    scraper_to_hypothesis_articles: Dict[str, Dict[str, EvaluationArticle]] = {
-        extraction_path.stem: load_evaluation_articles(extraction_path)
-        for extraction_path in Path(extractions_directory).glob("*.json")
+    # The prepared reference articles are shared by all scorers and scrapers
+    references: ReferenceIndex = ReferenceIndex.load_or_create(
+        ground_truth_path, max_optional_paragraphs, persist=persist_references
+    )
+    extraction_paths: List[Path] = list(find_articles_files(extractions_directory).values())
+
+    cache: Optional[ScoreCache] = None if cache_path is None else ScoreCache(cache_path)
+    if cache is not None:
+        reference_hashes: Dict[str, str] = {
+            article_identifier: hash_body(reference.body) for article_identifier, reference in references.items()
+        }
+    num_rows: Dict[str, int] = {scorer_identifier: 0 for scorer_identifier in scorers}
+    num_reused_rows: Dict[str, int] = {scorer_identifier: 0 for scorer_identifier in scorers}
+
+    # The extraction files are streamed one batch of articles at a time and the scores are appended to the
+    # score files after each batch, such that the memory usage does not depend on the number of scrapers or articles.
+    # The rows are grouped by scraper and follow the order of the extraction files.
+    score_files: Dict[str, IO[str]] = {
+        scorer_identifier: (output_directory / f"{scorer_identifier}.tsv").open("w", encoding="utf-8", newline="")
+        for scorer_identifier in scorers
     }
 
-    with tqdm(total=len(scorers) * len(scraper_to_hypothesis_articles), unit="Score") as progress_bar:
-        for scorer_identifier, scorer in scorers.items():
-            results: List[pd.DataFrame] = []
-            for scraper_identifier, hypothesis_articles in scraper_to_hypothesis_articles.items():
-                progress_bar.set_description(f"Evaluating {scraper_identifier!r} with {scorer_identifier!r}")
-
-                results.append(
-                    scorer(reference_articles, hypothesis_articles, max_optional_paragraphs)
-                    .assign(scraper=scraper_identifier)
-                    .set_index("scraper", append=True)
-                )
-                progress_bar.update()
-
-            combined_results: pd.DataFrame = pd.concat(results).reorder_levels(["scraper", "article"]).sort_index()
-            combined_results.to_csv(output_directory / f"{scorer_identifier}.tsv", sep="\t")
+    def write_scores(scorer_identifier: str, scraper_identifier: str, scores: pd.DataFrame, num_reused: int) -> None:
+        num_rows[scorer_identifier] += len(scores)
+        num_reused_rows[scorer_identifier] += num_reused
+        if telemetry is not None:
+            telemetry.increment("scored_articles_total", len(scores), scorer=scorer_identifier)
+            if cache is not None:
+                telemetry.increment("cache_lookups_total", len(scores), scorer=scorer_identifier)
+                telemetry.increment("cache_hits_total", num_reused, scorer=scorer_identifier)
+
+        score_file: IO[str] = score_files[scorer_identifier]
+        scores.assign(scraper=scraper_identifier).set_index("scraper", append=True).reorder_levels(
+            ["scraper", "article"]
+        ).to_csv(score_file, sep="\t", header=score_file.tell() == 0)
+
+    try:
+        if num_workers > 1:
+            timings_path = CostModel.get_path(ground_truth_path) if timings_path is None else Path(timings_path)
+            cost_model: CostModel = CostModel.load(timings_path)
+            try:
+                with tqdm(
+                    total=len(extraction_paths) * len(references) * len(scorers),
+                    unit="Score",
+                    desc=f"Evaluating with {num_workers} workers",
+                ) as progress_bar, (
+                    telemetry.stage("score") if telemetry is not None else contextlib.nullcontext()
+                ):
+                    for scorer_identifier, scraper_identifier, scores, num_reused in _iter_scores_in_workers(
+                        Path(ground_truth_path),
+                        extraction_paths,
+                        references,
+                        list(scorers),
+                        max_optional_paragraphs,
+                        persist_references,
+                        batch_size,
+                        num_workers,
+                        cost_model,
+                        cache,
+                        telemetry,
+                        memory_budget,
+                        preload_workers,
+                        fast,
+                    ):
+                        write_scores(scorer_identifier, scraper_identifier, scores, num_reused)
+                        progress_bar.update(len(scores))
+            finally:
+                cost_model.save(timings_path)
+        else:
+            with tqdm(total=len(extraction_paths) * len(references), unit="Article") as progress_bar:
+                for extraction_path in extraction_paths:
+                    scraper_identifier = extraction_path.stem
+                    for hypothesis_articles in iter_evaluation_articles(extraction_path, batch_size=batch_size):
+                        batch_references: ReferenceIndex = references.subset(hypothesis_articles)
+                        if cache is not None:
+                            hypothesis_hashes: Dict[str, str] = {
+                                article_identifier: hash_article(article)
+                                for article_identifier, article in hypothesis_articles.items()
+                            }
+
+                        for scorer_identifier, scorer in scorers.items():
+                            progress_bar.set_description(
+                                f"Evaluating {scraper_identifier!r} with {scorer_identifier!r}"
+                            )
+
+                            num_reused = 0
+                            with (
+                                telemetry.stage("score", scorer=scorer_identifier, scraper=scraper_identifier)
+                                if telemetry is not None
+                                else contextlib.nullcontext()
+                            ):
+                                if cache is None:
+                                    scores = scorer(batch_references, hypothesis_articles, max_optional_paragraphs)
+                                else:
+                                    scores, num_reused = score_with_cache(
+                                        scorer,
+                                        _get_cache_identifier(scorer_identifier, fast),
+                                        batch_references,
+                                        hypothesis_articles,
+                                        reference_hashes,
+                                        hypothesis_hashes,
+                                        max_optional_paragraphs,
+                                        cache,
+                                    )
+                            write_scores(scorer_identifier, scraper_identifier, scores, num_reused)
+
+                        progress_bar.update(len(hypothesis_articles))
+    finally:
+        for score_file in score_files.values():
+            score_file.close()
+
+    if cache is not None:
+        for scorer_identifier in scorers:
+            print(
+                f"Reused {num_reused_rows[scorer_identifier]} of {num_rows[scorer_identifier]} "
+                f"cached rows for {scorer_identifier!r}"
+            )
+        cache.close()
+
+    if fast and calibration_size > 0:
+        _calibrate_fast_scorers(
+            references,
+            extraction_paths,
+            [scorer_identifier for scorer_identifier in scorer_identifiers if get_fast_scorer(scorer_identifier)],
+            max_optional_paragraphs,
+            calibration_size,
+            output_directory,
+        )
+
+    if persist_references:
+        references.save(ground_truth_path)
+
+
+def _calibrate_fast_scorers(
+    references: ReferenceIndex,
+    extraction_paths: List[Path],
+    scorer_identifiers: List[str],
+    max_optional_paragraphs: Optional[int],
+    calibration_size: int,
+    output_directory: Path,
+) -> None:
+    """Compares the fast scorers to their exact scorers on an evenly spaced subset of the reference articles.
+
+    The run times and the maximum and mean absolute deviations of each score column are printed
+    and saved to `fast_calibration.json` in the output directory.
+    """
+    if not scorer_identifiers:
+        return
+
+    article_identifiers: List[str] = list(references)
+    step: float = max(len(article_identifiers) / calibration_size, 1.0)
+    sample: Set[str] = {
+        article_identifiers[int(position * step)] for position in range(min(calibration_size, len(article_identifiers)))
+    }
+
+    hypotheses: Dict[str, Dict[str, EvaluationArticle]] = {}
+    for extraction_path in extraction_paths:
+        hypotheses[extraction_path.stem] = {
+            article_identifier: article
+            for hypothesis_articles in iter_evaluation_articles(extraction_path)
+            for article_identifier, article in hypothesis_articles.items()
+            if article_identifier in sample
+        }
+
+    calibration: Dict[str, Dict[str, Any]] = {}
+    for scorer_identifier in tqdm(scorer_identifiers, desc="Calibrating the fast scorers", unit="Scorer"):
+        fast_scorer: Optional[Scorer] = get_fast_scorer(scorer_identifier)
+        assert fast_scorer is not None
+        exact_seconds: float = 0.0
+        fast_seconds: float = 0.0
+        deviations: List[pd.DataFrame] = []
+        for hypothesis_articles in hypotheses.values():
+            batch_references: ReferenceIndex = references.subset(hypothesis_articles)
+
+            start: float = time.perf_counter()
+            exact_scores: pd.DataFrame = SCORERS[scorer_identifier](
+                batch_references, hypothesis_articles, max_optional_paragraphs
+            )
+            exact_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            fast_scores: pd.DataFrame = fast_scorer(batch_references, hypothesis_articles, max_optional_paragraphs)
+            fast_seconds += time.perf_counter() - start
+
+            deviations.append((fast_scores - exact_scores).abs())
+
+        deviation: pd.DataFrame = pd.concat(deviations)
+        calibration[scorer_identifier] = {
+            "num_scores": len(deviation),
+            "exact_seconds": exact_seconds,
+            "fast_seconds": fast_seconds,
+            "speedup": exact_seconds / fast_seconds if fast_seconds else None,
+            "max_deviation": {column: float(value) for column, value in deviation.max().items()},
+            "mean_deviation": {column: float(value) for column, value in deviation.mean().items()},
+        }
+
+    for scorer_identifier, result in calibration.items():
+        print(
+            f"Fast {scorer_identifier!r}: {result['speedup'] or float('NaN'):.1f}x speedup on "
+            f"{result['num_scores']} scores, "
+            + ", ".join(
+                f"{column} deviation max {result['max_deviation'][column]:.4f} "
+                f"mean {result['mean_deviation'][column]:.4f}"
+                for column in result["max_deviation"]
+            )
+        )
+
+    with open(output_directory / "fast_calibration.json", "w", encoding="utf-8") as calibration_file:
+        json.dump(calibration, calibration_file, indent=4)
@@ -1,55 +1,232 @@
+import contextlib
+import functools
 import json
+import time
+import warnings
 from datetime import datetime
 from pathlib import Path
-from typing import AbstractSet, Dict, Iterator, Set, Tuple, Union
+from typing import (
+    AbstractSet,
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 
 from tqdm import tqdm
 
-from fundus_evaluation import SCRAPERS
+from fundus_evaluation import SCRAPER_PREFIX, SCRAPERS
+from fundus_evaluation.profiling import Profiler
+from fundus_evaluation.scheduling import (
+    CostModel,
+    Scheduler,
+    Task,
+    summarize_worker_memory,
+)
 from fundus_evaluation.scrapers import Scraper
+from fundus_evaluation.service import ServiceClient, warm_up
+from fundus_evaluation.telemetry import Telemetry
 from fundus_evaluation.utils import (
     EvaluationArticle,
+    get_html_input,
+    get_memory_footprint,
     load_evaluation_articles,
-    load_zipped_html,
+    load_zipped_html_bytes,
 )
 
 
 def _scrape_articles(
-    scraper: Scraper, evaluation_articles: Dict[str, EvaluationArticle], html_directory: Path
+    scraper: Scraper,
+    evaluation_articles: Dict[str, EvaluationArticle],
+    html_directory: Path,
+    telemetry: Optional[Telemetry] = None,
 ) -> Iterator[Tuple[str, EvaluationArticle]]:
     for article_identifier, evaluation_article in evaluation_articles.items():
         url: str = evaluation_article["url"]
-        html: str = load_zipped_html(html_directory / article_identifier)
+        content: bytes = load_zipped_html_bytes(html_directory / article_identifier)
+        if telemetry is not None:
+            telemetry.increment("decompressed_bytes_total", len(content))
         crawl_date: datetime = datetime.fromisoformat(evaluation_article["crawl_date"])
         publisher_identifier: str = article_identifier.split("_")[0]
 
         scraped_article: EvaluationArticle = {
             "url": url,
-            "body": scraper(url=url, html=html, publisher_identifier=publisher_identifier, crawl_date=crawl_date),
+            "body": scraper(
+                url=url,
+                html=get_html_input(scraper, content),
+                publisher_identifier=publisher_identifier,
+                crawl_date=crawl_date,
+            ),
             "crawl_date": evaluation_article["crawl_date"],
         }
 
         yield article_identifier, scraped_article
 
 
+def _initialize_scrape_worker(scraper_identifiers: List[str], worker_scraper: Optional[str] = None) -> None:
+    # Workers of a memory-budgeted scheduler only run a single scraper
+    warm_up(scraper_identifiers if worker_scraper is None else [worker_scraper], scorers=())
+
+
+def _scrape_task(
+    scraper_identifier: str, html_path: Path, url: str, publisher_identifier: str, crawl_date: datetime
+) -> Tuple[Tuple[List[str], int], float]:
+    scraper: Scraper = SCRAPERS[scraper_identifier]
+    content: bytes = load_zipped_html_bytes(html_path)
+    start: float = time.perf_counter()
+    body: List[str] = scraper(
+        url=url,
+        html=get_html_input(scraper, content),
+        publisher_identifier=publisher_identifier,
+        crawl_date=crawl_date,
+    )
+    return (body, len(content)), time.perf_counter() - start
+
+
+def _scrape_in_workers(
+    scraper_identifiers: List[str],
+    evaluation_articles: Dict[str, EvaluationArticle],
+    html_directory: Path,
+    output_directory: Path,
+    num_workers: int,
+    cost_model: CostModel,
+    telemetry: Optional[Telemetry] = None,
+    memory_budget: Optional[int] = None,
+    preload_workers: bool = False,
+) -> None:
+    """Scrapes all articles with all scrapers in worker processes, dispatching the longest predicted task first.
+
+    The scrapers' extractions are saved as soon as all of their articles have been scraped.
+    With `preload_workers`, the scrapers are loaded in this process and shared with the forked workers.
+    """
+    tasks: List[Tuple[Tuple[str, str], Task, Tuple[Any, ...]]] = [
+        (
+            (scraper_identifier, article_identifier),
+            Task(
+                "scrape", scraper_identifier, (html_directory / article_identifier).stat().st_size, article_identifier
+            ),
+            (
+                scraper_identifier,
+                html_directory / article_identifier,
+                evaluation_article["url"],
+                article_identifier.split("_")[0],
+                datetime.fromisoformat(evaluation_article["crawl_date"]),
+            ),
+        )
+        for scraper_identifier in scraper_identifiers
+        for article_identifier, evaluation_article in evaluation_articles.items()
+    ]
+
+    scraper_to_scraped_articles: Dict[str, Dict[str, EvaluationArticle]] = {
+        scraper_identifier: {} for scraper_identifier in scraper_identifiers
+    }
+    declared_footprints: Dict[str, Optional[int]] = {
+        scraper_identifier: get_memory_footprint(SCRAPERS[scraper_identifier])
+        for scraper_identifier in scraper_identifiers
+    }
+    scheduler: Scheduler = Scheduler(
+        cost_model,
+        num_workers,
+        initializer=_initialize_scrape_worker,
+        initargs=(scraper_identifiers,),
+        memory_budget=memory_budget,
+        preload=functools.partial(warm_up, scraper_identifiers, (), fork_safe_only=True) if preload_workers else None,
+        footprints={
+            scraper_identifier: footprint
+            for scraper_identifier, footprint in declared_footprints.items()
+            if footprint is not None
+        },
+    )
+    with tqdm(total=len(tasks), unit="Article", desc=f"Scraping with {num_workers} workers") as progress_bar:
+        result: Tuple[List[str], int]
+        for (scraper_identifier, article_identifier), result, seconds in scheduler.map(_scrape_task, tasks):
+            body, num_bytes = result
+            evaluation_article: EvaluationArticle = evaluation_articles[article_identifier]
+            scraped_articles: Dict[str, EvaluationArticle] = scraper_to_scraped_articles[scraper_identifier]
+            scraped_articles[article_identifier] = {
+                "url": evaluation_article["url"],
+                "body": body,
+                "crawl_date": evaluation_article["crawl_date"],
+            }
+
+            if telemetry is not None:
+                labels: Dict[str, str] = {"scraper": scraper_identifier, "publisher": article_identifier.split("_")[0]}
+                telemetry.observe("scrape_duration_seconds", seconds, **labels)
+                telemetry.increment("articles_total", **labels)
+                telemetry.increment("decompressed_bytes_total", num_bytes)
+
+            if len(scraped_articles) == len(evaluation_articles):
+                with (output_directory / f"{scraper_identifier}.json").open("w", encoding="utf-8") as output_file:
+                    json.dump(
+                        {
+                            article_identifier: scraped_articles[article_identifier]
+                            for article_identifier in evaluation_articles
+                        },
+                        output_file,
+                        indent=4,
+                        ensure_ascii=False,
+                    )
+                del scraper_to_scraped_articles[scraper_identifier]
+            progress_bar.update()
+
+    if scheduler.worker_memory:
+        print(summarize_worker_memory(scheduler.worker_memory))
+
+
 def scrape(
     ground_truth_path: Union[str, Path],
     html_directory: Union[str, Path],
     output_directory: Union[str, Path],
-    scrapers: Union[Dict[str, Scraper], Set[str], None] = None,
+    scrapers: Union[Mapping[str, Scraper], Set[str], None] = None,
     exclude_scrapers: AbstractSet[str] = frozenset(),
+    server: Optional[str] = None,
+    profiler: Optional[Profiler] = None,
+    telemetry: Optional[Telemetry] = None,
+    num_workers: int = 1,
+    timings_path: Union[str, Path, None] = None,
+    memory_budget: Optional[int] = None,
+    preload_workers: bool = False,
 ) -> None:
-    if scrapers is None:
+    if num_workers > 1 and (server is not None or profiler is not None or isinstance(scrapers, Mapping)):
+        warnings.warn(
+            "Scraping with a server, a profiler or custom scrapers extracts the articles in this process "
+            "instead of worker processes."
+        )
+        num_workers = 1
+
+    if scrapers is None or isinstance(scrapers, Set):
+        # Only the selected scrapers are imported from the registry
+        scraper_identifiers: List[str] = [
+            scraper_identifier
+            for scraper_identifier in SCRAPERS
+            if (scrapers is None or scraper_identifier in scrapers) and scraper_identifier not in exclude_scrapers
+        ]
+    else:
+        scraper_identifiers = list(scrapers)
+
+    if server is not None:
+        client: ServiceClient = ServiceClient(server)
         scrapers = {
-            scraper_identifier: scraper
-            for scraper_identifier, scraper in SCRAPERS.items()
-            if scraper_identifier not in exclude_scrapers
+            scraper_identifier: client.scraper(scraper_identifier) for scraper_identifier in scraper_identifiers
         }
-    elif isinstance(scrapers, Set):
+    elif not isinstance(scrapers, Mapping):
+        scrapers = {scraper_identifier: SCRAPERS[scraper_identifier] for scraper_identifier in scraper_identifiers}
+
+    if profiler is not None:
         scrapers = {
-            scraper_identifier: scraper
-            for scraper_identifier, scraper in SCRAPERS.items()
-            if scraper_identifier in scrapers and scraper_identifier not in exclude_scrapers
+            scraper_identifier: profiler.wrap(f"{SCRAPER_PREFIX}{scraper_identifier}", scraper)
+            for scraper_identifier, scraper in scrapers.items()
+        }
+
+    if telemetry is not None:
+        scrapers = {
+            scraper_identifier: telemetry.instrument_scraper(scraper_identifier, scraper)
+            for scraper_identifier, scraper in scrapers.items()
         }
 
     html_directory = Path(html_directory)
@@ -58,14 +235,37 @@ def scrape(
 
     evaluation_articles: Dict[str, EvaluationArticle] = load_evaluation_articles(ground_truth_path)
 
+    if num_workers > 1:
+        timings_path = CostModel.get_path(ground_truth_path) if timings_path is None else Path(timings_path)
+        cost_model: CostModel = CostModel.load(timings_path)
+        try:
+            with telemetry.stage("scrape") if telemetry is not None else contextlib.nullcontext():
+                _scrape_in_workers(
+                    list(scrapers),
+                    evaluation_articles,
+                    html_directory,
+                    output_directory,
+                    num_workers,
+                    cost_model,
+                    telemetry,
+                    memory_budget,
+                    preload_workers,
+                )
+        finally:
+            cost_model.save(timings_path)
+        return
+
     with tqdm(total=len(scrapers) * len(evaluation_articles), unit="Article") as progress_bar:
         for scraper_name, scraper in scrapers.items():
             progress_bar.set_description(f"Scraping with {scraper_name!r}")
 
             scraped_articles: Dict[str, EvaluationArticle] = {}
-            for article_identifier, scraped_article in _scrape_articles(scraper, evaluation_articles, html_directory):
-                scraped_articles[article_identifier] = scraped_article
-                progress_bar.update()
+            with telemetry.stage("scrape", scraper=scraper_name) if telemetry is not None else contextlib.nullcontext():
+                for article_identifier, scraped_article in _scrape_articles(
+                    scraper, evaluation_articles, html_directory, telemetry
+                ):
+                    scraped_articles[article_identifier] = scraped_article
+                    progress_bar.update()
 
             with (output_directory / f"{scraper_name}.json").open("w", encoding="utf-8") as output_file:
                 json.dump(scraped_articles, output_file, indent=4, ensure_ascii=False)
@@ -0,0 +1,164 @@
+import collections
+import gzip
+import json
+import random
+from pathlib import Path
+from typing import IO, Counter, Dict, List, Optional, Tuple, Union
+
+from tqdm import tqdm
+
+from fundus_evaluation.storage import find_articles_files
+from fundus_evaluation.synthesis import (
+    PageTemplate,
+    SynthesisConfig,
+    Synthesizer,
+    SyntheticArticle,
+)
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    load_evaluation_articles,
+    load_zipped_html,
+)
+
+
+class _JSONObjectWriter:
+    """Writes a JSON object entry by entry in the format of `json.dump(..., indent=4)`."""
+
+    def __init__(self, path: Path) -> None:
+        self._file: IO[str] = path.open("w", encoding="utf-8")
+        self._file.write("{")
+        self._empty: bool = True
+
+    def write(self, key: str, value: EvaluationArticle) -> None:
+        serialized_value: str = json.dumps(value, indent=4, ensure_ascii=False).replace("\n", "\n    ")
+        self._file.write(f"{'' if self._empty else ','}\n    {json.dumps(key, ensure_ascii=False)}: {serialized_value}")
+        self._empty = False
+
+    def close(self) -> None:
+        self._file.write("}" if self._empty else "\n}")
+        self._file.close()
+
+
+def load_templates(
+    ground_truth_path: Union[str, Path],
+    html_directory: Union[str, Path],
+    extractions_directory: Union[str, Path, None] = None,
+    seed: int = 0,
+) -> Tuple[List[PageTemplate], List[str]]:
+    """Creates the page templates of a dataset.
+
+    Returns:
+        The templates and the identifiers of the articles whose ground truth could not be located in the DOM.
+    """
+    articles: Dict[str, EvaluationArticle] = load_evaluation_articles(ground_truth_path)
+    scraper_to_extractions: Dict[str, Dict[str, EvaluationArticle]] = {}
+    if extractions_directory is not None:
+        scraper_to_extractions = {
+            scraper_identifier: load_evaluation_articles(extraction_path)
+            for scraper_identifier, extraction_path in find_articles_files(extractions_directory).items()
+        }
+
+    templates: List[PageTemplate] = []
+    skipped: List[str] = []
+    for article_identifier, article in tqdm(articles.items(), desc="Creating page templates", unit="Page"):
+        template: Optional[PageTemplate] = PageTemplate.from_article(
+            article_identifier,
+            article,
+            load_zipped_html(Path(html_directory) / article_identifier),
+            extractions={
+                scraper_identifier: extractions[article_identifier]
+                for scraper_identifier, extractions in scraper_to_extractions.items()
+                if article_identifier in extractions
+            },
+            rng=random.Random(f"{seed}:{article_identifier}"),
+        )
+        if template is None:
+            skipped.append(article_identifier)
+        else:
+            templates.append(template)
+    return templates, skipped
+
+
+def synth(
+    ground_truth_path: Union[str, Path],
+    html_directory: Union[str, Path],
+    output_directory: Union[str, Path],
+    num_articles: int,
+    extractions_directory: Union[str, Path, None] = None,
+    config: SynthesisConfig = SynthesisConfig(),
+    seed: int = 0,
+    compression_level: int = 6,
+    allow_missing_publishers: bool = False,
+) -> None:
+    """Generates a synthetic corpus in the dataset's layout, i.e. `ground_truth.json`, `html/` and `extractions/`.
+
+    The synthetic pages are derived from the dataset's pages whose ground truth paragraphs can all be located in
+    the DOM. The synthetic extractions mimic each scraper's extraction of the source pages, such that the
+    `score` and `analysis` entry points can be run on the corpus without running the scrapers.
+
+    Args:
+        ground_truth_path: The path to the dataset's ground truth file.
+        html_directory: The dataset's HTML directory.
+        output_directory: The directory of the synthetic corpus.
+        num_articles: The number of synthetic articles.
+        extractions_directory: The dataset's extractions directory. If set, synthetic extractions are generated.
+        config: The perturbations of the synthetic articles.
+        seed: The random seed. The corpus is deterministic given the seed, configuration and dataset.
+        compression_level: The gzip compression level of the HTML files.
+        allow_missing_publishers: If set, publishers whose pages are all skipped are left out of the corpus.
+            Otherwise, a `ValueError` is raised.
+    """
+    templates, skipped = load_templates(ground_truth_path, html_directory, extractions_directory, seed=seed)
+    if skipped:
+        publisher_to_skipped: Dict[str, List[str]] = collections.defaultdict(list)
+        for article_identifier in skipped:
+            publisher_to_skipped[article_identifier.split("_")[0]].append(article_identifier)
+        publisher_to_num_templates: Counter[str] = collections.Counter(template.publisher for template in templates)
+        print(f"Skipped {len(skipped)} pages whose ground truth could not be located in the DOM:")
+        for publisher, article_identifiers in sorted(publisher_to_skipped.items()):
+            print(
+                f"  {publisher}: {len(article_identifiers)} of "
+                f"{len(article_identifiers) + publisher_to_num_templates[publisher]} pages "
+                f"({', '.join(article_identifiers)})"
+            )
+
+        missing_publishers: List[str] = sorted(set(publisher_to_skipped) - set(publisher_to_num_templates))
+        if missing_publishers:
+            message: str = f"No page templates for publishers {', '.join(missing_publishers)}"
+            if not allow_missing_publishers:
+                raise ValueError(f"{message}. Pass --allow-missing-publishers to leave them out of the corpus.")
+            print(f"{message}. They are left out of the corpus.")
+    synthesizer: Synthesizer = Synthesizer(templates, config=config, seed=seed)
+
+    output_directory = Path(output_directory)
+    synthetic_html_directory: Path = output_directory / "html"
+    synthetic_html_directory.mkdir(parents=True, exist_ok=True)
+    synthetic_extractions_directory: Path = output_directory / "extractions"
+    # Only scrapers with extractions of all source pages are included
+    scraper_identifiers: List[str] = sorted(
+        set.intersection(*(set(template.extractions) for template in templates)) if templates else set()
+    )
+    if scraper_identifiers:
+        synthetic_extractions_directory.mkdir(exist_ok=True)
+
+    # The JSON files are written incrementally, such that the corpus does not have to fit into memory
+    ground_truth_writer: _JSONObjectWriter = _JSONObjectWriter(output_directory / "ground_truth.json")
+    extraction_writers: Dict[str, _JSONObjectWriter] = {
+        scraper_identifier: _JSONObjectWriter(synthetic_extractions_directory / f"{scraper_identifier}.json")
+        for scraper_identifier in scraper_identifiers
+    }
+    try:
+        for index in tqdm(range(num_articles), desc="Generating synthetic articles", unit="Article"):
+            synthetic_article: SyntheticArticle = synthesizer.generate(index)
+            (synthetic_html_directory / synthetic_article.article_identifier).write_bytes(
+                gzip.compress(synthetic_article.html.encode("utf-8"), compresslevel=compression_level, mtime=0)
+            )
+            ground_truth_writer.write(synthetic_article.article_identifier, synthetic_article.article)
+            for scraper_identifier, extraction_writer in extraction_writers.items():
+                extraction_writer.write(
+                    synthetic_article.article_identifier, synthetic_article.extractions[scraper_identifier]
+                )
+    finally:
+        ground_truth_writer.close()
+        for extraction_writer in extraction_writers.values():
+            extraction_writer.close()
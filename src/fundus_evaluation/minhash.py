@@ -0,0 +1,121 @@
+import functools
+import itertools
+import zlib
+from typing import AbstractSet, Dict, Final, FrozenSet, List, Sequence, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+
+from fundus_evaluation.utils import tokenize_words
+
+SHINGLE_SIZE: Final[int] = 2
+NUM_PERMUTATIONS: Final[int] = 128
+SEED: Final[int] = 42
+
+# The universal hash functions (a * x + b) mod p do not overflow 64-bit integers for p < 2^31
+_PRIME: Final[int] = (1 << 31) - 1
+
+
+def shingle(text: str, size: int = SHINGLE_SIZE) -> FrozenSet[int]:
+    """Returns the hashed word n-grams of the text (see `utils.tokenize_words`).
+
+    Texts with fewer words than the n-gram size are represented by a single shingle of all their words.
+    Texts without words have no shingles.
+    """
+    tokens: List[str] = tokenize_words(text)
+    if len(tokens) < size:
+        return frozenset((zlib.crc32(" ".join(tokens).encode("utf-8")),)) if tokens else frozenset()
+    return frozenset(
+        zlib.crc32(" ".join(tokens[start : start + size]).encode("utf-8")) for start in range(len(tokens) - size + 1)
+    )
+
+
+def jaccard_similarity(first: AbstractSet[int], second: AbstractSet[int]) -> float:
+    union: int = len(first | second)
+    return len(first & second) / union if union else 0.0
+
+
+@functools.lru_cache(maxsize=None)
+def _get_hash_parameters(num_permutations: int, seed: int) -> Tuple[npt.NDArray[np.uint64], npt.NDArray[np.uint64]]:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    a: npt.NDArray[np.uint64] = rng.integers(1, _PRIME, size=(num_permutations, 1), dtype=np.uint64)
+    b: npt.NDArray[np.uint64] = rng.integers(0, _PRIME, size=(num_permutations, 1), dtype=np.uint64)
+    return a, b
+
+
+def compute_signatures(
+    shingle_sets: Sequence[AbstractSet[int]], num_permutations: int = NUM_PERMUTATIONS, seed: int = SEED
+) -> npt.NDArray[np.uint64]:
+    """Computes the MinHash signatures of the shingle sets.
+
+    The probability that two signatures agree in a position equals the Jaccard similarity of their shingle sets.
+    Empty shingle sets have the maximum signature.
+
+    Returns:
+        The signatures of shape (num_shingle_sets, num_permutations).
+    """
+    a, b = _get_hash_parameters(num_permutations, seed)
+    signatures: npt.NDArray[np.uint64] = np.full((len(shingle_sets), num_permutations), _PRIME, dtype=np.uint64)
+
+    lengths: npt.NDArray[np.int64] = np.fromiter(map(len, shingle_sets), dtype=np.int64, count=len(shingle_sets))
+    non_empty: npt.NDArray[np.int64] = np.flatnonzero(lengths)
+    if len(non_empty) == 0:
+        return signatures
+
+    shingles: npt.NDArray[np.uint64] = np.fromiter(
+        itertools.chain.from_iterable(shingle_sets), dtype=np.uint64, count=int(lengths.sum())
+    )
+    hashes: npt.NDArray[np.uint64] = (a * (shingles % np.uint64(_PRIME)) + b) % np.uint64(_PRIME)
+
+    # The empty sets do not contribute any shingles, such that the non-empty sets' start offsets delimit their hashes
+    starts: npt.NDArray[np.int64] = (np.cumsum(lengths) - lengths)[non_empty]
+    signatures[non_empty] = np.minimum.reduceat(hashes, starts, axis=1).T
+    return signatures
+
+
+def get_band_parameters(
+    threshold: float, num_permutations: int = NUM_PERMUTATIONS, min_probability: float = 0.9999
+) -> Tuple[int, int]:
+    """Returns the most selective LSH banding that retrieves pairs with the threshold's similarity with high probability.
+
+    Two signatures become candidates with probability 1 - (1 - s^rows)^bands for the Jaccard similarity s.
+
+    Args:
+        threshold: The Jaccard similarity threshold.
+        num_permutations: The signature length.
+        min_probability: The minimum probability to retrieve a pair with the threshold's similarity.
+
+    Returns:
+        The number of bands and rows per band.
+    """
+    for rows in range(num_permutations, 0, -1):
+        bands: int = num_permutations // rows
+        if 1 - (1 - threshold**rows) ** bands >= min_probability:
+            return bands, rows
+    return num_permutations, 1
+
+
+class LSHIndex:
+    """Locality-sensitive hashing index of MinHash signatures.
+
+    The signatures are split into bands of consecutive rows.
+    Signatures that agree in all rows of at least one band are candidates for similar shingle sets.
+    """
+
+    def __init__(self, signatures: npt.NDArray[np.uint64], bands: int, rows: int) -> None:
+        self.bands = bands
+        self.rows = rows
+        self._buckets: List[Dict[bytes, List[int]]] = [{} for _ in range(bands)]
+        for index, signature in enumerate(signatures):
+            for buckets, key in zip(self._buckets, self._get_band_keys(signature)):
+                buckets.setdefault(key, []).append(index)
+
+    def _get_band_keys(self, signature: npt.NDArray[np.uint64]) -> List[bytes]:
+        return [signature[band * self.rows : (band + 1) * self.rows].tobytes() for band in range(self.bands)]
+
+    def query(self, signature: npt.NDArray[np.uint64]) -> Set[int]:
+        """Returns the indices of the indexed signatures that share at least one band with the signature."""
+        candidates: Set[int] = set()
+        for buckets, key in zip(self._buckets, self._get_band_keys(signature)):
+            candidates.update(buckets.get(key, ()))
+        return candidates
@@ -0,0 +1,212 @@
+import collections
+import contextlib
+import cProfile
+import functools
+import json
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from pathlib import Path
+from types import FrameType, TracebackType
+from typing import (
+    Any,
+    Callable,
+    Counter,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union,
+    cast,
+)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+ProfileMode = Literal["deterministic", "sampling"]
+PROFILE_MODES: Final[Tuple[str, ...]] = ("deterministic", "sampling")
+
+
+def _format_frame(frame: FrameType) -> str:
+    return f"{frame.f_code.co_name} ({Path(frame.f_code.co_filename).name}:{frame.f_code.co_firstlineno})"
+
+
+def _reset_traced_memory_peak() -> None:
+    if sys.version_info >= (3, 9):
+        tracemalloc.reset_peak()
+    else:
+        # Python 3.8 lacks `tracemalloc.reset_peak`. Restarting the tracing resets the peak as well,
+        # but clears the traces, such that only the allocations from now on are compared.
+        tracemalloc.stop()
+        tracemalloc.start()
+
+
+class _StackSampler(threading.Thread):
+    """Daemon thread periodically sampling the call stacks of the threads inside a profiled call."""
+
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="fundus-evaluation-stack-sampler", daemon=True)
+        self.interval = interval
+        # Maps the thread identifiers of active calls to the profile name and the root frame of the call
+        self.active: Dict[int, Tuple[str, FrameType]] = {}
+        self.stacks: Dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        self._stopped = threading.Event()
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            frames: Dict[int, FrameType] = sys._current_frames()
+            for thread_identifier, (name, root) in list(self.active.items()):
+                frame: Optional[FrameType] = frames.get(thread_identifier)
+                stack: List[str] = []
+                while frame is not None and frame is not root:
+                    stack.append(_format_frame(frame))
+                    frame = frame.f_back
+                if frame is root:
+                    stack.append(name)
+                    self.stacks[name][";".join(reversed(stack))] += 1
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+
+
+class Profiler:
+    """Profiles the calls of scrapers, scorers and other pipeline stages separately by name.
+
+    Only the time spent inside the profiled calls is recorded, such that the surrounding pipeline,
+    e.g. data loading, pandas and progress bars, does not clutter the profiles.
+    The profiles are written to the output directory on exit:
+        - `<name>.pstats`: Deterministic cProfile statistics, e.g. for `python -m pstats` or snakeviz.
+        - `<name>.collapsed`: Sampled collapsed stacks, e.g. for flamegraph.pl or speedscope.
+        - `<name>.memory.txt`: The top allocation sites (tracemalloc) if `memory_top_n` is set.
+        - `index.json`: The profiled callables' qualified names, number of calls and total wall time per name.
+
+    Example:
+        >>> with Profiler("profiles/") as profiler:
+        ...     scraper = profiler.wrap("scrape_fundus", SCRAPERS["fundus"])
+    """
+
+    def __init__(
+        self,
+        output_directory: Union[str, Path],
+        mode: ProfileMode = "deterministic",
+        sampling_interval: float = 0.001,
+        memory_top_n: Optional[int] = None,
+    ) -> None:
+        if mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode {mode!r}. Supported modes: {', '.join(PROFILE_MODES)}")
+
+        self.output_directory = Path(output_directory)
+        self.mode = mode
+        self.sampling_interval = sampling_interval
+        self.memory_top_n = memory_top_n
+
+        self._profiles: Dict[str, cProfile.Profile] = {}
+        self._sampler: Optional[_StackSampler] = None
+        self._allocations: Dict[str, Counter[str]] = collections.defaultdict(collections.Counter)
+        self._peaks: Dict[str, int] = collections.defaultdict(int)
+        self._index: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self) -> "Profiler":
+        if self.mode == "sampling":
+            self._sampler = _StackSampler(self.sampling_interval)
+            self._sampler.start()
+        if self.memory_top_n is not None:
+            tracemalloc.start()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        if self._sampler is not None:
+            self._sampler.stop()
+        if self.memory_top_n is not None:
+            tracemalloc.stop()
+        self.write()
+
+    @contextlib.contextmanager
+    def profile(self, name: str, target: Optional[Callable[..., Any]] = None) -> Iterator[None]:
+        """Profiles the enclosed code under the given name.
+
+        Args:
+            name: The profile name, e.g. the scraper's function name.
+            target: The profiled callable, recorded in the index to attribute the profile.
+        """
+        with self._lock:
+            entry: Dict[str, Any] = self._index.setdefault(name, {"callable": None, "calls": 0, "seconds": 0.0})
+            if target is not None:
+                entry["callable"] = f"{target.__module__}.{getattr(target, '__qualname__', target.__name__)}"
+
+        snapshot: Optional[tracemalloc.Snapshot] = None
+        if self.memory_top_n is not None:
+            _reset_traced_memory_peak()
+            snapshot = tracemalloc.take_snapshot()
+
+        profile: Optional[cProfile.Profile] = None
+        if self._sampler is not None:
+            self._sampler.active[threading.get_ident()] = (name, sys._getframe(2))
+        else:
+            profile = self._profiles.setdefault(name, cProfile.Profile())
+            profile.enable()
+
+        start: float = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds: float = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            if self._sampler is not None:
+                self._sampler.active.pop(threading.get_ident(), None)
+
+            if snapshot is not None:
+                self._peaks[name] = max(self._peaks[name], tracemalloc.get_traced_memory()[1])
+                for statistic in tracemalloc.take_snapshot().compare_to(snapshot, "lineno"):
+                    if statistic.size_diff > 0:
+                        self._allocations[name][str(statistic.traceback[0])] += statistic.size_diff
+
+            with self._lock:
+                entry["calls"] += 1
+                entry["seconds"] += seconds
+
+    def wrap(self, name: str, function: F) -> F:
+        """Returns the function profiled under the given name on each call."""
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with self.profile(name, target=function):
+                return function(*args, **kwargs)
+
+        return cast(F, wrapper)
+
+    def write(self) -> None:
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+
+        for name, profile in self._profiles.items():
+            pstats.Stats(profile).dump_stats(self.output_directory / f"{name}.pstats")
+
+        if self._sampler is not None:
+            for name, stacks in self._sampler.stacks.items():
+                with (self.output_directory / f"{name}.collapsed").open("w", encoding="utf-8") as collapsed_file:
+                    collapsed_file.writelines(f"{stack} {count}\n" for stack, count in sorted(stacks.items()))
+
+        if self.memory_top_n is not None:
+            for name, allocations in self._allocations.items():
+                with (self.output_directory / f"{name}.memory.txt").open("w", encoding="utf-8") as memory_file:
+                    memory_file.write(f"Peak traced memory: {self._peaks[name] / 2**20:.1f} MiB\n")
+                    memory_file.write(f"Top {self.memory_top_n} allocation sites of retained memory:\n")
+                    for site, size in allocations.most_common(self.memory_top_n):
+                        memory_file.write(f"{size / 2**10:>12.1f} KiB  {site}\n")
+
+        with (self.output_directory / "index.json").open("w", encoding="utf-8") as index_file:
+            json.dump(self._index, index_file, indent=4)
@@ -0,0 +1,215 @@
+import collections
+import dataclasses
+import functools
+import hashlib
+import pickle
+from pathlib import Path
+from typing import (
+    Counter,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Union,
+)
+
+import numpy as np
+import numpy.typing as npt
+
+import fundus_evaluation
+from fundus_evaluation.minhash import compute_signatures, shingle
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    get_reference_bodies,
+    get_removed_paragraph_indices,
+    load_evaluation_articles,
+    prepare_body,
+    tokenize_words,
+)
+
+
+@dataclasses.dataclass
+class PreparedReference:
+    """Reference-side structures of a ground truth article shared by all scorers and scrapers.
+
+    The structures are computed lazily on first access and then kept for subsequent scorer calls.
+    Each structure is a list with one entry per candidate reference body (see `utils.get_reference_bodies`).
+    """
+
+    body: List[str]
+    max_optional_paragraphs: Optional[int] = None
+
+    @functools.cached_property
+    def bodies(self) -> List[List[str]]:
+        """The candidate reference bodies without optional paragraph markers."""
+        return list(get_reference_bodies(self.body, self.max_optional_paragraphs))
+
+    @functools.cached_property
+    def texts(self) -> List[str]:
+        """The candidate reference bodies joined to a single text."""
+        return ["\n\n".join(body) for body in self.bodies]
+
+    @functools.cached_property
+    def word_tokens(self) -> List[List[str]]:
+        """The candidate texts' word tokens (see `utils.tokenize_words`)."""
+        return [tokenize_words(text) for text in self.texts]
+
+    @functools.cached_property
+    def sentences(self) -> List[List[str]]:
+        """The candidate texts' non-empty sentences using NLTK's punkt sentence tokenizer."""
+        import nltk
+
+        return [[sentence for sentence in nltk.sent_tokenize(text) if sentence] for text in self.texts]
+
+    @functools.cached_property
+    def sentence_tokens(self) -> List[List[List[str]]]:
+        """The candidate sentences tokenized with the ROUGE tokenizer."""
+        from rouge_score.tokenizers import DefaultTokenizer
+
+        tokenizer: DefaultTokenizer = DefaultTokenizer(use_stemmer=False)
+        return [[tokenizer.tokenize(sentence) for sentence in sentences] for sentences in self.sentences]
+
+    @functools.cached_property
+    def paragraph_counts(self) -> List[Counter[str]]:
+        """The candidate bodies as hashed paragraph multisets."""
+        return [collections.Counter(body) for body in self.bodies]
+
+    @functools.cached_property
+    def removed_paragraphs(self) -> List[FrozenSet[int]]:
+        """The indices of the optional paragraphs removed from the body for each candidate body."""
+        return list(get_removed_paragraph_indices(self.body, self.max_optional_paragraphs))
+
+    @functools.cached_property
+    def paragraph_shingles(self) -> List[FrozenSet[int]]:
+        """The hashed word n-grams of each paragraph of the body (see `minhash.shingle`)."""
+        return [shingle(paragraph) for paragraph in prepare_body(self.body)]
+
+    @functools.cached_property
+    def paragraph_signatures(self) -> npt.NDArray[np.uint64]:
+        """The MinHash signatures of each paragraph of the body (see `minhash.compute_signatures`)."""
+        return compute_signatures(self.paragraph_shingles)
+
+
+class ReferenceIndex(Mapping[str, PreparedReference]):
+    """Mapping of article identifiers to prepared reference articles.
+
+    The index may be passed to any scorer in place of the raw reference articles.
+    """
+
+    def __init__(
+        self,
+        references: Dict[str, PreparedReference],
+        max_optional_paragraphs: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+    ) -> None:
+        self._references = references
+        self.max_optional_paragraphs = max_optional_paragraphs
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def from_articles(
+        cls,
+        reference_articles: Mapping[str, EvaluationArticle],
+        max_optional_paragraphs: Optional[int] = None,
+        fingerprint: Optional[str] = None,
+    ) -> "ReferenceIndex":
+        return cls(
+            {
+                article_identifier: PreparedReference(article["body"], max_optional_paragraphs)
+                for article_identifier, article in reference_articles.items()
+            },
+            max_optional_paragraphs=max_optional_paragraphs,
+            fingerprint=fingerprint,
+        )
+
+    @classmethod
+    def ensure(
+        cls,
+        reference_articles: Union[Mapping[str, EvaluationArticle], "ReferenceIndex"],
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> "ReferenceIndex":
+        """Returns the reference articles as index, preparing them if necessary.
+
+        Raises:
+            ValueError: If the given index has been prepared with a different maximum of optional paragraphs.
+        """
+        if not isinstance(reference_articles, ReferenceIndex):
+            return cls.from_articles(reference_articles, max_optional_paragraphs)
+
+        if reference_articles.max_optional_paragraphs != max_optional_paragraphs:
+            raise ValueError(
+                f"The reference index has been prepared with "
+                f"max_optional_paragraphs={reference_articles.max_optional_paragraphs!r}, "
+                f"but the scorer has been called with max_optional_paragraphs={max_optional_paragraphs!r}"
+            )
+        return reference_articles
+
+    def subset(self, article_identifiers: Iterable[str]) -> "ReferenceIndex":
+        """Returns an index of the given articles sharing the already prepared references and the fingerprint."""
+        return ReferenceIndex(
+            {article_identifier: self._references[article_identifier] for article_identifier in article_identifiers},
+            max_optional_paragraphs=self.max_optional_paragraphs,
+            fingerprint=self.fingerprint,
+        )
+
+    @staticmethod
+    def get_index_path(ground_truth_path: Union[str, Path]) -> Path:
+        """Returns the path of a persisted index next to the ground truth file, e.g. `ground_truth.references.pkl`."""
+        ground_truth_path = Path(ground_truth_path)
+        return ground_truth_path.with_name(f"{ground_truth_path.stem}.references.pkl")
+
+    @staticmethod
+    def compute_fingerprint(ground_truth_path: Union[str, Path], max_optional_paragraphs: Optional[int]) -> str:
+        digest = hashlib.sha256(Path(ground_truth_path).read_bytes())
+        digest.update(f"\0{max_optional_paragraphs}\0{fundus_evaluation.__version__}".encode("utf-8"))
+        return digest.hexdigest()
+
+    @classmethod
+    def load_or_create(
+        cls,
+        ground_truth_path: Union[str, Path],
+        max_optional_paragraphs: Optional[int] = None,
+        persist: bool = False,
+    ) -> "ReferenceIndex":
+        """Loads the reference index persisted next to the ground truth file or creates a new one.
+
+        A persisted index is invalidated if the ground truth file, the maximum of optional paragraphs
+        or the package version changed.
+
+        Args:
+            ground_truth_path: The path to the dataset's ground truth file.
+            max_optional_paragraphs: The maximum number of variants of optional paragraphs.
+            persist: If True, the persisted index will be considered.
+                Otherwise, the index is only prepared in-process.
+
+        Returns:
+            The reference index.
+        """
+        fingerprint: str = cls.compute_fingerprint(ground_truth_path, max_optional_paragraphs)
+
+        if persist:
+            index_path: Path = cls.get_index_path(ground_truth_path)
+            if index_path.exists():
+                with index_path.open("rb") as index_file:
+                    index: ReferenceIndex = pickle.load(index_file)
+                if isinstance(index, ReferenceIndex) and index.fingerprint == fingerprint:
+                    return index
+
+        return cls.from_articles(load_evaluation_articles(ground_truth_path), max_optional_paragraphs, fingerprint)
+
+    def save(self, ground_truth_path: Union[str, Path]) -> None:
+        """Persists the index, including all already prepared structures, next to the ground truth file."""
+        with self.get_index_path(ground_truth_path).open("wb") as index_file:
+            pickle.dump(self, index_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def __getitem__(self, article_identifier: str) -> PreparedReference:
+        return self._references[article_identifier]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._references)
+
+    def __len__(self) -> int:
+        return len(self._references)
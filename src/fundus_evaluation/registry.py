@@ -0,0 +1,77 @@
+import importlib
+import sys
+from typing import Dict, Generic, Iterator, Mapping, Optional, TypeVar, cast
+
+T = TypeVar("T")
+
+
+def import_object(import_path: str) -> object:
+    """Imports an object given by an import path of the form `module:attribute`."""
+    module_name, _, attribute = import_path.partition(":")
+    if not attribute:
+        raise ValueError(f"Invalid import path {import_path!r}. Expected the form 'module:attribute'")
+    return getattr(importlib.import_module(module_name), attribute)
+
+
+def _get_entry_point_import_paths(group: str) -> Dict[str, str]:
+    from importlib import metadata
+
+    if sys.version_info >= (3, 10):
+        entry_points = metadata.entry_points(group=group)
+    else:
+        entry_points = metadata.entry_points().get(group, [])
+    return {entry_point.name: entry_point.value for entry_point in entry_points}
+
+
+class LazyRegistry(Mapping[str, T], Generic[T]):
+    """Mapping of identifiers to objects that are imported on first access.
+
+    The registry only stores the import paths of its objects, such that the identifiers are available
+    without importing the objects' modules and their dependencies. Additionally, third-party packages may register
+    objects with Python entry points of the registry's entry point group, e.g. in their `pyproject.toml`:
+
+        [project.entry-points."fundus_evaluation.scrapers"]
+        my_scraper = "my_package.scraping:scrape_my_scraper"
+
+    Built-in objects take precedence over objects registered by entry points with the same identifier.
+    """
+
+    def __init__(self, import_paths: Mapping[str, str], entry_point_group: Optional[str] = None) -> None:
+        self._builtin_import_paths: Dict[str, str] = dict(import_paths)
+        self._entry_point_group = entry_point_group
+        self._import_paths: Optional[Dict[str, str]] = None
+        self._objects: Dict[str, T] = {}
+
+    @property
+    def import_paths(self) -> Dict[str, str]:
+        """The import paths of the registered objects sorted by their identifiers."""
+        if self._import_paths is None:
+            import_paths: Dict[str, str] = (
+                {} if self._entry_point_group is None else _get_entry_point_import_paths(self._entry_point_group)
+            )
+            import_paths.update(self._builtin_import_paths)
+            self._import_paths = dict(sorted(import_paths.items()))
+        return self._import_paths
+
+    def register(self, identifier: str, import_path: str) -> None:
+        """Registers an object by its import path of the form `module:attribute`."""
+        self.import_paths[identifier] = import_path
+        self._objects.pop(identifier, None)
+
+    def __getitem__(self, identifier: str) -> T:
+        if identifier not in self._objects:
+            imported: object = import_object(self.import_paths[identifier])
+            if not callable(imported):
+                raise TypeError(f"The registered object {self.import_paths[identifier]!r} is not callable")
+            self._objects[identifier] = cast(T, imported)
+        return self._objects[identifier]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.import_paths)
+
+    def __len__(self) -> int:
+        return len(self.import_paths)
+
+    def __contains__(self, identifier: object) -> bool:
+        # Prevents the default implementation from importing the object
+        return identifier in self.import_paths
@@ -0,0 +1,547 @@
+import concurrent.futures
+import gc
+import heapq
+import itertools
+import json
+import multiprocessing
+import multiprocessing.context
+import os
+import sys
+import time
+import warnings
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Final,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+K = TypeVar("K", bound=Hashable)
+R = TypeVar("R")
+
+# The predicted seconds per unit of size of tasks without any recorded timings of their stage
+DEFAULT_RATE: Final[float] = 1e-6
+
+# The weight of the latest timing in the exponential moving average of a recurring task's timings
+TIMING_SMOOTHING: Final[float] = 0.5
+
+# The predicted resident memory of a worker process of a scraper or scorer without a declared or measured footprint
+DEFAULT_MEMORY_FOOTPRINT: Final[int] = 256 * 1024 * 1024
+
+# The minimum seconds between two samples of a worker's proportional set size, which is expensive to read
+PROPORTIONAL_MEMORY_INTERVAL: Final[float] = 1.0
+
+_last_proportional_memory_sample: float = float("-inf")
+
+
+def get_peak_resident_memory() -> int:
+    """Returns the peak resident set size of this process in bytes or zero if it is unavailable, e.g. on Windows."""
+    try:
+        import resource
+    except ImportError:
+        return 0
+
+    peak: int = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def get_resident_memory() -> int:
+    """Returns the current resident set size of this process in bytes.
+
+    Outside of Linux, the peak resident set size is returned as a conservative estimate.
+    """
+    try:
+        with open("/proc/self/statm", "rb") as statm_file:
+            return int(statm_file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return get_peak_resident_memory()
+
+
+def get_proportional_memory() -> Optional[int]:
+    """Returns the proportional set size (PSS) of this process in bytes, if available (Linux only).
+
+    Pages shared with other processes, e.g. copy-on-write pages of a forked parent, are divided by the number of
+    sharing processes. Unlike the resident set sizes, the PSS of all processes sums up to their actual memory usage.
+    """
+    try:
+        with open("/proc/self/smaps_rollup", "rb") as smaps_file:
+            for line in smaps_file:
+                if line.startswith(b"Pss:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class WorkerMemory(NamedTuple):
+    """The memory usage of a worker process after a task in bytes."""
+
+    resident: int
+    peak_resident: int
+    proportional: Optional[int]  # Only sampled every `PROPORTIONAL_MEMORY_INTERVAL` seconds
+
+
+def _sample_worker_memory() -> WorkerMemory:
+    global _last_proportional_memory_sample
+    proportional: Optional[int] = None
+    if time.monotonic() - _last_proportional_memory_sample >= PROPORTIONAL_MEMORY_INTERVAL:
+        proportional = get_proportional_memory()
+        _last_proportional_memory_sample = time.monotonic()
+    return WorkerMemory(get_resident_memory(), get_peak_resident_memory(), proportional)
+
+
+def summarize_worker_memory(samples: Mapping[int, WorkerMemory]) -> str:
+    """Summarizes the latest memory samples of the worker processes by their process identifier."""
+    megabyte: int = 1024 * 1024
+    summary: str = (
+        f"Worker memory of {len(samples)} workers: "
+        f"{sum(sample.resident for sample in samples.values()) / len(samples) / megabyte:.1f} MB RSS on average"
+    )
+    proportional: List[int] = [sample.proportional for sample in samples.values() if sample.proportional is not None]
+    if len(proportional) == len(samples):
+        summary += (
+            f", {sum(proportional) / len(proportional) / megabyte:.1f} MB PSS on average "
+            f"and {sum(proportional) / megabyte:.1f} MB PSS in total"
+        )
+    return summary
+
+
+class Task(NamedTuple):
+    """A unit of work of the scheduler, e.g. the extraction of an article by a scraper."""
+
+    stage: str  # E.g. "scrape" or "score"
+    name: str  # The scraper or scorer identifier
+    size: int  # E.g. the compressed HTML bytes or the number of characters to score
+    key: Optional[str] = None  # Identifies a recurring task across runs, e.g. by the article identifier
+
+
+class _Rate(NamedTuple):
+    seconds: float
+    size: int
+    num_tasks: int
+
+
+class CostModel:
+    """Predicts the run time of tasks from their size, past timings and the observed rates of scrapers and scorers.
+
+    A recurring task is predicted by the moving average of its past timings.
+    Otherwise, the task's size is multiplied by the seconds per unit of size of its scraper or scorer
+    or, if the scraper or scorer has not been timed yet, of its stage.
+
+    In addition, the cost model predicts the resident memory of a worker process running a scraper or scorer
+    by the peak resident memory measured in the latest run.
+    """
+
+    def __init__(
+        self,
+        rates: Optional[Dict[str, _Rate]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        footprints: Optional[Dict[str, int]] = None,
+    ) -> None:
+        self._rates: Dict[str, _Rate] = {} if rates is None else rates
+        self._timings: Dict[str, float] = {} if timings is None else timings
+        self._footprints: Dict[str, int] = {} if footprints is None else footprints
+        self._measured_footprints: Set[str] = set()
+        self.num_records: int = 0
+
+    @staticmethod
+    def get_path(ground_truth_path: Union[str, Path]) -> Path:
+        """Returns the path of the timings next to the ground truth file, e.g. `ground_truth.timings.json`."""
+        ground_truth_path = Path(ground_truth_path)
+        return ground_truth_path.with_name(f"{ground_truth_path.stem}.timings.json")
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "CostModel":
+        """Loads the cost model from a timings file. A missing file results in an empty cost model."""
+        path = Path(path)
+        if not path.exists():
+            return cls()
+
+        with path.open("r", encoding="utf-8") as timings_file:
+            content: Dict[str, Any] = json.load(timings_file)
+        return cls(
+            rates={name: _Rate(*rate) for name, rate in content["rates"].items()},
+            timings=content["timings"],
+            footprints=content.get("footprints", {}),
+        )
+
+    def save(self, path: Union[str, Path]) -> None:
+        path = Path(path)
+        temporary_path: Path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        with temporary_path.open("w", encoding="utf-8") as timings_file:
+            json.dump(
+                {"rates": self._rates, "timings": self._timings, "footprints": self._footprints}, timings_file, indent=4
+            )
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def _get_rate_keys(task: Task) -> Tuple[str, str]:
+        return f"{task.stage}/{task.name}", task.stage
+
+    @staticmethod
+    def _get_timing_key(task: Task) -> Optional[str]:
+        return None if task.key is None else f"{task.stage}/{task.name}/{task.key}"
+
+    def predict(self, task: Task) -> float:
+        """Returns the predicted run time of the task in seconds."""
+        timing_key: Optional[str] = self._get_timing_key(task)
+        if timing_key is not None and timing_key in self._timings:
+            return self._timings[timing_key]
+
+        for rate_key in self._get_rate_keys(task):
+            if rate_key in self._rates:
+                rate: _Rate = self._rates[rate_key]
+                if rate.size > 0:
+                    return rate.seconds / rate.size * task.size
+                return rate.seconds / rate.num_tasks
+        return DEFAULT_RATE * task.size
+
+    def record(self, task: Task, seconds: float) -> None:
+        """Refines the cost model with the actual run time of the task."""
+        timing_key: Optional[str] = self._get_timing_key(task)
+        if timing_key is not None:
+            previous: Optional[float] = self._timings.get(timing_key)
+            self._timings[timing_key] = (
+                seconds if previous is None else TIMING_SMOOTHING * seconds + (1 - TIMING_SMOOTHING) * previous
+            )
+
+        for rate_key in self._get_rate_keys(task):
+            rate: _Rate = self._rates.get(rate_key, _Rate(0.0, 0, 0))
+            self._rates[rate_key] = _Rate(rate.seconds + seconds, rate.size + task.size, rate.num_tasks + 1)
+        self.num_records += 1
+
+    def predict_footprint(self, task: Task, declared_footprint: Optional[int] = None) -> int:
+        """Returns the predicted resident memory in bytes of a worker process running the task's scraper or scorer.
+
+        Args:
+            task: The task.
+            declared_footprint: The footprint declared by the scraper or scorer (see `utils.with_memory_footprint`).
+                It is superseded by measured footprints.
+        """
+        footprint_key: str = f"{task.stage}/{task.name}"
+        if footprint_key in self._footprints:
+            return self._footprints[footprint_key]
+        return DEFAULT_MEMORY_FOOTPRINT if declared_footprint is None else declared_footprint
+
+    def record_footprint(self, task: Task, num_bytes: int) -> None:
+        """Refines the cost model with the measured peak resident memory of a worker process that ran the task.
+
+        The first measurement of a run replaces the footprints of previous runs, e.g. of outdated dependencies.
+        """
+        if num_bytes <= 0:
+            return
+
+        footprint_key: str = f"{task.stage}/{task.name}"
+        if footprint_key in self._measured_footprints:
+            self._footprints[footprint_key] = max(self._footprints[footprint_key], num_bytes)
+        else:
+            self._footprints[footprint_key] = num_bytes
+            self._measured_footprints.add(footprint_key)
+
+
+def _run_measured(function: Callable[..., Tuple[R, float]], *arguments: Any) -> Tuple[R, float, int, WorkerMemory]:
+    result, seconds = function(*arguments)
+    return result, seconds, os.getpid(), _sample_worker_memory()
+
+
+class _Worker:
+    """A single worker process dedicated to the tasks of one scraper or scorer."""
+
+    def __init__(
+        self,
+        name: str,
+        footprint: int,
+        initializer: Optional[Callable[..., None]],
+        initargs: Tuple[Any, ...],
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+    ) -> None:
+        self.name = name
+        self.footprint = footprint
+        self.executor: concurrent.futures.ProcessPoolExecutor = concurrent.futures.ProcessPoolExecutor(
+            max_workers=1,
+            mp_context=mp_context,
+            initializer=initializer,
+            initargs=initargs if initializer is None else (*initargs, name),
+        )
+        self.future: Optional["concurrent.futures.Future[Tuple[Any, float, int, WorkerMemory]]"] = None
+        self.key: Any = None
+        self.task: Optional[Task] = None
+
+    @property
+    def idle(self) -> bool:
+        return self.future is None
+
+
+class Scheduler:
+    """Runs tasks on a pool of worker processes, dispatching the longest predicted task first.
+
+    All workers pull their next task from a single queue ordered by the tasks' predicted run times (see `CostModel`),
+    such that idle workers take over the remaining work instead of waiting for a statically assigned chunk.
+    Only as many tasks as workers are in flight, so that the order adapts to the actual timings:
+    The queue is reordered whenever the number of recorded timings has doubled.
+
+    With a memory budget, each worker process is dedicated to a single scraper or scorer, such that it only loads
+    that scraper's or scorer's models. A worker is only started while the predicted resident memory of all workers
+    (see `CostModel.predict_footprint`) and the current resident memory of this process stay within the budget.
+    The workers' footprints are replaced by their measured peak resident memory after each task.
+    Thus, lightweight scrapers run on many workers, while heavy scrapers run on few workers at the same time.
+    Idle workers whose scraper or scorer has no queued tasks are shut down when their memory is needed.
+    A task is always started if no other task is running, even if it exceeds the budget.
+
+    With a preload function, the models are loaded in this process and the worker processes are forked from it,
+    such that they share the loaded state copy-on-write instead of loading it separately.
+    The garbage collector is frozen before forking, such that it does not write to, and thereby copy, shared objects.
+    The initializer still runs in the workers and should skip state that has already been loaded.
+    After each task, the workers' memory is sampled (see `worker_memory` and `summarize_worker_memory`).
+
+    Args:
+        cost_model: The cost model that predicts the tasks' run times and records their actual run times.
+        num_workers: The (maximum) number of worker processes.
+        initializer: A function called once in each worker process, e.g. to load models.
+            With a memory budget, the worker's scraper or scorer identifier is passed as an additional last argument.
+        initargs: The arguments of the initializer.
+        window_size: The maximum number of queued and running tasks taken from the input at once.
+            Per default, all tasks are queued, such that they are dispatched in a global longest-first order.
+            A window bounds the memory of tasks holding large arguments.
+        memory_budget: The maximum resident memory in bytes of this process and its worker processes.
+            Per default, the memory is not limited.
+        footprints: The declared memory footprints in bytes of the scrapers or scorers by their identifier
+            (see `utils.with_memory_footprint`).
+        preload: A function called in this process before forking the worker processes, e.g. to load models.
+            Only supported on platforms with the fork start method.
+
+    Example:
+        >>> scheduler = Scheduler(CostModel(), num_workers=4)
+        >>> for key, result, seconds in scheduler.map(function, [(key, Task("scrape", "bte", 42), (argument,))]):
+        ...     pass
+    """
+
+    def __init__(
+        self,
+        cost_model: CostModel,
+        num_workers: int,
+        initializer: Optional[Callable[..., None]] = None,
+        initargs: Tuple[Any, ...] = (),
+        window_size: Optional[int] = None,
+        memory_budget: Optional[int] = None,
+        footprints: Optional[Mapping[str, int]] = None,
+        preload: Optional[Callable[[], None]] = None,
+    ) -> None:
+        if preload is not None and "fork" not in multiprocessing.get_all_start_methods():
+            warnings.warn("Preloading worker processes requires the fork start method, which is not available.")
+            preload = None
+
+        self.cost_model = cost_model
+        self.num_workers = num_workers
+        self.initializer = initializer
+        self.initargs = initargs
+        self.window_size = window_size
+        self.memory_budget = memory_budget
+        self.footprints: Mapping[str, int] = {} if footprints is None else footprints
+        self.preload = preload
+        # The latest memory sample of each worker process by its process identifier
+        self.worker_memory: Dict[int, WorkerMemory] = {}
+
+    def map(
+        self, function: Callable[..., Tuple[R, float]], tasks: Iterable[Tuple[K, Task, Tuple[Any, ...]]]
+    ) -> Iterator[Tuple[K, R, float]]:
+        """Runs the function with each task's arguments in the worker processes.
+
+        Args:
+            function: A picklable function returning its result and its measured run time in seconds.
+            tasks: The tasks as (key, task, arguments) triples. The keys identify the results.
+
+        Yields:
+            The keys, results and run times of the tasks in the order of their completion.
+        """
+        self.worker_memory = {}
+        mp_context: Optional[multiprocessing.context.BaseContext] = None
+        if self.preload is not None:
+            self.preload()
+            gc.freeze()
+            mp_context = multiprocessing.get_context("fork")
+
+        try:
+            if self.memory_budget is None:
+                yield from self._map_shared(function, tasks, mp_context)
+            else:
+                yield from self._map_within_memory_budget(function, tasks, mp_context)
+        finally:
+            if self.preload is not None:
+                gc.unfreeze()
+
+    def _record_memory(self, process_identifier: int, sample: WorkerMemory) -> None:
+        previous: Optional[WorkerMemory] = self.worker_memory.get(process_identifier)
+        if sample.proportional is None and previous is not None:
+            sample = sample._replace(proportional=previous.proportional)
+        self.worker_memory[process_identifier] = sample
+
+    def _map_shared(
+        self,
+        function: Callable[..., Tuple[R, float]],
+        tasks: Iterable[Tuple[K, Task, Tuple[Any, ...]]],
+        mp_context: Optional[multiprocessing.context.BaseContext],
+    ) -> Iterator[Tuple[K, R, float]]:
+        task_iterator: Iterator[Tuple[K, Task, Tuple[Any, ...]]] = iter(tasks)
+        counter: Iterator[int] = itertools.count()
+        queue: List[Tuple[float, int, K, Task, Tuple[Any, ...]]] = []
+        in_flight: Dict["concurrent.futures.Future[Tuple[R, float, int, WorkerMemory]]", Tuple[K, Task]] = {}
+        num_records_at_ordering: int = self.cost_model.num_records
+
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.num_workers, mp_context=mp_context, initializer=self.initializer, initargs=self.initargs
+        ) as executor:
+            exhausted: bool = False
+            while True:
+                while not exhausted and (self.window_size is None or len(queue) + len(in_flight) < self.window_size):
+                    try:
+                        key, task, arguments = next(task_iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    # The heap pops the smallest entry, i.e. the longest predicted task
+                    heapq.heappush(queue, (-self.cost_model.predict(task), next(counter), key, task, arguments))
+
+                if self.cost_model.num_records >= 2 * max(num_records_at_ordering, self.num_workers):
+                    queue = [
+                        (-self.cost_model.predict(task), sequence, key, task, arguments)
+                        for _, sequence, key, task, arguments in queue
+                    ]
+                    heapq.heapify(queue)
+                    num_records_at_ordering = self.cost_model.num_records
+
+                while queue and len(in_flight) < self.num_workers:
+                    _, _, key, task, arguments = heapq.heappop(queue)
+                    in_flight[executor.submit(_run_measured, function, *arguments)] = (key, task)
+
+                if not in_flight:
+                    return
+
+                done, _ = concurrent.futures.wait(in_flight, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    key, task = in_flight.pop(future)
+                    result, seconds, process_identifier, memory = future.result()
+                    self.cost_model.record(task, seconds)
+                    self._record_memory(process_identifier, memory)
+                    yield key, result, seconds
+
+    def _map_within_memory_budget(
+        self,
+        function: Callable[..., Tuple[R, float]],
+        tasks: Iterable[Tuple[K, Task, Tuple[Any, ...]]],
+        mp_context: Optional[multiprocessing.context.BaseContext],
+    ) -> Iterator[Tuple[K, R, float]]:
+        assert self.memory_budget is not None
+        memory_budget: int = self.memory_budget
+        task_iterator: Iterator[Tuple[K, Task, Tuple[Any, ...]]] = iter(tasks)
+        counter: Iterator[int] = itertools.count()
+        # A longest-first queue for each scraper or scorer
+        queues: Dict[str, List[Tuple[float, int, K, Task, Tuple[Any, ...]]]] = {}
+        workers: List[_Worker] = []
+        num_records_at_ordering: int = self.cost_model.num_records
+
+        def submit(worker: _Worker) -> None:
+            _, _, worker.key, worker.task, arguments = heapq.heappop(queues[worker.name])
+            worker.future = worker.executor.submit(_run_measured, function, *arguments)
+
+        def retire(worker: _Worker) -> None:
+            worker.executor.shutdown()
+            workers.remove(worker)
+
+        def admit() -> bool:
+            # The longest queued task of each scraper or scorer without an idle worker, longest first
+            waiting: List[Tuple[float, int, K, Task, Tuple[Any, ...]]] = sorted(
+                queue[0] for queue in queues.values() if queue
+            )
+            for _, _, _, task, _ in waiting:
+                footprint: int = self.cost_model.predict_footprint(task, self.footprints.get(task.name))
+                # Idle workers without queued tasks may be shut down to make room for the new worker
+                retirable: List[_Worker] = [worker for worker in workers if worker.idle and not queues.get(worker.name)]
+                available: int = memory_budget - get_resident_memory()
+                required: int = sum(worker.footprint for worker in workers) + footprint
+
+                num_retired: int = 0
+                while num_retired < len(retirable) and (
+                    len(workers) - num_retired >= self.num_workers or required > available
+                ):
+                    required -= retirable[num_retired].footprint
+                    num_retired += 1
+                if len(workers) - num_retired >= self.num_workers:
+                    continue
+                if required > available and any(not worker.idle for worker in workers):
+                    continue
+
+                for worker in retirable[:num_retired]:
+                    retire(worker)
+                worker = _Worker(task.name, footprint, self.initializer, self.initargs, mp_context)
+                workers.append(worker)
+                submit(worker)
+                return True
+            return False
+
+        exhausted: bool = False
+        try:
+            while True:
+                num_pending: int = sum(map(len, queues.values())) + sum(not worker.idle for worker in workers)
+                while not exhausted and (self.window_size is None or num_pending < self.window_size):
+                    try:
+                        key, task, arguments = next(task_iterator)
+                    except StopIteration:
+                        exhausted = True
+                        break
+                    entry = (-self.cost_model.predict(task), next(counter), key, task, arguments)
+                    heapq.heappush(queues.setdefault(task.name, []), entry)
+                    num_pending += 1
+
+                if self.cost_model.num_records >= 2 * max(num_records_at_ordering, self.num_workers):
+                    for name, queue in queues.items():
+                        queues[name] = [
+                            (-self.cost_model.predict(task), sequence, key, task, arguments)
+                            for _, sequence, key, task, arguments in queue
+                        ]
+                        heapq.heapify(queues[name])
+                    num_records_at_ordering = self.cost_model.num_records
+
+                # Idle workers take the longest queued task of their scraper or scorer before new workers are started
+                for worker in workers:
+                    if worker.idle and queues.get(worker.name):
+                        submit(worker)
+                while admit():
+                    pass
+
+                running: Dict["concurrent.futures.Future[Tuple[Any, float, int, WorkerMemory]]", _Worker] = {
+                    worker.future: worker for worker in workers if worker.future is not None
+                }
+                if not running:
+                    return
+
+                done, _ = concurrent.futures.wait(running, return_when=concurrent.futures.FIRST_COMPLETED)
+                for future in done:
+                    worker = running[future]
+                    assert worker.task is not None
+                    key, task = worker.key, worker.task
+                    worker.future, worker.key, worker.task = None, None, None
+
+                    result, seconds, process_identifier, memory = future.result()
+                    self.cost_model.record(task, seconds)
+                    self.cost_model.record_footprint(task, memory.peak_resident)
+                    if memory.peak_resident > 0:
+                        worker.footprint = memory.peak_resident
+                    self._record_memory(process_identifier, memory)
+                    yield key, result, seconds
+        finally:
+            for worker in workers:
+                worker.executor.shutdown()
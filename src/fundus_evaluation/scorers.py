@@ -1,41 +1,160 @@
 import collections
 import dataclasses
+import functools
+import itertools
+import re
 from typing import (
+    TYPE_CHECKING,
+    AbstractSet,
     Counter,
     Dict,
+    Final,
+    FrozenSet,
     Iterable,
     Iterator,
     List,
+    Mapping,
     Optional,
+    Pattern,
     Protocol,
+    Set,
+    Tuple,
     TypeVar,
+    Union,
     runtime_checkable,
 )
 
+import more_itertools
+import numpy as np
+import numpy.typing as npt
 import pandas as pd
 
-from fundus_evaluation.utils import EvaluationArticle, get_reference_bodies
+from fundus_evaluation.batch import ArticleBatch
+from fundus_evaluation.corpus import CompactArticles
+from fundus_evaluation.minhash import (
+    LSHIndex,
+    compute_signatures,
+    get_band_parameters,
+    jaccard_similarity,
+    shingle,
+)
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    get_reference_bodies,
+    get_removed_optional_indices,
+    prepare_body,
+    tokenize_words,
+    with_preload,
+    with_version,
+)
+
+if TYPE_CHECKING:
+    from scipy import sparse
 
 T = TypeVar("T")
 
+BatchScores = Dict[str, npt.NDArray[np.float64]]
+
+# The minimum Jaccard similarity of the word bigrams of fuzzy matching paragraphs
+FUZZY_PARAGRAPH_MATCH_THRESHOLD: Final[float] = 0.8
+
+# The maximum number of optional paragraphs whose combinations the fast scorers enumerate as candidate reference
+# bodies. Bodies with more optional paragraphs are only scored with all or none of them.
+FAST_MAX_OPTIONAL_PARAGRAPHS: Final[int] = 1
+
+# Approximates NLTK's punkt: Sentences end with punctuation, optionally followed by closing quotes or brackets,
+# if the next sentence starts with an uppercase letter, a digit or an opening quote or bracket.
+_SENTENCE_BOUNDARY: Final[Pattern[str]] = re.compile(
+    r"(?:(?<=[.!?])|(?<=[.!?][\"'”’)\]]))\s+(?=[\"'“‘(\[]?[A-Z0-9À-ÖØ-Þ])"
+)
+_ROUGE_NON_ALPHANUMERIC: Final[Pattern[str]] = re.compile(r"[^a-z0-9]+")
+_WER_MULTIPLE_SPACES: Final[Pattern[str]] = re.compile(r"\s\s+")
+
 
 @runtime_checkable
 class Scorer(Protocol):
     """Protocol for scoring functions. The function name should have the prefix 'score_'.
     The function return value should be a pandas data frame with the index column "article"
     of article identifiers and the remaining columns for the respective article scores.
+    Scorers may declare a `__version__` attribute that has to be changed when their scores change
+    (see `utils.with_version`).
+    The reference articles may be passed as raw articles or as prepared `ReferenceIndex`.
     """
 
     __name__: str
 
     def __call__(
         self,
-        reference_articles: Dict[str, EvaluationArticle],
+        reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
         hypothesis_articles: Dict[str, EvaluationArticle],
         max_optional_paragraphs: Optional[int] = None,
     ) -> pd.DataFrame: ...
 
 
+@runtime_checkable
+class BatchScorer(Protocol):
+    """Protocol for columnar scoring functions operating on whole article batches.
+    The function return value should be a dictionary of score names to float arrays,
+    aligned with the reference batch's articles. The hypothesis batch is aligned to the reference batch.
+    Use `to_scorer` to register a batch scorer as a `Scorer`.
+    """
+
+    __name__: str
+
+    def __call__(
+        self,
+        references: ArticleBatch,
+        hypotheses: ArticleBatch,
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> BatchScores: ...
+
+
+def to_scorer(batch_scorer: BatchScorer) -> Scorer:
+    """Adapts a batch scorer to the `Scorer` protocol. The returned scorer keeps the batch scorer's name."""
+
+    @functools.wraps(batch_scorer)
+    def scorer(
+        reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+        hypothesis_articles: Dict[str, EvaluationArticle],
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> pd.DataFrame:
+        assert reference_articles.keys() == hypothesis_articles.keys()
+
+        identifiers: List[str] = list(reference_articles)
+        references: ArticleBatch
+        if isinstance(reference_articles, ReferenceIndex):
+            references = ArticleBatch.from_bodies(
+                identifiers, (reference.body for reference in reference_articles.values())
+            )
+        else:
+            references = ArticleBatch.from_articles(reference_articles)
+        hypotheses: ArticleBatch = ArticleBatch.from_bodies(
+            identifiers, (hypothesis_articles[identifier]["body"] for identifier in identifiers)
+        )
+
+        scores: BatchScores = batch_scorer(references, hypotheses, max_optional_paragraphs)
+        return pd.DataFrame(scores, index=pd.Index(identifiers, name="article"))
+
+    return scorer
+
+
+def to_batch_scorer(scorer: Scorer) -> BatchScorer:
+    """Adapts a scorer to the `BatchScorer` protocol. The returned batch scorer keeps the scorer's name."""
+
+    @functools.wraps(scorer)
+    def batch_scorer(
+        references: ArticleBatch,
+        hypotheses: ArticleBatch,
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> BatchScores:
+        hypotheses = hypotheses.align(list(references.identifiers))
+        scores: pd.DataFrame = scorer(references.to_articles(), hypotheses.to_articles(), max_optional_paragraphs)
+        return {str(column): scores[column].to_numpy(dtype=np.float64) for column in scores.columns}
+
+    return batch_scorer
+
+
 @dataclasses.dataclass
 class ConfusionMatrix:
     true_positives: int = 0
@@ -45,9 +164,10 @@ class ConfusionMatrix:
 
     @classmethod
     def from_evaluation(cls, reference: Iterable[T], hypothesis: Iterable[T]) -> "ConfusionMatrix":
-        reference_counter: Counter[T] = collections.Counter(reference)
-        hypothesis_counter: Counter[T] = collections.Counter(hypothesis)
+        return cls.from_counters(collections.Counter(reference), collections.Counter(hypothesis))
 
+    @classmethod
+    def from_counters(cls, reference_counter: Counter[T], hypothesis_counter: Counter[T]) -> "ConfusionMatrix":
         confusion_matrix: ConfusionMatrix = ConfusionMatrix()
         for key in reference_counter.keys() | hypothesis_counter.keys():
             reference_count: int = reference_counter.get(key, 0)
@@ -80,20 +200,106 @@ class ConfusionMatrix:
             return float("NaN")
 
 
+def _preload_wer() -> None:
+    import jiwer
+
+
+def _download_punkt() -> None:
+    import nltk
+
+    # Download tokenizer required for ROUGE-LSum
+    try:
+        nltk.data.find("tokenizers/punkt")
+    except LookupError:
+        nltk.download("punkt")
+
+
+def _preload_rouge_lsum() -> None:
+    import nltk
+    from rouge_score import rouge_scorer
+
+    _download_punkt()
+    nltk.sent_tokenize("Loads the punkt tokenizer.")
+
+
+def _preload_token_f1() -> None:
+    from scipy import sparse
+
+
+def _score_compact_paragraph_match(
+    references: CompactArticles, hypotheses: CompactArticles, max_optional_paragraphs: Optional[int] = None
+) -> pd.DataFrame:
+    # The arrays are converted to lists at once, which is faster than slicing and converting them per article
+    reference_ids: List[int] = references.paragraph_ids.tolist()
+    reference_optional: List[bool] = references.optional.tolist()
+    reference_offsets: List[int] = references.offsets.tolist()
+    # Marked hypothesis paragraphs keep their brackets when compared as text and never match a reference paragraph
+    hypothesis_keys: List[int] = np.where(
+        hypotheses.optional, -1 - hypotheses.paragraph_ids.astype(np.int64), hypotheses.paragraph_ids
+    ).tolist()
+    hypothesis_offsets: List[int] = hypotheses.offsets.tolist()
+
+    paragraph_scores: Dict[str, List[float]] = {"precision": [], "recall": [], "f1_score": []}
+    for position, article_identifier in enumerate(references):
+        start, end = reference_offsets[position], reference_offsets[position + 1]
+        body_ids: List[int] = reference_ids[start:end]
+        reference_counter: Counter[int] = collections.Counter(body_ids)
+        hypothesis_position: int = hypotheses.get_position(article_identifier)
+        hypothesis_counter: Counter[int] = collections.Counter(
+            hypothesis_keys[hypothesis_offsets[hypothesis_position] : hypothesis_offsets[hypothesis_position + 1]]
+        )
+
+        optional_indices: Tuple[int, ...] = tuple(
+            index for index, is_optional in enumerate(reference_optional[start:end]) if is_optional
+        )
+        confusion_matrix_candidates: Iterable[ConfusionMatrix] = (
+            ConfusionMatrix.from_counters(
+                (
+                    reference_counter - collections.Counter(body_ids[index] for index in removed_indices)
+                    if removed_indices
+                    else reference_counter
+                ),
+                hypothesis_counter,
+            )
+            for removed_indices in get_removed_optional_indices(optional_indices, max_optional_paragraphs)
+        )
+        best_confusion_matrix: ConfusionMatrix = max(confusion_matrix_candidates, key=lambda matrix: matrix.f1_score())
+
+        paragraph_scores["precision"].append(best_confusion_matrix.precision())
+        paragraph_scores["recall"].append(best_confusion_matrix.recall())
+        paragraph_scores["f1_score"].append(best_confusion_matrix.f1_score())
+
+    return pd.DataFrame(paragraph_scores, index=pd.Index(references, name="article"))
+
+
+@with_version("1")
 def score_paragraph_match(
-    reference_articles: Dict[str, EvaluationArticle],
-    hypothesis_articles: Dict[str, EvaluationArticle],
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+    hypothesis_articles: Mapping[str, EvaluationArticle],
     max_optional_paragraphs: Optional[int] = None,
 ) -> pd.DataFrame:
+    """Calculates the precision, recall and F1-score of the exactly matching paragraphs.
+
+    If the reference and hypothesis articles are `corpus.CompactArticles` sharing a paragraph table,
+    the paragraphs are compared by their identifiers instead of their texts.
+    """
     assert reference_articles.keys() == hypothesis_articles.keys()
+    if (
+        isinstance(reference_articles, CompactArticles)
+        and isinstance(hypothesis_articles, CompactArticles)
+        and reference_articles.paragraphs is hypothesis_articles.paragraphs
+    ):
+        return _score_compact_paragraph_match(reference_articles, hypothesis_articles, max_optional_paragraphs)
+
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
 
     paragraph_scores: Dict[str, List[float]] = {"precision": [], "recall": [], "f1_score": []}
-    for reference_article, hypothesis_article in zip(reference_articles.values(), hypothesis_articles.values()):
-        reference_bodies: Iterator[List[str]] = get_reference_bodies(reference_article["body"], max_optional_paragraphs)
-        hypothesis_body: List[str] = hypothesis_article["body"]
+    for article_identifier, reference in references.items():
+        hypothesis_counter: Counter[str] = collections.Counter(hypothesis_articles[article_identifier]["body"])
 
         confusion_matrix_candidates: Iterable[ConfusionMatrix] = (
-            ConfusionMatrix.from_evaluation(reference_body, hypothesis_body) for reference_body in reference_bodies
+            ConfusionMatrix.from_counters(reference_counter, hypothesis_counter)
+            for reference_counter in reference.paragraph_counts
         )
         best_confusion_matrix: ConfusionMatrix = max(confusion_matrix_candidates, key=lambda matrix: matrix.f1_score())
 
@@ -101,66 +307,490 @@ def score_paragraph_match(
         paragraph_scores["recall"].append(best_confusion_matrix.recall())
         paragraph_scores["f1_score"].append(best_confusion_matrix.f1_score())
 
-    return pd.DataFrame(paragraph_scores, index=pd.Index(reference_articles, name="article"))
+    return pd.DataFrame(paragraph_scores, index=pd.Index(references, name="article"))
+
+
+def _match_paragraphs_greedily(
+    candidate_pairs: List[Tuple[int, int]], num_hypothesis_paragraphs: int, removed_paragraphs: AbstractSet[int]
+) -> int:
+    """Matches reference and hypothesis paragraphs one-to-one in the order of the candidate pairs.
+
+    Returns:
+        The number of matched pairs, ignoring the pairs of removed reference paragraphs.
+    """
+    matched_references: Set[int] = set()
+    matched_hypotheses: List[bool] = [False] * num_hypothesis_paragraphs
+    for reference_index, hypothesis_index in candidate_pairs:
+        if (
+            reference_index in removed_paragraphs
+            or reference_index in matched_references
+            or matched_hypotheses[hypothesis_index]
+        ):
+            continue
+        matched_references.add(reference_index)
+        matched_hypotheses[hypothesis_index] = True
+    return len(matched_references)
+
+
+@with_version("1")
+def score_fuzzy_paragraph_match(
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int] = None,
+) -> pd.DataFrame:
+    """Calculates the paragraph match precision, recall and F1-score, tolerating small differences of paragraphs.
+
+    In contrast to `score_paragraph_match`, a hypothesis paragraph also matches a reference paragraph if the
+    Jaccard similarity of their word bigrams is at least `FUZZY_PARAGRAPH_MATCH_THRESHOLD`, e.g. if a quote character
+    changed or an "Advertisement" label was appended. The candidate pairs are retrieved from an LSH index of the
+    reference paragraphs' MinHash signatures (see `minhash`), such that the scorer stays near-linear in the number
+    of paragraphs. The candidates are verified with their exact Jaccard similarity and matched one-to-one greedily
+    in descending order of similarity, preferring identical paragraphs. Thus, all matches of `score_paragraph_match`
+    are kept.
+    """
+    assert reference_articles.keys() == hypothesis_articles.keys()
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
+    bands, rows = get_band_parameters(FUZZY_PARAGRAPH_MATCH_THRESHOLD)
+
+    paragraph_scores: Dict[str, List[float]] = {"precision": [], "recall": [], "f1_score": []}
+    for article_identifier, reference in references.items():
+        reference_paragraphs: List[str] = prepare_body(reference.body)
+        hypothesis_paragraphs: List[str] = hypothesis_articles[article_identifier]["body"]
+        hypothesis_shingles: List[FrozenSet[int]] = [shingle(paragraph) for paragraph in hypothesis_paragraphs]
+
+        reference_positions: Dict[str, List[int]] = collections.defaultdict(list)
+        for reference_index, paragraph in enumerate(reference_paragraphs):
+            reference_positions[paragraph].append(reference_index)
+        index: LSHIndex = LSHIndex(reference.paragraph_signatures, bands, rows)
+
+        # Candidate pairs as (similarity, is not identical, reference index, hypothesis index)
+        scored_pairs: List[Tuple[float, bool, int, int]] = []
+        for hypothesis_index, (paragraph, signature) in enumerate(
+            zip(hypothesis_paragraphs, compute_signatures(hypothesis_shingles))
+        ):
+            identical: List[int] = reference_positions.get(paragraph, [])
+            scored_pairs.extend((1.0, False, reference_index, hypothesis_index) for reference_index in identical)
+            for reference_index in index.query(signature).difference(identical):
+                similarity: float = jaccard_similarity(
+                    reference.paragraph_shingles[reference_index], hypothesis_shingles[hypothesis_index]
+                )
+                if similarity >= FUZZY_PARAGRAPH_MATCH_THRESHOLD:
+                    scored_pairs.append((similarity, True, reference_index, hypothesis_index))
+
+        scored_pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2], pair[3]))
+        candidate_pairs: List[Tuple[int, int]] = [(pair[2], pair[3]) for pair in scored_pairs]
+
+        confusion_matrix_candidates: List[ConfusionMatrix] = []
+        for removed_paragraphs in reference.removed_paragraphs:
+            true_positives: int = _match_paragraphs_greedily(
+                candidate_pairs, len(hypothesis_paragraphs), removed_paragraphs
+            )
+            confusion_matrix_candidates.append(
+                ConfusionMatrix(
+                    true_positives=true_positives,
+                    false_positives=len(hypothesis_paragraphs) - true_positives,
+                    false_negatives=len(reference_paragraphs) - len(removed_paragraphs) - true_positives,
+                )
+            )
+        best_confusion_matrix: ConfusionMatrix = max(confusion_matrix_candidates, key=lambda matrix: matrix.f1_score())
+
+        paragraph_scores["precision"].append(best_confusion_matrix.precision())
+        paragraph_scores["recall"].append(best_confusion_matrix.recall())
+        paragraph_scores["f1_score"].append(best_confusion_matrix.f1_score())
+
+    return pd.DataFrame(paragraph_scores, index=pd.Index(references, name="article"))
 
 
+@with_version("1")
+@with_preload(_preload_wer)
 def score_wer(
-    reference_articles: Dict[str, EvaluationArticle],
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
     hypothesis_articles: Dict[str, EvaluationArticle],
     max_optional_paragraphs: Optional[int] = None,
 ) -> pd.DataFrame:
     import jiwer
 
     assert reference_articles.keys() == hypothesis_articles.keys()
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
 
     word_error_rates: List[float] = []
-    for reference_article, hypothesis_article in zip(reference_articles.values(), hypothesis_articles.values()):
-        reference_bodies: List[str] = [
-            "\n\n".join(body) for body in get_reference_bodies(reference_article["body"], max_optional_paragraphs)
-        ]
-        hypothesis_body: str = "\n\n".join(hypothesis_article["body"])
+    for article_identifier, reference in references.items():
+        hypothesis_body: str = "\n\n".join(hypothesis_articles[article_identifier]["body"])
 
         candidate_word_error_rates: Iterator[float] = (
-            jiwer.wer(reference_body, hypothesis_body) for reference_body in reference_bodies
+            jiwer.wer(reference_body, hypothesis_body) for reference_body in reference.texts
         )
         word_error_rates.append(min(candidate_word_error_rates))
 
-    return pd.DataFrame({"wer": word_error_rates}, index=pd.Index(reference_articles, name="article"))
+    return pd.DataFrame({"wer": word_error_rates}, index=pd.Index(references, name="article"))
 
 
+@with_version("1")
+@with_preload(_preload_rouge_lsum)
 def score_rouge_lsum(
-    reference_articles: Dict[str, EvaluationArticle],
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
     hypothesis_articles: Dict[str, EvaluationArticle],
     max_optional_paragraphs: Optional[int] = None,
 ) -> pd.DataFrame:
     import nltk
-    from rouge_score import rouge_scorer
-    from rouge_score.scoring import Score
+    from rouge_score.tokenizers import DefaultTokenizer
 
     assert reference_articles.keys() == hypothesis_articles.keys()
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
 
-    # Download tokenizer required for ROUGE-LSum
-    try:
-        nltk.data.find("tokenizers/punkt")
-    except LookupError:
-        nltk.download("punkt")
+    _download_punkt()
+
+    # Equivalent to rouge_scorer.RougeScorer(["rougeLsum"], use_stemmer=False, split_summaries=True),
+    # but reuses the prepared reference sentence tokens for all hypotheses.
+    tokenizer: DefaultTokenizer = DefaultTokenizer(use_stemmer=False)
+
+    rouge_scores: Dict[str, List[float]] = {"precision": [], "recall": [], "f1_score": []}
+    for article_identifier, reference in references.items():
+        hypothesis_body: str = "\n\n".join(hypothesis_articles[article_identifier]["body"])
+        hypothesis_sentence_tokens: List[List[str]] = [
+            tokenizer.tokenize(sentence) for sentence in nltk.sent_tokenize(hypothesis_body) if sentence
+        ]
+
+        candidate_scores: Iterator[Tuple[float, float, float]] = (
+            _get_summary_level_lcs(reference_sentence_tokens, hypothesis_sentence_tokens, skip_unshared_tokens=False)
+            for reference_sentence_tokens in reference.sentence_tokens
+        )
+        precision, recall, f1_score = max(candidate_scores, key=lambda score: score[2])
+
+        rouge_scores["precision"].append(precision)
+        rouge_scores["recall"].append(recall)
+        rouge_scores["f1_score"].append(f1_score)
+
+    return pd.DataFrame(rouge_scores, index=pd.Index(references, name="article"))
+
+
+def split_sentences_fast(text: str) -> List[str]:
+    """Splits the text into sentences with a regular expression approximating NLTK's punkt sentence tokenizer."""
+    return [sentence for sentence in _SENTENCE_BOUNDARY.split(text) if sentence]
 
-    rouge: rouge_scorer.RougeScorer = rouge_scorer.RougeScorer(["rougeLsum"], use_stemmer=False, split_summaries=True)
 
+def _get_fast_reference_bodies(body: List[str], max_optional_paragraphs: Optional[int]) -> Iterator[List[str]]:
+    return get_reference_bodies(
+        body,
+        (
+            FAST_MAX_OPTIONAL_PARAGRAPHS
+            if max_optional_paragraphs is None
+            else min(max_optional_paragraphs, FAST_MAX_OPTIONAL_PARAGRAPHS)
+        ),
+    )
+
+
+def _tokenize_rouge_ids(text: str, vocabulary: Dict[str, int]) -> List[int]:
+    """Tokenizes the text like the ROUGE tokenizer without stemming and maps the tokens to identifiers."""
+    return [
+        vocabulary.setdefault(token, len(vocabulary))
+        for token in _ROUGE_NON_ALPHANUMERIC.sub(" ", text.lower()).split()
+    ]
+
+
+def _get_lcs_indices(reference: List[T], hypothesis: List[T], skip_unshared_tokens: bool = True) -> List[int]:
+    """Returns the reference indices of a longest common subsequence of the tokens.
+
+    With `skip_unshared_tokens`, tokens missing from the other sequence are skipped, since they cannot be part of a
+    common subsequence, such that the dynamic program only spans the shared tokens. Ties between longest common
+    subsequences are then broken on the reduced sequences. Otherwise, the indices equal those of `rouge_score`.
+    """
+    reference_positions: List[int]
+    reduced_reference: List[T]
+    reduced_hypothesis: List[T]
+    if skip_unshared_tokens:
+        hypothesis_tokens: Set[T] = set(hypothesis)
+        reference_positions = [index for index, token in enumerate(reference) if token in hypothesis_tokens]
+        if not reference_positions:
+            return []
+
+        reduced_reference = [reference[index] for index in reference_positions]
+        reference_tokens: Set[T] = set(reduced_reference)
+        reduced_hypothesis = [token for token in hypothesis if token in reference_tokens]
+    else:
+        reference_positions = list(range(len(reference)))
+        reduced_reference, reduced_hypothesis = reference, hypothesis
+
+    table: List[List[int]] = [[0] * (len(reduced_hypothesis) + 1) for _ in range(len(reduced_reference) + 1)]
+    for i, reference_token in enumerate(reduced_reference, start=1):
+        previous_row: List[int] = table[i - 1]
+        row: List[int] = table[i]
+        for j, hypothesis_token in enumerate(reduced_hypothesis, start=1):
+            if reference_token == hypothesis_token:
+                row[j] = previous_row[j - 1] + 1
+            else:
+                row[j] = previous_row[j] if previous_row[j] >= row[j - 1] else row[j - 1]
+
+    lcs_indices: List[int] = []
+    i, j = len(reduced_reference), len(reduced_hypothesis)
+    while i > 0 and j > 0:
+        if reduced_reference[i - 1] == reduced_hypothesis[j - 1]:
+            lcs_indices.append(reference_positions[i - 1])
+            i -= 1
+            j -= 1
+        elif table[i][j - 1] > table[i - 1][j]:
+            j -= 1
+        else:
+            i -= 1
+    lcs_indices.reverse()
+    return lcs_indices
+
+
+def _get_summary_level_lcs(
+    reference_sentences: List[List[T]], hypothesis_sentences: List[List[T]], skip_unshared_tokens: bool = True
+) -> Tuple[float, float, float]:
+    """Calculates the summary-level LCS precision, recall and F1-score like `rouge_score`'s ROUGE-LSum.
+
+    Without `skip_unshared_tokens`, the scores equal `rouge_score`'s (see `_get_lcs_indices`).
+    """
+    num_reference_tokens: int = sum(map(len, reference_sentences))
+    num_hypothesis_tokens: int = sum(map(len, hypothesis_sentences))
+    if not num_reference_tokens or not num_hypothesis_tokens:
+        return 0.0, 0.0, 0.0
+
+    reference_counts: Counter[T] = collections.Counter(itertools.chain.from_iterable(reference_sentences))
+    hypothesis_counts: Counter[T] = collections.Counter(itertools.chain.from_iterable(hypothesis_sentences))
+
+    hits: int = 0
+    for reference_sentence in reference_sentences:
+        union: Set[int] = set()
+        for hypothesis_sentence in hypothesis_sentences:
+            union.update(_get_lcs_indices(reference_sentence, hypothesis_sentence, skip_unshared_tokens))
+        # Tokens are counted at most as often as they occur in the reference and hypothesis
+        for index in sorted(union):
+            token: T = reference_sentence[index]
+            if hypothesis_counts[token] > 0 and reference_counts[token] > 0:
+                hits += 1
+                hypothesis_counts[token] -= 1
+                reference_counts[token] -= 1
+
+    precision: float = hits / num_hypothesis_tokens
+    recall: float = hits / num_reference_tokens
+    return precision, recall, 2 * precision * recall / (precision + recall) if precision + recall > 0 else 0.0
+
+
+@with_version("1")
+def score_fast_rouge_lsum(
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int] = None,
+) -> pd.DataFrame:
+    """Approximates `score_rouge_lsum` in a fraction of its run time, e.g. for quick checks of scraper changes.
+
+    The sentences are split with a regular expression instead of punkt (see `split_sentences_fast`),
+    the tokens are compared by their identifiers, and at most `FAST_MAX_OPTIONAL_PARAGRAPHS` optional paragraphs
+    are enumerated as candidate reference bodies.
+    """
+    assert reference_articles.keys() == hypothesis_articles.keys()
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
+
+    vocabulary: Dict[str, int] = {}
     rouge_scores: Dict[str, List[float]] = {"precision": [], "recall": [], "f1_score": []}
-    for reference_article, hypothesis_article in zip(reference_articles.values(), hypothesis_articles.values()):
-        reference_bodies: List[str] = [
-            "\n\n".join(body) for body in get_reference_bodies(reference_article["body"], max_optional_paragraphs)
+    for article_identifier, reference in references.items():
+        hypothesis_sentences: List[List[int]] = [
+            _tokenize_rouge_ids(sentence, vocabulary)
+            for sentence in split_sentences_fast("\n\n".join(hypothesis_articles[article_identifier]["body"]))
         ]
-        hypothesis_body: str = "\n\n".join(hypothesis_article["body"])
 
-        candidate_scores: Iterator[Score] = (
-            rouge.score(reference_body, hypothesis_body)["rougeLsum"] for reference_body in reference_bodies
+        candidate_scores: Iterator[Tuple[float, float, float]] = (
+            _get_summary_level_lcs(
+                [_tokenize_rouge_ids(sentence, vocabulary) for sentence in split_sentences_fast("\n\n".join(body))],
+                hypothesis_sentences,
+            )
+            for body in _get_fast_reference_bodies(reference.body, max_optional_paragraphs)
+        )
+        precision, recall, f1_score = max(candidate_scores, key=lambda score: score[2])
+
+        rouge_scores["precision"].append(precision)
+        rouge_scores["recall"].append(recall)
+        rouge_scores["f1_score"].append(f1_score)
+
+    return pd.DataFrame(rouge_scores, index=pd.Index(references, name="article"))
+
+
+def _tokenize_wer_ids(text: str, vocabulary: Dict[str, int]) -> List[int]:
+    """Tokenizes the text like jiwer's default transformation and maps the words to identifiers."""
+    return [
+        vocabulary.setdefault(word, len(vocabulary))
+        for word in _WER_MULTIPLE_SPACES.sub(" ", text).strip().split(" ")
+        if word
+    ]
+
+
+@with_version("1")
+def score_fast_wer(
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int] = None,
+) -> pd.DataFrame:
+    """Approximates `score_wer` in a fraction of its run time, e.g. for quick checks of scraper changes.
+
+    The word error rate is the edit distance of the word identifiers without computing the alignment,
+    and at most `FAST_MAX_OPTIONAL_PARAGRAPHS` optional paragraphs are enumerated as candidate reference bodies.
+    """
+    from rapidfuzz.distance import Levenshtein
+
+    assert reference_articles.keys() == hypothesis_articles.keys()
+    references: ReferenceIndex = ReferenceIndex.ensure(reference_articles, max_optional_paragraphs)
+
+    vocabulary: Dict[str, int] = {}
+    word_error_rates: List[float] = []
+    for article_identifier, reference in references.items():
+        hypothesis_words: List[int] = _tokenize_wer_ids(
+            "\n\n".join(hypothesis_articles[article_identifier]["body"]), vocabulary
+        )
+
+        candidate_word_error_rates: List[float] = []
+        for body in _get_fast_reference_bodies(reference.body, max_optional_paragraphs):
+            reference_words: List[int] = _tokenize_wer_ids("\n\n".join(body), vocabulary)
+            candidate_word_error_rates.append(
+                Levenshtein.distance(reference_words, hypothesis_words) / len(reference_words)
+                if reference_words
+                else float("NaN")
+            )
+        word_error_rates.append(min(candidate_word_error_rates))
+
+    return pd.DataFrame({"wer": word_error_rates}, index=pd.Index(references, name="article"))
+
+
+# The approximate variants of the registered scorers for fast scoring by the exact scorers' identifiers
+_FAST_SCORERS: Final[Dict[str, Scorer]] = {"rouge_lsum": score_fast_rouge_lsum, "wer": score_fast_wer}
+
+
+def get_fast_scorer(scorer_identifier: str) -> Optional[Scorer]:
+    """Returns the approximate variant of a registered scorer or None if the scorer is exact and fast already."""
+    return _FAST_SCORERS.get(scorer_identifier)
+
+
+def _build_token_count_matrix(
+    paragraphs: Iterable[str], vocabulary: Dict[str, int]
+) -> Tuple[npt.NDArray[np.int64], npt.NDArray[np.int64]]:
+    """Tokenizes the paragraphs and maps their tokens to the shared vocabulary, extending it by unseen tokens.
+
+    Returns:
+        The CSR index pointer and column indices of the paragraph-by-token count matrix.
+    """
+    indptr: List[int] = [0]
+    indices: List[int] = []
+    for paragraph in paragraphs:
+        indices.extend(vocabulary.setdefault(token, len(vocabulary)) for token in tokenize_words(paragraph))
+        indptr.append(len(indices))
+    return np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64)
+
+
+def _build_segment_matrix(offsets: npt.NDArray[np.int64]) -> "sparse.csr_matrix":
+    """Builds the article-by-paragraph matrix that sums the paragraph rows of each article."""
+    from scipy import sparse
+
+    num_paragraphs: int = int(offsets[-1])
+    return sparse.csr_matrix(
+        (np.ones(num_paragraphs, dtype=np.int64), np.arange(num_paragraphs), offsets),
+        shape=(len(offsets) - 1, num_paragraphs),
+    )
+
+
+def batch_score_token_f1(
+    references: ArticleBatch,
+    hypotheses: ArticleBatch,
+    max_optional_paragraphs: Optional[int] = None,
+) -> BatchScores:
+    """Calculates the multiset word token precision, recall and F1-score for all articles at once.
+
+    The tokens of all articles are mapped to a shared vocabulary to build sparse token count matrices.
+    The count matrix of each candidate reference body (see `utils.get_reference_bodies`) is derived from the full
+    reference counts by subtracting the counts of its removed optional paragraphs. The true positives are the sum of
+    the elementwise minimum of the candidate and hypothesis counts. For each article, the candidate with the best
+    F1-score is selected.
+    """
+    from scipy import sparse
+
+    hypotheses = hypotheses.align(list(references.identifiers))
+
+    vocabulary: Dict[str, int] = {}
+    reference_indptr, reference_indices = _build_token_count_matrix(references.paragraphs, vocabulary)
+    hypothesis_indptr, hypothesis_indices = _build_token_count_matrix(hypotheses.paragraphs, vocabulary)
+
+    def to_count_matrix(indptr: npt.NDArray[np.int64], indices: npt.NDArray[np.int64]) -> "sparse.csr_matrix":
+        matrix = sparse.csr_matrix(
+            (np.ones(len(indices), dtype=np.int64), indices, indptr), shape=(len(indptr) - 1, len(vocabulary))
+        )
+        matrix.sum_duplicates()
+        return matrix
+
+    reference_paragraph_counts = to_count_matrix(reference_indptr, reference_indices)
+    reference_counts = _build_segment_matrix(references.offsets) @ reference_paragraph_counts
+    hypothesis_counts = _build_segment_matrix(hypotheses.offsets) @ to_count_matrix(
+        hypothesis_indptr, hypothesis_indices
+    )
+
+    # Enumerate the candidates as (article, removed optional paragraphs) pairs
+    candidate_articles: List[int] = []
+    removal_indptr: List[int] = [0]
+    removal_indices: List[int] = []
+    for article_index in range(len(references)):
+        start: int = int(references.offsets[article_index])
+        optional_paragraph_indices: Tuple[int, ...] = tuple(
+            start + int(index)
+            for index in np.flatnonzero(references.optional[start : references.offsets[article_index + 1]])
         )
-        best_score: Score = max(candidate_scores, key=lambda score: score.fmeasure)
 
-        rouge_scores["precision"].append(best_score.precision)
-        rouge_scores["recall"].append(best_score.recall)
-        rouge_scores["f1_score"].append(best_score.fmeasure)
+        removals: Iterable[Tuple[int, ...]]
+        if max_optional_paragraphs is not None and len(optional_paragraph_indices) > max_optional_paragraphs:
+            removals = [(), optional_paragraph_indices]
+        else:
+            removals = more_itertools.powerset(optional_paragraph_indices)
+
+        for removal in removals:
+            candidate_articles.append(article_index)
+            removal_indices.extend(removal)
+            removal_indptr.append(len(removal_indices))
+
+    num_candidates: int = len(candidate_articles)
+    candidate_article_indices: npt.NDArray[np.int64] = np.array(candidate_articles, dtype=np.int64)
+    candidate_selection = sparse.csr_matrix(
+        (np.ones(num_candidates, dtype=np.int64), candidate_article_indices, np.arange(num_candidates + 1)),
+        shape=(num_candidates, len(references)),
+    )
+    removal_selection = sparse.csr_matrix(
+        (np.ones(len(removal_indices), dtype=np.int64), removal_indices, removal_indptr),
+        shape=(num_candidates, len(references.paragraphs)),
+    )
+
+    candidate_counts = candidate_selection @ reference_counts - removal_selection @ reference_paragraph_counts
+    candidate_hypothesis_counts = candidate_selection @ hypothesis_counts
+
+    true_positives = np.asarray(candidate_counts.minimum(candidate_hypothesis_counts).sum(axis=1)).ravel()
+    reference_lengths = np.asarray(candidate_counts.sum(axis=1)).ravel()
+    hypothesis_lengths = np.asarray(candidate_hypothesis_counts.sum(axis=1)).ravel()
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        precision: npt.NDArray[np.float64] = np.where(
+            hypothesis_lengths > 0, true_positives / hypothesis_lengths, np.nan
+        )
+        recall: npt.NDArray[np.float64] = np.where(reference_lengths > 0, true_positives / reference_lengths, np.nan)
+        f1_score: npt.NDArray[np.float64] = np.where(
+            precision + recall > 0, 2 * precision * recall / (precision + recall), np.nan
+        )
+
+    # Select the first candidate with the best F1-score per article
+    order: npt.NDArray[np.int64] = np.lexsort(
+        (np.arange(num_candidates), -np.nan_to_num(f1_score, nan=-np.inf), candidate_article_indices)
+    )
+    _, first_positions = np.unique(candidate_article_indices[order], return_index=True)
+    best: npt.NDArray[np.int64] = order[first_positions]
+
+    return {"precision": precision[best], "recall": recall[best], "f1_score": f1_score[best]}
+
 
-    return pd.DataFrame(rouge_scores, index=pd.Index(reference_articles, name="article"))
+_token_f1_scorer: Scorer = to_scorer(batch_score_token_f1)
+
+
+@with_version("1")
+@with_preload(_preload_token_f1)
+def score_token_f1(
+    reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int] = None,
+) -> pd.DataFrame:
+    """Calculates the multiset word token precision, recall and F1-score (see `batch_score_token_f1`)."""
+    return _token_f1_scorer(reference_articles, hypothesis_articles, max_optional_paragraphs)
@@ -1,24 +1,50 @@
 import functools
 from datetime import datetime
-from typing import Any, Dict, Iterator, List, Protocol, runtime_checkable
-
-from fundus_evaluation.utils import normalize_whitespaces
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterator,
+    List,
+    Protocol,
+    TypeVar,
+    Union,
+    cast,
+    runtime_checkable,
+)
+
+from fundus_evaluation.utils import (
+    detect_html_encoding,
+    normalize_whitespaces,
+    with_bytes_input,
+    with_memory_footprint,
+    with_preload,
+    with_version,
+)
+
+S = TypeVar("S", bound=Callable[..., List[str]])
 
 
 @runtime_checkable
 class Scraper(Protocol):
-    """Protocol for scraping functions. The function name should have the prefix 'scrape_'."""
+    """Protocol for scraping functions. The function name should have the prefix 'scrape_'.
+
+    The HTML is passed as text. Scrapers declared with `utils.with_bytes_input` may also be passed
+    the raw bytes of the page, which spares decoding pages that the extractor parses from bytes anyway.
+    """
 
     __name__: str
 
-    def __call__(self, *, url: str, html: str, publisher_identifier: str, crawl_date: datetime) -> List[str]: ...
+    def __call__(
+        self, *, url: str, html: Union[str, bytes], publisher_identifier: str, crawl_date: datetime
+    ) -> List[str]: ...
 
 
-def normalize(scraper: Scraper) -> Scraper:
+def normalize(scraper: S) -> S:
     """Decorator to normalize whitespaces and remove empty paragraphs for a Scraper callable."""
 
     @functools.wraps(scraper)
-    def wrapper(*, url: str, html: str, publisher_identifier: str, crawl_date: datetime) -> List[str]:
+    def wrapper(*, url: str, html: Any, publisher_identifier: str, crawl_date: datetime) -> List[str]:
         whitespace_normalized_paragraphs: Iterator[str] = (
             normalize_whitespaces(paragraph)
             for paragraph in scraper(
@@ -27,9 +53,41 @@ def normalize(scraper: Scraper) -> Scraper:
         )
         return [paragraph for paragraph in whitespace_normalized_paragraphs if paragraph]
 
-    return wrapper
+    return cast(S, wrapper)
+
+
+def _preload_boilernet() -> None:
+    from fundus_evaluation.scrapers import boilernet
+
+    boilernet.load_model()
+
+
+def _preload_boilerpipe() -> None:
+    import boilerpipe.extract  # Starts the JVM
+
+
+def _preload_fundus() -> None:
+    from fundus import PublisherCollection
+
+
+def _preload_justext() -> None:
+    import justext
+
+    justext.get_stoplist("English")
+
+
+def _preload_newsplease() -> None:
+    import newsplease
+
+
+def _preload_trafilatura() -> None:
+    import trafilatura
 
 
+@with_version("1")
+@with_memory_footprint(2048)
+# TensorFlow's thread pools do not survive a fork
+@with_preload(_preload_boilernet, fork_safe=False)
 @normalize
 def scrape_boilernet(*, html: str, **_: Any) -> List[str]:
     from fundus_evaluation.scrapers import boilernet
@@ -38,6 +96,10 @@ def scrape_boilernet(*, html: str, **_: Any) -> List[str]:
     return body.split("\n")
 
 
+@with_version("1")
+@with_memory_footprint(1024)
+# The JVM does not survive a fork
+@with_preload(_preload_boilerpipe, fork_safe=False)
 @normalize
 def scrape_boilerpipe(*, html: str, **_: Any) -> List[str]:
     import boilerpipe.extract as boilerpipe
@@ -47,6 +109,8 @@ def scrape_boilerpipe(*, html: str, **_: Any) -> List[str]:
     return body.split("\n")
 
 
+@with_version("1")
+@with_preload(_preload_fundus)
 @normalize
 def scrape_fundus(*, html: str, publisher_identifier: str, crawl_date: datetime, **_: Any) -> List[str]:
     from fundus import PublisherCollection
@@ -57,8 +121,12 @@ def scrape_fundus(*, html: str, publisher_identifier: str, crawl_date: datetime,
     return list(parsed_data["body"].as_text_sequence())
 
 
+@with_version("2")
+@with_preload(_preload_justext)
+# justext parses the page from bytes and would otherwise encode the text again
+@with_bytes_input
 @normalize
-def scrape_justext(*, html: str, **_: Any) -> List[str]:
+def scrape_justext(*, html: Union[str, bytes], **_: Any) -> List[str]:
     import justext
 
     # We use the same parameters as in the web-content-extraction-benchmark repository,
@@ -74,12 +142,16 @@ def scrape_justext(*, html: str, **_: Any) -> List[str]:
         max_link_density=0.2,
         max_heading_distance=200,
         no_headings=False,
-        encoding="utf-8",
+        # Decodes bytes like `decode_html` does for the other scrapers, replacing undecodable bytes
+        encoding=detect_html_encoding(html) if isinstance(html, bytes) else None,
     )
 
     return [paragraph.text for paragraph in justext_paragraphs if not paragraph.is_boilerplate]
 
 
+@with_version("1")
+@with_memory_footprint(512)
+@with_preload(_preload_newsplease)
 @normalize
 def scrape_newsplease(*, url: str, html: str, **_: Any) -> List[str]:
     import newsplease
@@ -88,6 +160,8 @@ def scrape_newsplease(*, url: str, html: str, **_: Any) -> List[str]:
     return body.split("\n")
 
 
+@with_version("1")
+@with_preload(_preload_trafilatura)
 @normalize
 def scrape_trafilatura(*, html: str, **_: Any) -> List[str]:
     import trafilatura
@@ -96,6 +170,7 @@ def scrape_trafilatura(*, html: str, **_: Any) -> List[str]:
     return body.split("\n")
 
 
+@with_version("1")
 @normalize
 def scrape_bte(*, html: str, **_: Any) -> List[str]:
     from fundus_evaluation.scrapers import bte
@@ -0,0 +1,334 @@
+import concurrent.futures
+import json
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Collection, Dict, List, Mapping, Optional, Union
+
+import fundus_evaluation
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.utils import EvaluationArticle, decode_html, preload
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+DEFAULT_HOST: str = "127.0.0.1"
+DEFAULT_PORT: int = 8765
+
+# The reference indices loaded by this process by the fingerprint of their ground truth
+_references: Dict[str, ReferenceIndex] = {}
+
+
+def warm_up(scrapers: Collection[str], scorers: Collection[str], fork_safe_only: bool = False) -> None:
+    """Imports the dependencies and loads the models of the given scrapers and scorers.
+
+    With `fork_safe_only`, only the scrapers and scorers whose loaded state survives a fork are loaded,
+    e.g. before forking worker processes.
+    """
+    for scraper_identifier in scrapers:
+        preload(fundus_evaluation.SCRAPERS[scraper_identifier], fork_safe_only=fork_safe_only)
+    for scorer_identifier in scorers:
+        preload(fundus_evaluation.SCORERS[scorer_identifier], fork_safe_only=fork_safe_only)
+
+
+def handle_scrape(payload: Dict[str, Any]) -> Dict[str, Any]:
+    body: List[str] = fundus_evaluation.SCRAPERS[payload["scraper"]](
+        url=payload["url"],
+        html=payload["html"],
+        publisher_identifier=payload["publisher_identifier"],
+        crawl_date=datetime.fromisoformat(payload["crawl_date"]),
+    )
+    return {"body": body}
+
+
+def _get_references(payload: Dict[str, Any]) -> Union[Dict[str, EvaluationArticle], ReferenceIndex]:
+    """Returns the sent reference articles or the prepared references of the hypothesis articles.
+
+    The reference index of a ground truth file is created from the JSON file once per process and reused by all
+    requests with the same fingerprint. Persisted indices are not loaded, since the path is sent by the client.
+    The path is checked against the service's ground truth files before.
+
+    Raises:
+        ValueError: If the ground truth file of the service differs from the client's.
+    """
+    if "reference_articles" in payload:
+        references: Dict[str, EvaluationArticle] = payload["reference_articles"]
+        return references
+
+    fingerprint: str = payload["fingerprint"]
+    index: Optional[ReferenceIndex] = _references.get(fingerprint)
+    if index is None:
+        index = ReferenceIndex.load_or_create(
+            payload["ground_truth_path"], payload.get("max_optional_paragraphs"), persist=False
+        )
+        if index.fingerprint != fingerprint:
+            raise ValueError(f"The ground truth {payload['ground_truth_path']!r} differs from the client's")
+        _references[fingerprint] = index
+    return index.subset(payload["hypothesis_articles"])
+
+
+def handle_score(payload: Dict[str, Any]) -> Dict[str, Any]:
+    scores: "pd.DataFrame" = fundus_evaluation.SCORERS[payload["scorer"]](
+        _get_references(payload), payload["hypothesis_articles"], payload.get("max_optional_paragraphs")
+    )
+    return {"scores": scores.to_dict(orient="index")}
+
+
+_HANDLERS = {"/scrape": handle_scrape, "/score": handle_score}
+
+
+class EvaluationService(ThreadingHTTPServer):
+    """Local HTTP server dispatching scrape and score requests to a pool of warm workers.
+
+    With `num_workers=0`, the requests are handled by the server process itself.
+    Otherwise, each worker process loads the scrapers and scorers once on startup.
+
+    The service accepts the following JSON requests:
+        - POST /scrape: {"scraper", "url", "html", "publisher_identifier", "crawl_date"} -> {"body"}
+        - POST /score: {"scorer", "reference_articles", "hypothesis_articles", "max_optional_paragraphs"} -> {"scores"}
+          Instead of the reference articles, the path and fingerprint of one of the service's ground truth files
+          may be sent as "ground_truth_path" and "fingerprint", such that the service prepares the references once.
+        - GET /health: -> {"scrapers", "scorers", "ground_truth_paths"}
+
+    Args:
+        host: The host to bind the service to.
+        port: The port to bind the service to.
+        scrapers: The scrapers to keep loaded. Per default, all scrapers are loaded.
+        scorers: The scorers to keep loaded. Per default, all scorers are loaded.
+        num_workers: The number of warm worker processes.
+        ground_truth_paths: The ground truth files that clients may refer to by path.
+            Other ground truth files have to be sent by the clients.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        host: str = DEFAULT_HOST,
+        port: int = DEFAULT_PORT,
+        scrapers: Optional[Collection[str]] = None,
+        scorers: Optional[Collection[str]] = None,
+        num_workers: int = 0,
+        ground_truth_paths: Optional[Collection[Union[str, Path]]] = None,
+    ) -> None:
+        self.ground_truth_paths: List[str] = sorted(
+            str(Path(ground_truth_path).resolve()) for ground_truth_path in ground_truth_paths or ()
+        )
+        self.scrapers: List[str] = sorted(fundus_evaluation.SCRAPERS if scrapers is None else scrapers)
+        self.scorers: List[str] = sorted(fundus_evaluation.SCORERS if scorers is None else scorers)
+
+        self.executor: Optional[concurrent.futures.ProcessPoolExecutor] = None
+        if num_workers > 0:
+            self.executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=num_workers, initializer=warm_up, initargs=(self.scrapers, self.scorers)
+            )
+            # Start all workers before accepting requests
+            concurrent.futures.wait([self.executor.submit(int) for _ in range(num_workers)])
+        else:
+            warm_up(self.scrapers, self.scorers)
+
+        super().__init__((host, port), _RequestHandler)
+
+    def dispatch(self, path: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        if self.executor is None:
+            return _HANDLERS[path](payload)
+        return self.executor.submit(_HANDLERS[path], payload).result()
+
+    def server_close(self) -> None:
+        super().server_close()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    server: EvaluationService
+
+    def _send_json(self, status: HTTPStatus, content: Dict[str, Any]) -> None:
+        encoded: bytes = json.dumps(content, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path!r}"})
+            return
+        self._send_json(
+            HTTPStatus.OK,
+            {
+                "scrapers": self.server.scrapers,
+                "scorers": self.server.scorers,
+                "ground_truth_paths": self.server.ground_truth_paths,
+            },
+        )
+
+    def do_POST(self) -> None:
+        if self.path not in _HANDLERS:
+            self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown path {self.path!r}"})
+            return
+
+        try:
+            payload: Dict[str, Any] = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            identifier: str = payload["scraper" if self.path == "/scrape" else "scorer"]
+            if identifier not in (self.server.scrapers if self.path == "/scrape" else self.server.scorers):
+                self._send_json(HTTPStatus.BAD_REQUEST, {"error": f"Unavailable identifier {identifier!r}"})
+                return
+            # Only the configured ground truth files are read, the client must not choose arbitrary files
+            if "ground_truth_path" in payload and payload["ground_truth_path"] not in self.server.ground_truth_paths:
+                self._send_json(
+                    HTTPStatus.BAD_REQUEST, {"error": f"Unavailable ground truth {payload['ground_truth_path']!r}"}
+                )
+                return
+
+            self._send_json(HTTPStatus.OK, self.server.dispatch(self.path, payload))
+        except Exception as exception:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": f"{type(exception).__name__}: {exception}"})
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+
+def serve(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    scrapers: Optional[Collection[str]] = None,
+    scorers: Optional[Collection[str]] = None,
+    num_workers: int = 0,
+    ground_truth_paths: Optional[Collection[Union[str, Path]]] = None,
+) -> None:
+    """Runs the evaluation service until interrupted (see `EvaluationService`)."""
+    with EvaluationService(
+        host,
+        port,
+        scrapers=scrapers,
+        scorers=scorers,
+        num_workers=num_workers,
+        ground_truth_paths=ground_truth_paths,
+    ) as service:
+        print(f"Serving {len(service.scrapers)} scrapers and {len(service.scorers)} scorers on http://{host}:{port}")
+        try:
+            service.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+class ServiceClient:
+    """Client of a running evaluation service providing `Scraper` and `Scorer` callables."""
+
+    def __init__(self, url: str) -> None:
+        self.url = url.rstrip("/")
+
+    def request(self, path: str, payload: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Sends a request to the service.
+
+        Raises:
+            RuntimeError: If the service could not handle the request.
+        """
+        data: Optional[bytes] = None if payload is None else json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        request = urllib.request.Request(
+            f"{self.url}{path}", data=data, headers={"Content-Type": "application/json; charset=utf-8"}
+        )
+        try:
+            with urllib.request.urlopen(request) as response:
+                result: Dict[str, Any] = json.load(response)
+                return result
+        except urllib.error.HTTPError as error:
+            raise RuntimeError(f"Request to {path!r} failed: {json.load(error)['error']}") from error
+
+    def scraper(self, identifier: str) -> "RemoteScraper":
+        return RemoteScraper(self, identifier)
+
+    def scorer(self, identifier: str, ground_truth_path: Union[str, Path, None] = None) -> "RemoteScorer":
+        """Returns a scorer forwarding its calls to the service.
+
+        The ground truth path is only passed on if the service has been started with that ground truth file.
+        """
+        if ground_truth_path is not None:
+            served_paths: List[str] = self.request("/health")["ground_truth_paths"]
+            if str(Path(ground_truth_path).resolve()) not in served_paths:
+                ground_truth_path = None
+        return RemoteScorer(self, identifier, ground_truth_path)
+
+
+class RemoteScraper:
+    """Scraper forwarding its calls to an evaluation service."""
+
+    def __init__(self, client: ServiceClient, identifier: str) -> None:
+        self.client = client
+        self.identifier = identifier
+        self.__name__ = f"scrape_{identifier}"
+
+    def __call__(
+        self, *, url: str, html: Union[str, bytes], publisher_identifier: str, crawl_date: datetime
+    ) -> List[str]:
+        result: Dict[str, Any] = self.client.request(
+            "/scrape",
+            {
+                "scraper": self.identifier,
+                "url": url,
+                "html": html if isinstance(html, str) else decode_html(html),
+                "publisher_identifier": publisher_identifier,
+                "crawl_date": crawl_date.isoformat(),
+            },
+        )
+        body: List[str] = result["body"]
+        return body
+
+
+class RemoteScorer:
+    """Scorer forwarding its calls to an evaluation service.
+
+    If the ground truth path is given and the scorer is called with a `ReferenceIndex` loaded from it,
+    only the fingerprint of the ground truth is sent and the service loads the references itself.
+    Otherwise, the reference articles are sent with each call.
+
+    Args:
+        client: The client of the service.
+        identifier: The scorer's identifier.
+        ground_truth_path: The path to the ground truth file, one of the service's ground truth files.
+    """
+
+    def __init__(
+        self, client: ServiceClient, identifier: str, ground_truth_path: Union[str, Path, None] = None
+    ) -> None:
+        self.client = client
+        self.identifier = identifier
+        self.ground_truth_path = None if ground_truth_path is None else Path(ground_truth_path).resolve()
+        self.__name__ = f"score_{identifier}"
+
+    def __call__(
+        self,
+        reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+        hypothesis_articles: Dict[str, EvaluationArticle],
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> "pd.DataFrame":
+        payload: Dict[str, Any] = {
+            "scorer": self.identifier,
+            "hypothesis_articles": hypothesis_articles,
+            "max_optional_paragraphs": max_optional_paragraphs,
+        }
+        if (
+            self.ground_truth_path is not None
+            and isinstance(reference_articles, ReferenceIndex)
+            and reference_articles.fingerprint is not None
+        ):
+            payload["ground_truth_path"] = str(self.ground_truth_path)
+            payload["fingerprint"] = reference_articles.fingerprint
+        else:
+            payload["reference_articles"] = (
+                {
+                    article_identifier: {"url": "", "body": reference.body, "crawl_date": ""}
+                    for article_identifier, reference in reference_articles.items()
+                }
+                if isinstance(reference_articles, ReferenceIndex)
+                else dict(reference_articles)
+            )
+        result: Dict[str, Any] = self.client.request("/score", payload)
+        import pandas as pd
+
+        return pd.DataFrame.from_dict(result["scores"], orient="index").rename_axis("article")
@@ -0,0 +1,415 @@
+import json
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Final,
+    FrozenSet,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+from fundus_evaluation.utils import EvaluationArticle, load_evaluation_articles
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+ARROW_SUFFIX: Final[str] = ".arrow"
+PARQUET_SUFFIX: Final[str] = ".parquet"
+COLUMNAR_SUFFIXES: Final[Tuple[str, ...]] = (ARROW_SUFFIX, PARQUET_SUFFIX)
+
+ARTICLES_SUFFIXES: Final[Tuple[str, ...]] = (".json", *COLUMNAR_SUFFIXES)
+SCORES_SUFFIXES: Final[Tuple[str, ...]] = (".tsv", *COLUMNAR_SUFFIXES)
+
+# The characters of a JSON number, which may continue a number split across chunks
+_NUMBER_CHARACTERS: Final[FrozenSet[str]] = frozenset("0123456789+-.eE")
+
+
+def is_columnar(path: Union[str, Path]) -> bool:
+    """Returns whether the path refers to a columnar Arrow IPC (`.arrow`) or Parquet (`.parquet`) file."""
+    return Path(path).suffix in COLUMNAR_SUFFIXES
+
+
+def find_articles_files(directory: Union[str, Path]) -> Dict[str, Path]:
+    """Returns the article files of a directory, e.g. the scrapers' extractions, by their stem in sorted order.
+
+    Raises:
+        ValueError: If multiple files share a stem, e.g. `bte.json` and its conversion `bte.parquet`.
+    """
+    stem_to_paths: Dict[str, List[Path]] = {}
+    for path in sorted(Path(directory).iterdir()):
+        if path.suffix in ARTICLES_SUFFIXES:
+            stem_to_paths.setdefault(path.stem, []).append(path)
+
+    duplicates: List[str] = [
+        ", ".join(repr(path.name) for path in paths) for paths in stem_to_paths.values() if len(paths) > 1
+    ]
+    if duplicates:
+        raise ValueError(
+            f"Multiple article files of the same name in {str(directory)!r}: {'; '.join(duplicates)}. "
+            f"Keep only one format per file."
+        )
+    return {stem: paths[0] for stem, paths in sorted(stem_to_paths.items())}
+
+
+def _import_pyarrow() -> None:
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "The columnar storage format requires pyarrow. Install it with 'pip install fundus-evaluation[arrow]'."
+        ) from e
+
+
+def _articles_schema() -> "pa.Schema":
+    import pyarrow as pa
+
+    return pa.schema(
+        [
+            ("article", pa.dictionary(pa.int32(), pa.string())),
+            ("url", pa.string()),
+            ("crawl_date", pa.string()),
+            ("body", pa.list_(pa.string())),
+        ]
+    )
+
+
+def read_table(path: Union[str, Path], memory_map: bool = True) -> "pa.Table":
+    """Reads a columnar file as Arrow table.
+
+    Arrow IPC files are memory-mapped without copying their buffers, such that only accessed slices are read.
+
+    Args:
+        path: The path to the `.arrow` or `.parquet` file.
+        memory_map: If True, the file will be memory-mapped.
+
+    Returns:
+        The Arrow table.
+    """
+    _import_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    if path.suffix == PARQUET_SUFFIX:
+        return pq.read_table(path, memory_map=memory_map)
+
+    source: Union["pa.MemoryMappedFile", "pa.OSFile"] = pa.memory_map(str(path)) if memory_map else pa.OSFile(str(path))
+    return pa.ipc.open_file(source).read_all()
+
+
+def write_table(table: "pa.Table", path: Union[str, Path]) -> None:
+    _import_pyarrow()
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if path.suffix == PARQUET_SUFFIX:
+        pq.write_table(table, path)
+        return
+
+    with pa.OSFile(str(path), "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+
+
+def articles_to_table(articles: Mapping[str, EvaluationArticle]) -> "pa.Table":
+    """Converts articles to an Arrow table sorted by the article identifiers."""
+    _import_pyarrow()
+    import pyarrow as pa
+
+    identifiers = sorted(articles)
+    return pa.table(
+        {
+            "article": pa.array(identifiers, type=pa.string()).dictionary_encode(),
+            "url": [articles[identifier]["url"] for identifier in identifiers],
+            "crawl_date": [articles[identifier]["crawl_date"] for identifier in identifiers],
+            "body": [articles[identifier]["body"] for identifier in identifiers],
+        },
+        schema=_articles_schema(),
+    )
+
+
+def table_to_articles(table: "pa.Table") -> Dict[str, EvaluationArticle]:
+    columns = table.to_pydict()
+    return {
+        str(identifier): {"url": url, "body": body, "crawl_date": crawl_date}
+        for identifier, url, body, crawl_date in zip(
+            columns["article"], columns["url"], columns["body"], columns["crawl_date"]
+        )
+    }
+
+
+def load_columnar_articles(
+    path: Union[str, Path], start: Optional[int] = None, stop: Optional[int] = None
+) -> Dict[str, EvaluationArticle]:
+    """Loads a range of articles from a columnar file.
+
+    Args:
+        path: The path to the `.arrow` or `.parquet` file.
+        start: The index of the first article to load. Per default, the articles are loaded from the beginning.
+        stop: The index after the last article to load. Per default, the articles are loaded until the end.
+
+    Returns:
+        The articles sorted by their article identifier.
+    """
+    table: "pa.Table" = read_table(path)
+    start, stop, _ = slice(start, stop).indices(table.num_rows)
+    return table_to_articles(table.slice(start, max(0, stop - start)))
+
+
+def _iter_json_object_items(path: Union[str, Path], chunk_size: int = 1 << 20) -> Iterator[Tuple[str, Any]]:
+    """Incrementally parses the items of a file containing a JSON object.
+
+    Only the current item and a chunk of the file are held in memory.
+
+    Args:
+        path: The path to the JSON file.
+        chunk_size: The minimum number of characters to read at once.
+
+    Yields:
+        The object's keys and values in the order of the file.
+    """
+    decoder: json.JSONDecoder = json.JSONDecoder()
+    with open(path, "r", encoding="utf-8") as file:
+        buffer: str = ""
+        position: int = 0
+
+        def read() -> bool:
+            nonlocal buffer, position
+            # Reading at least the buffered size keeps the parsing of large values linear
+            chunk: str = file.read(max(chunk_size, len(buffer) - position))
+            buffer, position = buffer[position:] + chunk, 0
+            return bool(chunk)
+
+        def peek() -> str:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer):
+                    return buffer[position]
+                if not read():
+                    raise ValueError(f"Unexpected end of the JSON file {str(path)!r}")
+
+        def decode() -> Any:
+            nonlocal position
+            peek()
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, position)
+                except json.JSONDecodeError:
+                    if read():
+                        continue
+                    raise
+                # A number may continue in the next chunk, e.g. "1" of "1.5e-3" or "1.5e" of "1.5e-3"
+                if (
+                    isinstance(value, (int, float))
+                    and all(character in _NUMBER_CHARACTERS for character in buffer[end:])
+                    and read()
+                ):
+                    continue
+                position = end
+                return value
+
+        def expect(*tokens: str) -> str:
+            nonlocal position
+            token: str = peek()
+            if token not in tokens:
+                raise ValueError(f"Expected one of {tokens} at {token!r} in the JSON file {str(path)!r}")
+            position += 1
+            return token
+
+        def expect_end() -> None:
+            nonlocal position
+            while True:
+                while position < len(buffer) and buffer[position].isspace():
+                    position += 1
+                if position < len(buffer):
+                    raise ValueError(f"Unexpected data after the object in the JSON file {str(path)!r}")
+                if not read():
+                    return
+
+        expect("{")
+        if peek() == "}":
+            position += 1
+            expect_end()
+            return
+        while True:
+            key: Any = decode()
+            if not isinstance(key, str):
+                raise ValueError(f"Expected a string key, but got {key!r} in the JSON file {str(path)!r}")
+            expect(":")
+            yield key, decode()
+            if expect(",", "}") == "}":
+                expect_end()
+                return
+
+
+def iter_evaluation_articles(path: Union[str, Path], batch_size: int = 1024) -> Iterator[Dict[str, EvaluationArticle]]:
+    """Iterates over consecutive batches of articles without loading the entire file.
+
+    Only the current batch is materialized as Python objects. The file has to be sorted by article identifier,
+    as are columnar files and the JSON files written by the `scrape` and `run` entry points, such that the
+    articles are streamed in the same order as `load_evaluation_articles` loads them.
+
+    Args:
+        path: The path to the `.json`, `.arrow` or `.parquet` file.
+        batch_size: The maximum number of articles per batch.
+
+    Yields:
+        The article batches.
+
+    Raises:
+        ValueError: If the articles are not sorted by article identifier.
+    """
+    previous_identifier: Optional[str] = None
+    for batch in _iter_article_batches(path, batch_size):
+        for article_identifier in batch:
+            if previous_identifier is not None and article_identifier <= previous_identifier:
+                raise ValueError(
+                    f"The articles of {str(path)!r} are not sorted by article identifier: "
+                    f"{article_identifier!r} follows {previous_identifier!r}"
+                )
+            previous_identifier = article_identifier
+        yield batch
+
+
+def _iter_article_batches(path: Union[str, Path], batch_size: int) -> Iterator[Dict[str, EvaluationArticle]]:
+    """Iterates over consecutive batches of articles in the order of the file."""
+    if is_columnar(path):
+        table: "pa.Table" = read_table(path)
+        for start in range(0, table.num_rows, batch_size):
+            yield table_to_articles(table.slice(start, batch_size))
+        return
+
+    batch: Dict[str, EvaluationArticle] = {}
+    for article_identifier, article in _iter_json_object_items(path):
+        batch[article_identifier] = article
+        if len(batch) == batch_size:
+            yield batch
+            batch = {}
+    if batch:
+        yield batch
+
+
+def save_evaluation_articles(articles: Mapping[str, EvaluationArticle], path: Union[str, Path]) -> None:
+    """Saves the articles as JSON or columnar file, depending on the path's suffix."""
+    if is_columnar(path):
+        write_table(articles_to_table(articles), path)
+        return
+
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(dict(articles), f, indent=4, ensure_ascii=False)
+
+
+def _decode_dictionaries(table: "pa.Table") -> "pa.Table":
+    """Decodes the dictionary-encoded columns to plain strings."""
+    import pyarrow as pa
+
+    return table.cast(
+        pa.schema(
+            [
+                pa.field(field.name, pa.string()) if pa.types.is_dictionary(field.type) else field
+                for field in table.schema
+            ]
+        )
+    )
+
+
+def load_scores(path: Union[str, Path]) -> pd.DataFrame:
+    """Loads scores as data frame with the columns "scraper", "article" and the score columns.
+
+    Args:
+        path: The path to the `.tsv`, `.arrow` or `.parquet` file.
+
+    Returns:
+        The scores.
+    """
+    if not is_columnar(path):
+        return pd.read_csv(path, sep="\t")
+
+    scores: pd.DataFrame = _decode_dictionaries(read_table(path)).to_pandas()
+    return scores
+
+
+def iter_scores(path: Union[str, Path], chunk_size: int = 100_000) -> Iterator[pd.DataFrame]:
+    """Iterates over consecutive chunks of scores (see `load_scores`) without loading the entire file.
+
+    Args:
+        path: The path to the `.tsv`, `.arrow` or `.parquet` file.
+        chunk_size: The maximum number of rows per chunk.
+
+    Yields:
+        The score chunks.
+    """
+    if not is_columnar(path):
+        with pd.read_csv(path, sep="\t", chunksize=chunk_size) as reader:
+            yield from reader
+        return
+
+    table: "pa.Table" = read_table(path)
+    for start in range(0, table.num_rows, chunk_size):
+        chunk: pd.DataFrame = _decode_dictionaries(table.slice(start, chunk_size)).to_pandas()
+        yield chunk
+
+
+def save_scores(scores: pd.DataFrame, path: Union[str, Path]) -> None:
+    """Saves scores as TSV or columnar file, depending on the path's suffix.
+
+    The scores are expected to have the columns "scraper", "article" (or index levels) and the score columns.
+    In columnar files, the "scraper" and "article" columns are dictionary-encoded.
+    """
+    if not is_columnar(path):
+        scores.to_csv(path, sep="\t", index=scores.index.names != [None])
+        return
+
+    _import_pyarrow()
+    import pyarrow as pa
+
+    table: "pa.Table" = pa.Table.from_pandas(
+        scores.reset_index() if scores.index.names != [None] else scores, preserve_index=False
+    )
+    for column in ("scraper", "article"):
+        if column in table.column_names:
+            index: int = table.column_names.index(column)
+            table = table.set_column(index, column, table.column(column).cast(pa.string()).dictionary_encode())
+    write_table(table, path)
+
+
+def convert(input_path: Union[str, Path], output_path: Union[str, Path]) -> None:
+    """Converts an article or score file between the JSON/TSV and columnar formats.
+
+    The formats are determined by the file suffixes. Columnar articles and scores are distinguished by their schema.
+    """
+    input_path, output_path = Path(input_path), Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    is_articles: bool
+    if input_path.suffix == ".json":
+        is_articles = True
+    elif input_path.suffix == ".tsv":
+        is_articles = False
+    elif is_columnar(input_path):
+        is_articles = "body" in read_table(input_path).column_names
+    else:
+        raise ValueError(f"Unsupported input file format {input_path.suffix!r}")
+
+    supported_suffixes: Tuple[str, ...] = ARTICLES_SUFFIXES if is_articles else SCORES_SUFFIXES
+    if output_path.suffix not in supported_suffixes:
+        raise ValueError(
+            f"Unsupported output file format {output_path.suffix!r} for {'articles' if is_articles else 'scores'}. "
+            f"Supported formats: {', '.join(supported_suffixes)}"
+        )
+
+    if is_articles:
+        save_evaluation_articles(load_evaluation_articles(input_path), output_path)
+    else:
+        save_scores(load_scores(input_path), output_path)
@@ -0,0 +1,362 @@
+import dataclasses
+import html as html_lib
+import random
+import re
+from collections import defaultdict
+from typing import (
+    AbstractSet,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Pattern,
+    Set,
+    Tuple,
+)
+
+from resiliparse.parse.html import DOMNode, HTMLTree, NodeType
+
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    is_optional_paragraph,
+    normalize_whitespaces,
+    remove_optional_paragraph_marker,
+)
+
+BOILERPLATE_TAGS: Final[Tuple[str, ...]] = ("aside", "div", "footer", "form", "header", "nav", "section", "table", "ul")
+MAX_BOILERPLATE_SUBTREES: Final[int] = 32
+MIN_BOILERPLATE_TEXT_LENGTH: Final[int] = 20
+
+_SLOT_PATTERN: Final[Pattern[str]] = re.compile(r"__FUNDUS_SYNTH_(CONTENT|BOILERPLATE)_(\d+)__")
+
+
+class Paragraph(NamedTuple):
+    """A ground truth paragraph of a page template with its DOM subtree."""
+
+    text: str  # Without the optional paragraph marker
+    html: str  # The outer HTML of the paragraph's element
+    tag: str
+    optional: bool
+
+
+class SyntheticParagraph(NamedTuple):
+    template: int  # The index of the paragraph's template
+    paragraph: int  # The index of the paragraph in the template
+    text: Optional[str] = None  # The perturbed text, if any
+
+
+class ExtractionTemplate(NamedTuple):
+    """A scraper's extraction of a page template in terms of the template's paragraphs."""
+
+    extracted: Set[int]  # The indices of the extracted ground truth paragraphs
+    leading_noise: List[str]  # Extracted non-ground truth paragraphs before the first ground truth paragraph
+    trailing_noise: List[str]  # The remaining extracted non-ground truth paragraphs
+
+
+@dataclasses.dataclass
+class PageTemplate:
+    """A dataset page with its ground truth paragraphs and boilerplate subtrees cut out of the DOM.
+
+    The skeleton is the page's serialized HTML with placeholders for the ground truth paragraphs (content slots)
+    and a selection of subtrees without ground truth text (boilerplate slots). Synthetic pages are assembled by
+    filling the slots, such that the synthetic ground truth is consistent with the synthetic HTML.
+    """
+
+    article_identifier: str
+    publisher: str
+    url: str
+    crawl_date: str
+    parts: List[str]  # The skeleton split at the slots, i.e. the static parts and the slots alternately
+    paragraphs: List[Paragraph]
+    boilerplate: List[str]
+    extractions: Dict[str, ExtractionTemplate]
+
+    @classmethod
+    def from_article(
+        cls,
+        article_identifier: str,
+        article: EvaluationArticle,
+        html: str,
+        extractions: Mapping[str, EvaluationArticle],
+        rng: random.Random,
+    ) -> Optional["PageTemplate"]:
+        """Creates the template of a page.
+
+        Args:
+            article_identifier: The article identifier, e.g. "APNews_0.html.gz".
+            article: The ground truth article.
+            html: The page's HTML.
+            extractions: The scrapers' extracted articles of this page.
+            rng: The random number generator selecting the boilerplate subtrees.
+
+        Returns:
+            The template or None if not all ground truth paragraphs can be located in the DOM.
+        """
+        tree: HTMLTree = HTMLTree.parse(html)
+        if tree.body is None:
+            return None
+
+        # Map the normalized texts to the outermost elements with that text in document order
+        text_to_nodes: Dict[str, List[DOMNode]] = defaultdict(list)
+        for node in tree.body.query_selector_all("*"):
+            text: str = normalize_whitespaces(node.text)
+            if text and (node.parent is None or normalize_whitespaces(node.parent.text) != text):
+                text_to_nodes[text].append(node)
+
+        content_nodes: List[DOMNode] = []
+        paragraphs: List[Paragraph] = []
+        for paragraph in article["body"]:
+            text = remove_optional_paragraph_marker(paragraph)
+            candidates: List[DOMNode] = text_to_nodes.get(normalize_whitespaces(text), [])
+            if not candidates:
+                return None
+            node = candidates.pop(0)
+            content_nodes.append(node)
+            paragraphs.append(Paragraph(text, node.html, node.tag, is_optional_paragraph(paragraph)))
+
+        content_node_set: Set[DOMNode] = set(content_nodes)
+        if len(content_node_set) < len(content_nodes) or any(
+            _is_inside(node, content_node_set) for node in content_nodes
+        ):
+            return None
+
+        # Subtrees outside the ground truth that can be duplicated without breaking the ground truth consistency
+        content_ancestors: Set[DOMNode] = {ancestor for node in content_nodes for ancestor in _get_ancestors(node)}
+        boilerplate_nodes: List[DOMNode] = [
+            node
+            for node in tree.body.query_selector_all(",".join(BOILERPLATE_TAGS))
+            if node not in content_ancestors
+            and node not in content_node_set
+            and not _is_inside(node, content_node_set)
+            and len(node.text.strip()) >= MIN_BOILERPLATE_TEXT_LENGTH
+        ]
+        boilerplate_node_set: Set[DOMNode] = set(boilerplate_nodes)
+        boilerplate_nodes = [node for node in boilerplate_nodes if not _is_inside(node, boilerplate_node_set)]
+        boilerplate_nodes = rng.sample(boilerplate_nodes, min(len(boilerplate_nodes), MAX_BOILERPLATE_SUBTREES))
+        boilerplate: List[str] = [node.html for node in boilerplate_nodes]
+
+        for kind, nodes in (("CONTENT", content_nodes), ("BOILERPLATE", boilerplate_nodes)):
+            for index, node in enumerate(nodes):
+                node.parent.replace_child(tree.create_text_node(f"__FUNDUS_SYNTH_{kind}_{index}__"), node)
+
+        return cls(
+            article_identifier=article_identifier,
+            publisher=article_identifier.split("_")[0],
+            url=article["url"],
+            crawl_date=article["crawl_date"],
+            parts=_SLOT_PATTERN.sub(lambda match: f"\0{match.group(1)[0]}{match.group(2)}\0", str(tree)).split("\0"),
+            paragraphs=paragraphs,
+            boilerplate=boilerplate,
+            extractions={
+                scraper_identifier: _create_extraction_template(extraction["body"], paragraphs)
+                for scraper_identifier, extraction in extractions.items()
+            },
+        )
+
+
+def _get_ancestors(node: DOMNode) -> Iterator[DOMNode]:
+    parent: Optional[DOMNode] = node.parent
+    while parent is not None and parent.type == NodeType.ELEMENT:
+        yield parent
+        parent = parent.parent
+
+
+def _is_inside(node: DOMNode, nodes: AbstractSet[DOMNode]) -> bool:
+    """Returns whether the node is a proper descendant of any of the given nodes."""
+    return any(ancestor in nodes for ancestor in _get_ancestors(node))
+
+
+def _create_extraction_template(body: List[str], paragraphs: List[Paragraph]) -> ExtractionTemplate:
+    text_to_indices: Dict[str, List[int]] = defaultdict(list)
+    for index, paragraph in enumerate(paragraphs):
+        text_to_indices[normalize_whitespaces(paragraph.text)].append(index)
+
+    extracted: Set[int] = set()
+    leading_noise: List[str] = []
+    trailing_noise: List[str] = []
+    for extracted_paragraph in body:
+        indices: List[int] = text_to_indices.get(normalize_whitespaces(extracted_paragraph), [])
+        if indices:
+            extracted.add(indices.pop(0))
+        elif extracted:
+            trailing_noise.append(extracted_paragraph)
+        else:
+            leading_noise.append(extracted_paragraph)
+    return ExtractionTemplate(extracted, leading_noise, trailing_noise)
+
+
+@dataclasses.dataclass(frozen=True)
+class SynthesisConfig:
+    """The perturbations of the synthetic articles.
+
+    The rates are probabilities per paragraph.
+    """
+
+    shuffle_rate: float = 0.1  # Share of the paragraphs that are shuffled among each other
+    duplicate_rate: float = 0.05
+    splice_rate: float = 0.1  # Replacement by a paragraph of another page of the same publisher
+    perturb_rate: float = 0.1  # Swap of two words
+    size_factor: Tuple[float, float] = (1.0, 1.0)  # Range of the number of paragraphs relative to the source page
+    optional_paragraphs: Optional[int] = None  # Exact number of optional paragraphs; per default, the source's
+    boilerplate_duplicates: int = 0  # Number of duplicated boilerplate subtrees per page
+
+
+class SyntheticArticle(NamedTuple):
+    article_identifier: str
+    article: EvaluationArticle
+    html: str
+    extractions: Dict[str, EvaluationArticle]
+
+
+class Synthesizer:
+    """Generates synthetic articles by perturbing, shuffling, duplicating and splicing the paragraphs and
+    DOM subtrees of page templates.
+
+    Each synthetic article is derived from a random template of a publisher in round-robin order.
+    The generation is deterministic given the seed and each article only depends on the seed and its index,
+    such that any range of articles can be generated independently.
+    """
+
+    def __init__(self, templates: List[PageTemplate], config: SynthesisConfig = SynthesisConfig(), seed: int = 0):
+        if not templates:
+            raise ValueError("At least one page template is required")
+
+        self.templates = templates
+        self.config = config
+        self.seed = seed
+
+        self._publisher_to_templates: Dict[str, List[int]] = defaultdict(list)
+        for index, template in enumerate(templates):
+            self._publisher_to_templates[template.publisher].append(index)
+        self._publishers: List[str] = sorted(self._publisher_to_templates)
+
+    def generate(self, index: int) -> SyntheticArticle:
+        """Generates the synthetic article with the given index."""
+        rng: random.Random = random.Random(f"{self.seed}:{index}")
+        publisher: str = self._publishers[index % len(self._publishers)]
+        publisher_templates: List[int] = self._publisher_to_templates[publisher]
+        template_index: int = rng.choice(publisher_templates)
+        template: PageTemplate = self.templates[template_index]
+
+        def sample_paragraph() -> SyntheticParagraph:
+            other_index: int = rng.choice(publisher_templates)
+            return SyntheticParagraph(other_index, rng.randrange(len(self.templates[other_index].paragraphs)))
+
+        body: List[SyntheticParagraph] = [
+            SyntheticParagraph(template_index, paragraph_index) for paragraph_index in range(len(template.paragraphs))
+        ]
+
+        # Page size: Splice paragraphs of the publisher's pages or cut a window of the source's paragraphs
+        target_size: int = max(1, round(len(body) * rng.uniform(*self.config.size_factor)))
+        while len(body) < target_size:
+            body.insert(rng.randint(0, len(body)), sample_paragraph())
+        start: int = rng.randint(0, len(body) - target_size)
+        body = body[start : start + target_size]
+
+        body = [sample_paragraph() if rng.random() < self.config.splice_rate else paragraph for paragraph in body]
+        body = [
+            duplicate
+            for paragraph in body
+            for duplicate in ((paragraph, paragraph) if rng.random() < self.config.duplicate_rate else (paragraph,))
+        ]
+
+        shuffled: List[int] = [position for position in range(len(body)) if rng.random() < self.config.shuffle_rate]
+        permutation: List[int] = rng.sample(shuffled, len(shuffled))
+        body_copy: List[SyntheticParagraph] = list(body)
+        for position, new_position in zip(shuffled, permutation):
+            body[new_position] = body_copy[position]
+
+        body = [
+            self._perturb(paragraph, rng) if rng.random() < self.config.perturb_rate else paragraph
+            for paragraph in body
+        ]
+
+        optional: List[bool]
+        if self.config.optional_paragraphs is None:
+            optional = [self._get(paragraph).optional for paragraph in body]
+        else:
+            optional_positions: Set[int] = set(
+                rng.sample(range(len(body)), min(len(body), self.config.optional_paragraphs))
+            )
+            optional = [position in optional_positions for position in range(len(body))]
+
+        # The article identifier has to match the pattern "<publisher>_<number>.html.gz"
+        article_identifier: str = f"{publisher}_{index // len(self._publishers)}.html.gz"
+        article: EvaluationArticle = {
+            "url": f"{template.url}#synthetic-{index}",
+            "body": [
+                f"[{self._text(paragraph)}]" if is_optional else self._text(paragraph)
+                for paragraph, is_optional in zip(body, optional)
+            ],
+            "crawl_date": template.crawl_date,
+        }
+
+        return SyntheticArticle(
+            article_identifier=article_identifier,
+            article=article,
+            html=self._assemble_html(template, body, rng),
+            extractions={
+                scraper_identifier: {
+                    "url": article["url"],
+                    "body": [
+                        *extraction_template.leading_noise,
+                        *(
+                            self._text(paragraph)
+                            for paragraph in body
+                            if scraper_identifier in self.templates[paragraph.template].extractions
+                            and paragraph.paragraph
+                            in self.templates[paragraph.template].extractions[scraper_identifier].extracted
+                        ),
+                        *extraction_template.trailing_noise,
+                    ],
+                    "crawl_date": article["crawl_date"],
+                }
+                for scraper_identifier, extraction_template in template.extractions.items()
+            },
+        )
+
+    def _get(self, paragraph: SyntheticParagraph) -> Paragraph:
+        return self.templates[paragraph.template].paragraphs[paragraph.paragraph]
+
+    def _text(self, paragraph: SyntheticParagraph) -> str:
+        return self._get(paragraph).text if paragraph.text is None else paragraph.text
+
+    def _html(self, paragraph: SyntheticParagraph) -> str:
+        if paragraph.text is None:
+            return self._get(paragraph).html
+        tag: str = self._get(paragraph).tag
+        return f"<{tag}>{html_lib.escape(paragraph.text, quote=False)}</{tag}>"
+
+    def _perturb(self, paragraph: SyntheticParagraph, rng: random.Random) -> SyntheticParagraph:
+        words: List[str] = self._text(paragraph).split()
+        if len(words) < 2:
+            return paragraph
+        first, second = rng.sample(range(len(words)), 2)
+        words[first], words[second] = words[second], words[first]
+        return paragraph._replace(text=" ".join(words))
+
+    def _assemble_html(self, template: PageTemplate, body: List[SyntheticParagraph], rng: random.Random) -> str:
+        # The paragraphs fill the content slots in order and the last slot takes the remaining paragraphs
+        num_slots: int = len(template.paragraphs)
+        slot_contents: List[List[str]] = [[] for _ in range(num_slots)]
+        for position, paragraph in enumerate(body):
+            slot_contents[min(position, num_slots - 1)].append(self._html(paragraph))
+
+        boilerplate_counts: List[int] = [1] * len(template.boilerplate)
+        if template.boilerplate:
+            for _ in range(self.config.boilerplate_duplicates):
+                boilerplate_counts[rng.randrange(len(template.boilerplate))] += 1
+
+        parts: List[str] = []
+        for position, part in enumerate(template.parts):
+            if position % 2 == 0:
+                parts.append(part)
+            elif part[0] == "C":
+                parts.extend(slot_contents[int(part[1:])])
+            else:
+                boilerplate_index: int = int(part[1:])
+                parts.append(template.boilerplate[boilerplate_index] * boilerplate_counts[boilerplate_index])
+        return "".join(parts)
@@ -0,0 +1,285 @@
+import bisect
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import secrets
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from types import TracebackType
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    Final,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Tuple,
+    Type,
+    Union,
+)
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+    from fundus_evaluation.references import ReferenceIndex
+    from fundus_evaluation.scorers import Scorer
+    from fundus_evaluation.scrapers import Scraper
+    from fundus_evaluation.utils import EvaluationArticle
+
+METRICS_FILE_NAME: Final[str] = "metrics.prom"
+TRACES_FILE_NAME: Final[str] = "traces.jsonl"
+METRIC_PREFIX: Final[str] = "fundus_evaluation_"
+
+# Upper bounds of the latency histograms' buckets in seconds
+LATENCY_BUCKETS: Final[Tuple[float, ...]] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+COUNTERS: Final[Dict[str, str]] = {
+    "articles_total": "Number of articles processed by a scraper.",
+    "failures_total": "Number of failed scraper or scorer calls.",
+    "scored_articles_total": "Number of articles scored by a scorer, including cached rows.",
+    "cache_lookups_total": "Number of score cache lookups.",
+    "cache_hits_total": "Number of score cache hits.",
+    "decompressed_bytes_total": "Number of decompressed HTML bytes.",
+}
+HISTOGRAMS: Final[Dict[str, str]] = {
+    "scrape_duration_seconds": "Latency of extracting the body of a single article.",
+    "score_duration_seconds": "Latency of a scorer call on a batch of articles.",
+    "stage_duration_seconds": "Latency of a pipeline stage.",
+}
+
+LabelValues = Tuple[Tuple[str, str], ...]
+
+_current_span: "contextvars.ContextVar[Optional[Span]]" = contextvars.ContextVar("current_span", default=None)
+
+
+def _escape_label_value(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: LabelValues, extra: str = "") -> str:
+    formatted: List[str] = [f'{name}="{_escape_label_value(value)}"' for name, value in labels]
+    if extra:
+        formatted.append(extra)
+    return f"{{{','.join(formatted)}}}" if formatted else ""
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(value)
+
+
+class _Histogram:
+    __slots__ = ("bucket_counts", "count", "sum")
+
+    def __init__(self) -> None:
+        # The last bucket counts the observations above the largest upper bound (+Inf)
+        self.bucket_counts: List[int] = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.count: int = 0
+        self.sum: float = 0.0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(LATENCY_BUCKETS, value)] += 1
+        self.count += 1
+        self.sum += value
+
+
+class Span:
+    """A timed operation of a trace, e.g. a pipeline stage or the extraction of an article."""
+
+    __slots__ = ("trace_id", "span_id", "parent_id", "name", "attributes", "start_time", "status", "_start")
+
+    def __init__(self, name: str, parent: Optional["Span"], attributes: Dict[str, Any]) -> None:
+        self.trace_id: str = secrets.token_hex(16) if parent is None else parent.trace_id
+        self.span_id: str = secrets.token_hex(8)
+        self.parent_id: Optional[str] = None if parent is None else parent.span_id
+        self.name = name
+        self.attributes = attributes
+        self.start_time: float = time.time()
+        self.status: str = "ok"
+        self._start: float = time.perf_counter()
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self._start
+
+    def to_record(self, duration: float) -> Dict[str, Any]:
+        return {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "name": self.name,
+            "start_time": self.start_time,
+            "duration_seconds": duration,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class Telemetry:
+    """Records counters, latency histograms and trace spans of evaluation runs to local files.
+
+    The metrics are periodically written to `metrics.prom` in the Prometheus text exposition format,
+    e.g. for the textfile collector of the node exporter or a scheduler scraping the file.
+    The file is replaced atomically, such that readers never observe a partially written file.
+    Each finished span is appended to `traces.jsonl` as a JSON object with its trace, span and parent identifiers.
+
+    Example:
+        >>> with Telemetry("metrics/") as telemetry:
+        ...     scraper = telemetry.instrument_scraper("fundus", SCRAPERS["fundus"])
+    """
+
+    def __init__(self, output_directory: Union[str, Path], flush_interval: float = 10.0) -> None:
+        self.output_directory = Path(output_directory)
+        self.flush_interval = flush_interval
+
+        self._counters: Dict[str, Dict[LabelValues, float]] = {name: {} for name in COUNTERS}
+        self._histograms: Dict[str, Dict[LabelValues, _Histogram]] = {name: {} for name in HISTOGRAMS}
+        self._lock = threading.Lock()
+        self._last_flush: float = time.monotonic()
+        self._traces_file: Optional[IO[str]] = None
+
+    def __enter__(self) -> "Telemetry":
+        self.output_directory.mkdir(parents=True, exist_ok=True)
+        self._traces_file = (self.output_directory / TRACES_FILE_NAME).open("a", encoding="utf-8")
+        self.flush()
+        return self
+
+    def __exit__(
+        self,
+        exc_type: Optional[Type[BaseException]],
+        exc_val: Optional[BaseException],
+        exc_tb: Optional[TracebackType],
+    ) -> None:
+        self.flush()
+        if self._traces_file is not None:
+            self._traces_file.close()
+            self._traces_file = None
+
+    def increment(self, name: str, value: float = 1, /, **labels: str) -> None:
+        """Increments the counter with the given name and labels, e.g. `increment("cache_hits_total", scorer="wer")`."""
+        label_values: LabelValues = tuple(sorted(labels.items()))
+        with self._lock:
+            counter: Dict[LabelValues, float] = self._counters[name]
+            counter[label_values] = counter.get(label_values, 0) + value
+        self._maybe_flush()
+
+    def observe(self, name: str, value: float, /, **labels: str) -> None:
+        """Records an observation of the histogram with the given name and labels."""
+        label_values: LabelValues = tuple(sorted(labels.items()))
+        with self._lock:
+            histograms: Dict[LabelValues, _Histogram] = self._histograms[name]
+            if label_values not in histograms:
+                histograms[label_values] = _Histogram()
+            histograms[label_values].observe(value)
+        self._maybe_flush()
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes: Any) -> Iterator[Span]:
+        """Traces the enclosed code as a span nested in the current span.
+
+        Exceptions mark the span as failed and are reraised.
+        """
+        span: Span = Span(name, _current_span.get(), attributes)
+        token: contextvars.Token[Optional[Span]] = _current_span.set(span)
+        try:
+            yield span
+        except BaseException:
+            span.status = "error"
+            raise
+        finally:
+            duration: float = span.elapsed
+            _current_span.reset(token)
+            if self._traces_file is not None:
+                line: str = json.dumps(span.to_record(duration), ensure_ascii=False)
+                with self._lock:
+                    self._traces_file.write(f"{line}\n")
+
+    @contextlib.contextmanager
+    def stage(self, name: str, **labels: str) -> Iterator[Span]:
+        """Traces a pipeline stage, e.g. "scrape", and records its latency."""
+        with self.span(name, **labels) as span:
+            try:
+                yield span
+            finally:
+                self.observe("stage_duration_seconds", span.elapsed, stage=name, **labels)
+
+    def instrument_scraper(self, scraper_identifier: str, scraper: "Scraper") -> "Scraper":
+        """Returns the scraper recording a span, the latency and the outcome of each article's extraction."""
+
+        @functools.wraps(scraper)
+        def wrapper(*, url: str, html: Union[str, bytes], publisher_identifier: str, crawl_date: datetime) -> List[str]:
+            labels: Dict[str, str] = {"scraper": scraper_identifier, "publisher": publisher_identifier}
+            with self.span("scrape_article", url=url, **labels) as span:
+                try:
+                    return scraper(url=url, html=html, publisher_identifier=publisher_identifier, crawl_date=crawl_date)
+                except Exception:
+                    self.increment("failures_total", **labels)
+                    raise
+                finally:
+                    self.observe("scrape_duration_seconds", span.elapsed, **labels)
+                    self.increment("articles_total", **labels)
+
+        return wrapper
+
+    def instrument_scorer(self, scorer_identifier: str, scorer: "Scorer") -> "Scorer":
+        """Returns the scorer recording a span, the latency and the outcome of each call."""
+
+        @functools.wraps(scorer)
+        def wrapper(
+            reference_articles: Union[Mapping[str, "EvaluationArticle"], "ReferenceIndex"],
+            hypothesis_articles: Dict[str, "EvaluationArticle"],
+            max_optional_paragraphs: Optional[int] = None,
+        ) -> "pd.DataFrame":
+            with self.span("score_batch", scorer=scorer_identifier, articles=len(hypothesis_articles)) as span:
+                try:
+                    return scorer(reference_articles, hypothesis_articles, max_optional_paragraphs)
+                except Exception:
+                    self.increment("failures_total", scorer=scorer_identifier)
+                    raise
+                finally:
+                    self.observe("score_duration_seconds", span.elapsed, scorer=scorer_identifier)
+
+        return wrapper
+
+    def _maybe_flush(self) -> None:
+        if time.monotonic() - self._last_flush >= self.flush_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the current metrics to the metrics file and flushes the traces file."""
+        lines: List[str] = []
+        with self._lock:
+            for name, description in COUNTERS.items():
+                metric: str = f"{METRIC_PREFIX}{name}"
+                lines.extend((f"# HELP {metric} {description}", f"# TYPE {metric} counter"))
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{metric}{_format_labels(labels)} {_format_value(value)}")
+
+            for name, description in HISTOGRAMS.items():
+                metric = f"{METRIC_PREFIX}{name}"
+                lines.extend((f"# HELP {metric} {description}", f"# TYPE {metric} histogram"))
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative_count: int = 0
+                    for upper_bound, bucket_count in zip(
+                        (*map(repr, LATENCY_BUCKETS), "+Inf"), histogram.bucket_counts
+                    ):
+                        cumulative_count += bucket_count
+                        bucket_labels: str = _format_labels(labels, f'le="{upper_bound}"')
+                        lines.append(f"{metric}_bucket{bucket_labels} {cumulative_count}")
+                    lines.append(f"{metric}_sum{_format_labels(labels)} {histogram.sum!r}")
+                    lines.append(f"{metric}_count{_format_labels(labels)} {histogram.count}")
+
+            if self._traces_file is not None:
+                self._traces_file.flush()
+            self._last_flush = time.monotonic()
+
+        metrics_path: Path = self.output_directory / METRICS_FILE_NAME
+        temporary_path: Path = metrics_path.with_name(f".{METRICS_FILE_NAME}.{os.getpid()}.tmp")
+        temporary_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        os.replace(temporary_path, metrics_path)
@@ -1,22 +1,34 @@
+import codecs
 import gzip
 import json
 import re
 from pathlib import Path
 from typing import (
     AbstractSet,
+    Any,
+    Callable,
     Dict,
+    FrozenSet,
     Iterator,
     List,
+    Match,
     Optional,
     Pattern,
     Tuple,
     TypedDict,
+    TypeVar,
     Union,
 )
 
 import more_itertools
 
 _TOKENIZE_WORDS: Pattern[str] = re.compile(r"\w+", flags=re.UNICODE)
+_HTML_CHARSET: Pattern[bytes] = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w.:-]+)""", flags=re.IGNORECASE)
+
+# The number of leading bytes searched for a charset declaration of non-UTF-8 pages
+HTML_CHARSET_WINDOW: int = 4096
+
+F = TypeVar("F", bound=Callable[..., Any])
 
 
 class EvaluationArticle(TypedDict):
@@ -26,22 +38,70 @@ class EvaluationArticle(TypedDict):
 
 
 def load_evaluation_articles(path: Union[str, Path]) -> Dict[str, EvaluationArticle]:
-    """Loads the evaluation articles from a JSON file.
+    """Loads the evaluation articles from a JSON file or a columnar `.arrow`/`.parquet` file.
 
     Args:
-        path: The path to the JSON file containing the evaluation articles.
+        path: The path to the file containing the evaluation articles.
 
     Returns:
         A dictionary with article identifiers as keys and
         extraction content as EvaluationArticle dictionaries as values.
         The dictionary is sorted by their article identifier key.
     """
+    if Path(path).suffix in (".arrow", ".parquet"):
+        from fundus_evaluation.storage import load_columnar_articles
+
+        return load_columnar_articles(path)
+
     with open(path, "r", encoding="utf-8") as f:
         return dict(sorted(json.load(f).items()))
 
 
 def load_zipped_html(path: Path) -> str:
-    return gzip.decompress(path.read_bytes()).decode("utf-8")
+    return decode_html(load_zipped_html_bytes(path))
+
+
+def load_zipped_html_bytes(path: Path) -> bytes:
+    """Loads the decompressed HTML without decoding it, e.g. for scrapers declared with `with_bytes_input`."""
+    return gzip.decompress(path.read_bytes())
+
+
+def detect_html_encoding(content: bytes) -> str:
+    """Detects the encoding that `decode_html` decodes the HTML with.
+
+    This allows scrapers that parse the HTML from bytes to decode it consistently with the other scrapers.
+    """
+    try:
+        content.decode("utf-8")
+    except UnicodeDecodeError:
+        return _detect_fallback_encoding(content)
+    return "utf-8"
+
+
+def _detect_fallback_encoding(content: bytes) -> str:
+    """Returns the known charset declared in the meta tags of a non-UTF-8 page or Windows-1252."""
+    match: Optional[Match[bytes]] = _HTML_CHARSET.search(content, 0, HTML_CHARSET_WINDOW)
+    if match is not None:
+        charset: str = match.group(1).decode("ascii")
+        try:
+            codecs.lookup(charset)
+        except LookupError:
+            pass
+        else:
+            return charset
+    return "cp1252"
+
+
+def decode_html(content: bytes) -> str:
+    """Decodes the HTML as UTF-8.
+
+    Pages that are not valid UTF-8 are decoded with the charset declared in their meta tags or Windows-1252,
+    replacing undecodable bytes.
+    """
+    try:
+        return content.decode("utf-8")
+    except UnicodeDecodeError:
+        return content.decode(_detect_fallback_encoding(content), errors="replace")
 
 
 def is_optional_paragraph(paragraph: str) -> bool:
@@ -64,16 +124,33 @@ def get_optional_paragraph_indices(body: List[str]) -> Tuple[int, ...]:
     return tuple(index for index, paragraph in enumerate(body) if is_optional_paragraph(paragraph))
 
 
-def get_reference_bodies(body: List[str], max_optional_paragraphs: Optional[int] = None) -> Iterator[List[str]]:
-    optional_paragraph_indices: Tuple[int, ...] = get_optional_paragraph_indices(body)
+def get_removed_paragraph_indices(
+    body: List[str], max_optional_paragraphs: Optional[int] = None
+) -> Iterator[FrozenSet[int]]:
+    """Yields the indices of the optional paragraphs removed from the body for each candidate reference body."""
+    return get_removed_optional_indices(get_optional_paragraph_indices(body), max_optional_paragraphs)
+
 
+def get_removed_optional_indices(
+    optional_paragraph_indices: Tuple[int, ...], max_optional_paragraphs: Optional[int] = None
+) -> Iterator[FrozenSet[int]]:
+    """Yields the subsets of the optional paragraph indices removed for each candidate reference body.
+
+    If there are more optional paragraphs than `max_optional_paragraphs`, only the bodies with all or none of the
+    optional paragraphs are candidates.
+    """
     if max_optional_paragraphs is not None and len(optional_paragraph_indices) > max_optional_paragraphs:
-        yield prepare_body(body)
-        yield prepare_body(body, remove_paragraphs=set(optional_paragraph_indices))
+        yield frozenset()
+        yield frozenset(optional_paragraph_indices)
         return
 
     for remove_indices in more_itertools.powerset(optional_paragraph_indices):
-        yield prepare_body(body, remove_paragraphs=set(remove_indices))
+        yield frozenset(remove_indices)
+
+
+def get_reference_bodies(body: List[str], max_optional_paragraphs: Optional[int] = None) -> Iterator[List[str]]:
+    for remove_indices in get_removed_paragraph_indices(body, max_optional_paragraphs):
+        yield prepare_body(body, remove_paragraphs=remove_indices)
 
 
 def normalize_whitespaces(text: str) -> str:
@@ -90,3 +167,85 @@ def tokenize_words(text: str) -> List[str]:
         The list of word tokens.
     """
     return _TOKENIZE_WORDS.findall(text)
+
+
+def with_preload(preload_function: Callable[[], None], fork_safe: bool = True) -> Callable[[F], F]:
+    """Decorator to attach a function to a scraper or scorer that imports its dependencies and loads its models.
+
+    The attached function is available as the `preload` attribute and should be idempotent.
+    Preloaded state that does not survive a fork, e.g. a started JVM, has to be declared with `fork_safe=False`.
+    Such scrapers and scorers are not preloaded before forking worker processes.
+    """
+
+    def decorator(function: F) -> F:
+        setattr(function, "preload", preload_function)
+        setattr(function, "preload_fork_safe", fork_safe)
+        return function
+
+    return decorator
+
+
+def preload(function: Callable[..., Any], fork_safe_only: bool = False) -> None:
+    """Calls the preload function attached with `with_preload`, if present.
+
+    Args:
+        function: The scraper or scorer.
+        fork_safe_only: If set, the function is only preloaded if its preloaded state survives a fork.
+    """
+    if fork_safe_only and not getattr(function, "preload_fork_safe", True):
+        return
+    preload_function: Callable[[], None] = getattr(function, "preload", lambda: None)
+    preload_function()
+
+
+def with_version(version: str) -> Callable[[F], F]:
+    """Decorator to declare the version of a scraper or scorer as its `__version__` attribute.
+
+    The version keys the cached scores and the extractions of the `run` manifest. It has to be bumped with each
+    change of the function's output, including changes of the helpers it relies on, e.g. `prepare_body`.
+    """
+
+    def decorator(function: F) -> F:
+        setattr(function, "__version__", version)
+        return function
+
+    return decorator
+
+
+def with_bytes_input(function: F) -> F:
+    """Decorator to declare that a scraper accepts the HTML as the raw bytes of the page in addition to text.
+
+    The scrape pipeline then passes the decompressed page without decoding it (see `get_html_input`).
+    Such scrapers decode the bytes with `detect_html_encoding` to be consistent with the other scrapers.
+    """
+    setattr(function, "bytes_input", True)
+    return function
+
+
+def accepts_bytes_input(function: Callable[..., Any]) -> bool:
+    """Returns whether the scraper is declared with `with_bytes_input`."""
+    return bool(getattr(function, "bytes_input", False))
+
+
+def get_html_input(function: Callable[..., Any], content: bytes) -> Union[str, bytes]:
+    """Returns the HTML in the form the scraper accepts, decoding the page only for text scrapers."""
+    return content if accepts_bytes_input(function) else decode_html(content)
+
+
+def with_memory_footprint(megabytes: int) -> Callable[[F], F]:
+    """Decorator to declare the expected resident memory of a worker process running a scraper or scorer.
+
+    The footprint is available as the `memory_footprint` attribute in bytes and includes loaded models and runtimes.
+    It is the initial estimate of memory-budgeted scheduling until the footprint has been measured.
+    """
+
+    def decorator(function: F) -> F:
+        setattr(function, "memory_footprint", megabytes * 1024 * 1024)
+        return function
+
+    return decorator
+
+
+def get_memory_footprint(function: Callable[..., Any]) -> Optional[int]:
+    """Returns the memory footprint in bytes declared with `with_memory_footprint`, if present."""
+    return getattr(function, "memory_footprint", None)
@@ -0,0 +1,101 @@
+import math
+from typing import List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundus_evaluation.aggregation import (
+    DEFAULT_RELATIVE_ACCURACY,
+    MERGE_GROUP_SIZE,
+    ScoreSummary,
+    get_publishers,
+)
+
+QUANTILES: List[float] = [0.0, 0.1, 0.25, 0.5, 0.75, 0.9, 1.0]
+
+
+def generate_scores(num_rows: int, seed: int = 0) -> pd.DataFrame:
+    rng: np.random.Generator = np.random.default_rng(seed)
+    publishers: List[str] = ["APNews", "CNBC", "iNews"]
+    scores: pd.DataFrame = pd.DataFrame(
+        {
+            "scraper": rng.choice(["bte", "fundus", "trafilatura"], size=num_rows),
+            "article": [f"{rng.choice(publishers)}_{index}.html.gz" for index in range(num_rows)],
+            "precision": rng.beta(2, 1, size=num_rows),
+            # Scores spanning several orders of magnitude, exact zeros and missing values
+            "wer": rng.lognormal(0, 2, size=num_rows) * (rng.random(num_rows) > 0.1),
+        }
+    )
+    scores.loc[rng.random(num_rows) < 0.05, "precision"] = np.nan
+    return scores
+
+
+def test_get_publishers() -> None:
+    articles: "pd.Series[str]" = pd.Series(["APNews_0.html.gz", "The_Guardian_12.html.gz", "APNews_0.html.gz"])
+    assert get_publishers(articles).tolist() == ["APNews", "The_Guardian", "APNews"]
+
+
+@pytest.mark.parametrize("num_chunks", [1, 3, MERGE_GROUP_SIZE + 5])
+def test_merged_moments_equal_moments_of_all_scores(num_chunks: int) -> None:
+    scores: pd.DataFrame = generate_scores(2_000)
+    chunks: List[pd.DataFrame] = np.array_split(scores, num_chunks)
+    summary: ScoreSummary = ScoreSummary.merge_all(ScoreSummary.from_scores(chunk) for chunk in chunks)
+
+    for levels in (["scraper"], ["scraper", "publisher"]):
+        expected: pd.DataFrame = (
+            scores.assign(publisher=get_publishers(scores["article"]))
+            .groupby(levels)[["precision", "wer"]]
+            .agg(["count", "mean", "std"])
+        )
+        summarized: pd.DataFrame = summary.summarize(levels, quantiles=[])
+        for column in ("precision", "wer"):
+            for statistic in ("count", "mean", "std"):
+                np.testing.assert_allclose(
+                    summarized[column, statistic].to_numpy(dtype=np.float64),
+                    expected[column, statistic].to_numpy(dtype=np.float64),
+                    rtol=1e-9,
+                    err_msg=f"{column} {statistic} per {levels}",
+                )
+
+
+def test_merge_is_independent_of_the_chunking() -> None:
+    scores: pd.DataFrame = generate_scores(500, seed=1)
+    whole: pd.DataFrame = ScoreSummary.from_scores(scores).summarize()
+    merged: pd.DataFrame = (
+        ScoreSummary.from_scores(scores.iloc[:100])
+        .merge(ScoreSummary.from_scores(scores.iloc[100:101]))
+        .merge(ScoreSummary.from_scores(scores.iloc[101:]))
+        .summarize()
+    )
+    pd.testing.assert_frame_equal(merged, whole, check_exact=False, rtol=1e-9)
+
+
+@pytest.mark.parametrize("num_chunks", [1, 7])
+def test_sketch_quantiles_are_within_the_relative_accuracy(num_chunks: int) -> None:
+    scores: pd.DataFrame = generate_scores(5_000, seed=2)
+    summary: ScoreSummary = ScoreSummary.merge_all(
+        ScoreSummary.from_scores(chunk) for chunk in np.array_split(scores, num_chunks)
+    )
+    estimated: pd.DataFrame = summary.quantiles(["scraper"], QUANTILES)
+
+    for (scraper, column), row in estimated.iterrows():
+        values: List[float] = sorted(scores.loc[scores["scraper"] == scraper, column].dropna())
+        for quantile, estimate in zip(QUANTILES, row):
+            # The sketch estimates the nearest-rank quantile
+            expected: float = values[math.floor(quantile * (len(values) - 1))]
+            assert estimate == pytest.approx(expected, rel=DEFAULT_RELATIVE_ACCURACY, abs=1e-9), (
+                scraper,
+                column,
+                quantile,
+            )
+
+
+def test_merge_rejects_different_relative_accuracies() -> None:
+    scores: pd.DataFrame = generate_scores(10)
+    with pytest.raises(ValueError):
+        ScoreSummary.from_scores(scores, relative_accuracy=0.01).merge(
+            ScoreSummary.from_scores(scores, relative_accuracy=0.02)
+        )
+    with pytest.raises(ValueError):
+        ScoreSummary.merge_all([])
@@ -0,0 +1,145 @@
+from pathlib import Path
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple, Union
+
+import pandas as pd
+import pytest
+
+import fundus_evaluation
+from fundus_evaluation.cache import (
+    ScoreCache,
+    get_scorer_version,
+    hash_article,
+    hash_body,
+    score_with_cache,
+)
+from fundus_evaluation.references import ReferenceIndex
+from fundus_evaluation.utils import EvaluationArticle
+
+REFERENCE_ARTICLES: Dict[str, EvaluationArticle] = {
+    "APNews_0.html.gz": {"url": "", "body": ["First paragraph.", "[Optional paragraph.]"], "crawl_date": ""},
+    "CNBC_1.html.gz": {"url": "", "body": ["Another paragraph."], "crawl_date": ""},
+}
+
+HYPOTHESIS_ARTICLES: Dict[str, EvaluationArticle] = {
+    "APNews_0.html.gz": {"url": "https://apnews.com", "body": ["First paragraph."], "crawl_date": "2024-01-01"},
+    "CNBC_1.html.gz": {"url": "https://cnbc.com", "body": ["Another", "paragraph."], "crawl_date": "2024-01-01"},
+}
+
+
+class CountingScorer:
+    """Scores the number of hypothesis paragraphs and records the scored articles."""
+
+    def __init__(self, version: Optional[str] = "1") -> None:
+        self.__name__ = "score_counting"
+        if version is not None:
+            self.__version__ = version
+        self.calls: List[List[str]] = []
+
+    def __call__(
+        self,
+        reference_articles: Union[Mapping[str, EvaluationArticle], ReferenceIndex],
+        hypothesis_articles: Dict[str, EvaluationArticle],
+        max_optional_paragraphs: Optional[int] = None,
+    ) -> pd.DataFrame:
+        self.calls.append(list(hypothesis_articles))
+        return pd.DataFrame(
+            {"paragraphs": [float(len(article["body"])) for article in hypothesis_articles.values()]},
+            index=pd.Index(list(hypothesis_articles), name="article"),
+        )
+
+
+def score(
+    scorer: CountingScorer,
+    cache: ScoreCache,
+    hypothesis_articles: Dict[str, EvaluationArticle],
+    max_optional_paragraphs: Optional[int] = None,
+) -> Tuple[pd.DataFrame, int]:
+    return score_with_cache(
+        scorer,
+        "counting",
+        ReferenceIndex.from_articles(REFERENCE_ARTICLES, max_optional_paragraphs),
+        hypothesis_articles,
+        {identifier: hash_body(article["body"]) for identifier, article in REFERENCE_ARTICLES.items()},
+        {identifier: hash_article(article) for identifier, article in hypothesis_articles.items()},
+        max_optional_paragraphs,
+        cache,
+    )
+
+
+@pytest.fixture
+def cache(tmp_path: Path) -> Iterator[ScoreCache]:
+    with ScoreCache(tmp_path / "score_cache.sqlite") as score_cache:
+        yield score_cache
+
+
+def test_hash_article_only_depends_on_the_body() -> None:
+    article: EvaluationArticle = HYPOTHESIS_ARTICLES["APNews_0.html.gz"]
+    assert hash_article(article) == hash_article({"url": "other", "body": article["body"], "crawl_date": "other"})
+    assert hash_article(article) != hash_article({**article, "body": ["First paragraph"]})
+    # The paragraph boundaries are part of the content
+    assert hash_body(["a b"]) != hash_body(["a", "b"])
+
+
+def test_make_key_depends_on_all_components() -> None:
+    key: str = ScoreCache.make_key("reference", "hypothesis", "scorer", "1", 4)
+    assert ScoreCache.make_key("reference", "hypothesis", "scorer", "1", 4) == key
+    assert (
+        len(
+            {
+                key,
+                ScoreCache.make_key("other", "hypothesis", "scorer", "1", 4),
+                ScoreCache.make_key("reference", "other", "scorer", "1", 4),
+                ScoreCache.make_key("reference", "hypothesis", "other", "1", 4),
+                ScoreCache.make_key("reference", "hypothesis", "scorer", "2", 4),
+                ScoreCache.make_key("reference", "hypothesis", "scorer", "1", None),
+                # The components are separated, such that they cannot be shifted into each other
+                ScoreCache.make_key("referenc", "ehypothesis", "scorer", "1", 4),
+            }
+        )
+        == 7
+    )
+
+
+def test_cached_scores_equal_computed_scores(cache: ScoreCache) -> None:
+    scorer: CountingScorer = CountingScorer()
+    computed, num_reused = score(scorer, cache, HYPOTHESIS_ARTICLES)
+    assert num_reused == 0
+
+    cached, num_reused = score(scorer, cache, HYPOTHESIS_ARTICLES)
+    assert num_reused == len(HYPOTHESIS_ARTICLES)
+    assert len(scorer.calls) == 1
+    pd.testing.assert_frame_equal(cached, computed)
+
+
+def test_changed_inputs_invalidate_only_their_rows(cache: ScoreCache) -> None:
+    scorer: CountingScorer = CountingScorer()
+    score(scorer, cache, HYPOTHESIS_ARTICLES)
+
+    changed_articles: Dict[str, EvaluationArticle] = {
+        **HYPOTHESIS_ARTICLES,
+        "CNBC_1.html.gz": {"url": "", "body": ["Another paragraph."], "crawl_date": ""},
+    }
+    scores, num_reused = score(scorer, cache, changed_articles)
+    assert num_reused == 1
+    assert scorer.calls[-1] == ["CNBC_1.html.gz"]
+    assert scores.loc["CNBC_1.html.gz", "paragraphs"] == 1.0
+
+    # Another maximum of optional paragraphs invalidates all rows
+    _, num_reused = score(scorer, cache, HYPOTHESIS_ARTICLES, max_optional_paragraphs=0)
+    assert num_reused == 0
+
+
+def test_scorer_version_invalidates_rows(cache: ScoreCache) -> None:
+    score(CountingScorer(version="1"), cache, HYPOTHESIS_ARTICLES)
+
+    bumped_scorer: CountingScorer = CountingScorer(version="2")
+    _, num_reused = score(bumped_scorer, cache, HYPOTHESIS_ARTICLES)
+    assert num_reused == 0
+    assert bumped_scorer.calls == [list(HYPOTHESIS_ARTICLES)]
+
+
+def test_get_scorer_version() -> None:
+    assert get_scorer_version(CountingScorer(version="3")) == "3"
+    # Scorers without a declared version fall back to the package version
+    assert get_scorer_version(CountingScorer(version=None)) == fundus_evaluation.__version__
+    assert all(hasattr(scorer, "__version__") for scorer in fundus_evaluation.SCORERS.values())
@@ -0,0 +1,55 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import List, Set
+
+import pytest
+
+# Modules that must only be imported by the commands that use them
+HEAVY_MODULES: Set[str] = {"pandas", "seaborn", "matplotlib", "fundus_evaluation.scorers"}
+
+# The maximum wall time in seconds of a command that does not load any scraper or scorer
+STARTUP_BUDGET: float = 1.5
+
+SOURCE_DIRECTORY: Path = Path(__file__).parents[1] / "src"
+
+COMMANDS: List[List[str]] = [["--version"], ["score", "--help"]]
+
+
+def run_cli(arguments: List[str], interpreter_options: List[str]) -> "subprocess.CompletedProcess[str]":
+    """Runs the command line interface from the source directory in a fresh interpreter."""
+    python_path: List[str] = [str(SOURCE_DIRECTORY), *filter(None, [os.environ.get("PYTHONPATH")])]
+    return subprocess.run(
+        [sys.executable, *interpreter_options, "-m", "fundus_evaluation", *arguments],
+        capture_output=True,
+        text=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(python_path)),
+        check=True,
+    )
+
+
+@pytest.mark.parametrize("arguments", COMMANDS, ids=" ".join)
+def test_startup_does_not_import_heavy_modules(arguments: List[str]) -> None:
+    process = run_cli(arguments, ["-X", "importtime"])
+    # Each line has the form "import time: <self [us]> | <cumulative [us]> | <indented module name>"
+    imported_modules: Set[str] = {
+        line.rsplit("|", maxsplit=1)[-1].strip()
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    }
+    heavy_modules: List[str] = sorted(
+        module
+        for module in imported_modules
+        if any(module == heavy_module or module.startswith(f"{heavy_module}.") for heavy_module in HEAVY_MODULES)
+    )
+    assert not heavy_modules, f"'evaluate {' '.join(arguments)}' imports {heavy_modules}"
+
+
+@pytest.mark.parametrize("arguments", COMMANDS, ids=" ".join)
+def test_startup_time_budget(arguments: List[str]) -> None:
+    start: float = time.perf_counter()
+    run_cli(arguments, [])
+    elapsed: float = time.perf_counter() - start
+    assert elapsed <= STARTUP_BUDGET, f"'evaluate {' '.join(arguments)}' took {elapsed:.2f}s (budget {STARTUP_BUDGET}s)"
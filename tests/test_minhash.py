@@ -0,0 +1,93 @@
+import itertools
+import random
+from typing import FrozenSet, List, Set, Tuple
+
+import numpy as np
+import numpy.typing as npt
+import pytest
+
+from fundus_evaluation.minhash import (
+    NUM_PERMUTATIONS,
+    LSHIndex,
+    compute_signatures,
+    get_band_parameters,
+    jaccard_similarity,
+    shingle,
+)
+
+
+def generate_shingle_sets(num_sets: int, seed: int) -> List[FrozenSet[int]]:
+    """Generates shingle sets in groups of overlapping sets with a wide range of Jaccard similarities."""
+    rng: random.Random = random.Random(seed)
+    shingle_sets: List[FrozenSet[int]] = []
+    while len(shingle_sets) < num_sets:
+        base: Set[int] = set(rng.sample(range(1 << 32), rng.randrange(1, 60)))
+        shingle_sets.append(frozenset(base))
+        for _ in range(rng.randrange(4)):
+            kept: Set[int] = set(rng.sample(sorted(base), rng.randint(len(base) // 2, len(base))))
+            shingle_sets.append(frozenset(kept | set(rng.sample(range(1 << 32), rng.randrange(5)))))
+    return shingle_sets[:num_sets]
+
+
+def test_shingle() -> None:
+    assert shingle("") == shingle(" — ") == frozenset()
+    assert len(shingle("Single")) == 1
+    # Only the word tokens are shingled
+    assert shingle("A b, c.") == shingle("A b c") != shingle("a b c")
+    assert len(shingle("a b a b")) == 2
+    assert jaccard_similarity(frozenset(), frozenset()) == 0.0
+    assert jaccard_similarity(frozenset({1, 2}), frozenset({2, 3})) == pytest.approx(1 / 3)
+
+
+def test_signature_agreement_approximates_jaccard_similarity() -> None:
+    shingle_sets: List[FrozenSet[int]] = generate_shingle_sets(200, seed=0)
+    signatures: npt.NDArray[np.uint64] = compute_signatures(shingle_sets)
+    assert signatures.shape == (len(shingle_sets), NUM_PERMUTATIONS)
+
+    errors: List[float] = []
+    for first, second in itertools.combinations(range(len(shingle_sets)), 2):
+        agreement: float = float(np.mean(signatures[first] == signatures[second]))
+        errors.append(abs(agreement - jaccard_similarity(shingle_sets[first], shingle_sets[second])))
+    # The agreement is a binomial estimate with a standard deviation of at most sqrt(0.25 / NUM_PERMUTATIONS)
+    assert np.mean(errors) < 0.01
+    assert max(errors) < 0.25
+
+
+def test_signatures_do_not_depend_on_the_other_sets() -> None:
+    shingle_sets: List[FrozenSet[int]] = generate_shingle_sets(20, seed=1)
+    with_empty_sets: List[FrozenSet[int]] = [frozenset()] + shingle_sets[:10] + [frozenset()] + shingle_sets[10:]
+    signatures: npt.NDArray[np.uint64] = compute_signatures(with_empty_sets)
+
+    np.testing.assert_array_equal(np.delete(signatures, [0, 11], axis=0), compute_signatures(shingle_sets))
+    np.testing.assert_array_equal(signatures[0], signatures[11])
+    np.testing.assert_array_equal(compute_signatures([shingle_sets[3]])[0], signatures[4])
+    assert compute_signatures([]).shape == (0, NUM_PERMUTATIONS)
+
+
+@pytest.mark.parametrize("threshold", [0.5, 0.8, 0.9])
+def test_band_parameters_retrieve_the_threshold_similarity(threshold: float) -> None:
+    bands, rows = get_band_parameters(threshold, min_probability=0.9999)
+    assert bands * rows <= NUM_PERMUTATIONS
+    assert 1 - (1 - threshold**rows) ** bands >= 0.9999
+    # One more row per band would miss the minimum probability
+    more_selective_bands: int = NUM_PERMUTATIONS // (rows + 1)
+    assert 1 - (1 - threshold ** (rows + 1)) ** more_selective_bands < 0.9999
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_lsh_index_retrieves_all_similar_pairs(seed: int) -> None:
+    threshold: float = 0.8
+    shingle_sets: List[FrozenSet[int]] = generate_shingle_sets(300, seed)
+    signatures: npt.NDArray[np.uint64] = compute_signatures(shingle_sets)
+    index: LSHIndex = LSHIndex(signatures, *get_band_parameters(threshold))
+
+    similar_pairs: List[Tuple[int, int]] = [
+        (first, second)
+        for first, second in itertools.product(range(len(shingle_sets)), repeat=2)
+        if jaccard_similarity(shingle_sets[first], shingle_sets[second]) >= threshold
+    ]
+    assert len(similar_pairs) > len(shingle_sets)
+    retrieved: List[Set[int]] = [index.query(signature) for signature in signatures]
+    assert [pair for pair in similar_pairs if pair[1] not in retrieved[pair[0]]] == []
+    # The index filters most of the dissimilar pairs
+    assert sum(map(len, retrieved)) < 2 * len(similar_pairs)
@@ -0,0 +1,235 @@
+import collections
+import random
+from typing import Counter, Dict, List, Optional, Set, Tuple
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundus_evaluation.minhash import jaccard_similarity, shingle
+from fundus_evaluation.scorers import (
+    FUZZY_PARAGRAPH_MATCH_THRESHOLD,
+    ConfusionMatrix,
+    _get_summary_level_lcs,
+    score_fuzzy_paragraph_match,
+    score_paragraph_match,
+    score_token_f1,
+)
+from fundus_evaluation.utils import (
+    EvaluationArticle,
+    get_reference_bodies,
+    get_removed_paragraph_indices,
+    prepare_body,
+    tokenize_words,
+)
+
+WORDS: List[str] = ["the", "news", "article", "über", "2024", "a", "b", "c", "d", "e"]
+
+
+def generate_articles(
+    num_articles: int, seed: int
+) -> Tuple[Dict[str, EvaluationArticle], Dict[str, EvaluationArticle]]:
+    """Generates reference articles with optional paragraphs and noisy hypotheses of them."""
+    rng: random.Random = random.Random(seed)
+
+    def generate_paragraph() -> str:
+        # Paragraphs are never empty, but may have no word tokens
+        return " ".join(rng.choice(WORDS) for _ in range(rng.randrange(0, 8))) + rng.choice([".", " —"])
+
+    references: Dict[str, EvaluationArticle] = {}
+    hypotheses: Dict[str, EvaluationArticle] = {}
+    for index in range(num_articles):
+        reference_body: List[str] = [generate_paragraph() for _ in range(rng.randrange(0, 6))]
+        reference_body = [f"[{paragraph}]" if rng.random() < 0.3 else paragraph for paragraph in reference_body]
+        hypothesis_body: List[str] = [paragraph.strip("[]") for paragraph in reference_body if rng.random() < 0.7] + [
+            generate_paragraph() for _ in range(rng.randrange(0, 3))
+        ]
+        rng.shuffle(hypothesis_body)
+        if rng.random() < 0.1:
+            hypothesis_body = []
+
+        article_identifier: str = f"Publisher_{index}.html.gz"
+        references[article_identifier] = {"url": "", "body": reference_body, "crawl_date": ""}
+        hypotheses[article_identifier] = {"url": "", "body": hypothesis_body, "crawl_date": ""}
+    return references, hypotheses
+
+
+def naive_token_f1(
+    reference_body: List[str], hypothesis_body: List[str], max_optional_paragraphs: Optional[int]
+) -> Tuple[float, float, float]:
+    hypothesis_counts: Counter[str] = collections.Counter(
+        token for paragraph in hypothesis_body for token in tokenize_words(paragraph)
+    )
+    candidates: List[Tuple[float, float, float]] = []
+    for body in get_reference_bodies(reference_body, max_optional_paragraphs):
+        reference_counts: Counter[str] = collections.Counter(
+            token for paragraph in body for token in tokenize_words(paragraph)
+        )
+        true_positives: int = sum((reference_counts & hypothesis_counts).values())
+        num_hypothesis_tokens: int = sum(hypothesis_counts.values())
+        num_reference_tokens: int = sum(reference_counts.values())
+        precision: float = true_positives / num_hypothesis_tokens if num_hypothesis_tokens else np.nan
+        recall: float = true_positives / num_reference_tokens if num_reference_tokens else np.nan
+        f1_score: float = 2 * precision * recall / (precision + recall) if precision + recall > 0 else np.nan
+        candidates.append((precision, recall, f1_score))
+    # The first candidate with the best F1-score is selected
+    return max(candidates, key=lambda scores: -np.inf if np.isnan(scores[2]) else scores[2])
+
+
+@pytest.mark.parametrize("max_optional_paragraphs", [None, 0, 1, 4])
+@pytest.mark.parametrize("seed", range(3))
+def test_token_f1_equals_naive_implementation(max_optional_paragraphs: Optional[int], seed: int) -> None:
+    references, hypotheses = generate_articles(50, seed)
+    scores: pd.DataFrame = score_token_f1(references, hypotheses, max_optional_paragraphs)
+
+    assert scores.index.tolist() == list(references)
+    expected: pd.DataFrame = pd.DataFrame.from_dict(
+        {
+            article_identifier: naive_token_f1(
+                references[article_identifier]["body"],
+                hypotheses[article_identifier]["body"],
+                max_optional_paragraphs,
+            )
+            for article_identifier in references
+        },
+        orient="index",
+        columns=["precision", "recall", "f1_score"],
+    )
+    np.testing.assert_allclose(scores.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_token_f1_counts_repeated_tokens_as_multiset() -> None:
+    references: Dict[str, EvaluationArticle] = {"a": {"url": "", "body": ["news news news"], "crawl_date": ""}}
+    hypotheses: Dict[str, EvaluationArticle] = {"a": {"url": "", "body": ["news", "news article"], "crawl_date": ""}}
+    scores: pd.DataFrame = score_token_f1(references, hypotheses)
+    assert scores.loc["a"].tolist() == pytest.approx([2 / 3, 2 / 3, 2 / 3])
+
+
+def generate_fuzzy_articles(
+    num_articles: int, seed: int
+) -> Tuple[Dict[str, EvaluationArticle], Dict[str, EvaluationArticle]]:
+    """Generates long reference paragraphs with identical, slightly changed and unrelated hypothesis paragraphs."""
+    rng: random.Random = random.Random(seed)
+    vocabulary: List[str] = [f"word{index}" for index in range(30)]
+
+    def generate_paragraph() -> str:
+        return " ".join(rng.choice(vocabulary) for _ in range(rng.randrange(1, 25))) + "."
+
+    def change_paragraph(paragraph: str) -> str:
+        change: int = rng.randrange(4)
+        if change == 0:
+            return paragraph
+        if change == 1:
+            return paragraph.replace(".", " Advertisement")
+        if change == 2:
+            return f"“{paragraph}”"
+        words: List[str] = paragraph.split()
+        words[rng.randrange(len(words))] = rng.choice(vocabulary)
+        return " ".join(words)
+
+    references: Dict[str, EvaluationArticle] = {}
+    hypotheses: Dict[str, EvaluationArticle] = {}
+    for index in range(num_articles):
+        reference_body: List[str] = [generate_paragraph() for _ in range(rng.randrange(0, 8))]
+        # Repeated paragraphs match at most once each
+        if reference_body and rng.random() < 0.3:
+            reference_body.append(rng.choice(reference_body))
+        reference_body = [f"[{paragraph}]" if rng.random() < 0.3 else paragraph for paragraph in reference_body]
+        hypothesis_body: List[str] = [
+            change_paragraph(paragraph.strip("[]"))
+            for paragraph in reference_body
+            for _ in range(rng.choice([0, 1, 1, 1, 2]))
+        ] + [generate_paragraph() for _ in range(rng.randrange(0, 3))]
+        rng.shuffle(hypothesis_body)
+
+        article_identifier: str = f"Publisher_{index}.html.gz"
+        references[article_identifier] = {"url": "", "body": reference_body, "crawl_date": ""}
+        hypotheses[article_identifier] = {"url": "", "body": hypothesis_body, "crawl_date": ""}
+    return references, hypotheses
+
+
+def naive_fuzzy_paragraph_match(
+    reference_body: List[str], hypothesis_body: List[str], max_optional_paragraphs: Optional[int]
+) -> Tuple[float, float, float]:
+    reference_paragraphs: List[str] = prepare_body(reference_body)
+    # Compare all pairs of paragraphs instead of retrieving the candidates from an LSH index
+    scored_pairs: List[Tuple[float, bool, int, int]] = []
+    for reference_index, reference_paragraph in enumerate(reference_paragraphs):
+        for hypothesis_index, hypothesis_paragraph in enumerate(hypothesis_body):
+            if reference_paragraph == hypothesis_paragraph:
+                scored_pairs.append((1.0, False, reference_index, hypothesis_index))
+                continue
+            similarity: float = jaccard_similarity(shingle(reference_paragraph), shingle(hypothesis_paragraph))
+            if similarity >= FUZZY_PARAGRAPH_MATCH_THRESHOLD:
+                scored_pairs.append((similarity, True, reference_index, hypothesis_index))
+    scored_pairs.sort(key=lambda pair: (-pair[0], pair[1], pair[2], pair[3]))
+
+    candidates: List[ConfusionMatrix] = []
+    for removed_paragraphs in get_removed_paragraph_indices(reference_body, max_optional_paragraphs):
+        matches: Set[Tuple[int, int]] = set()
+        for _, _, reference_index, hypothesis_index in scored_pairs:
+            if reference_index not in removed_paragraphs and all(
+                reference_index != matched_reference and hypothesis_index != matched_hypothesis
+                for matched_reference, matched_hypothesis in matches
+            ):
+                matches.add((reference_index, hypothesis_index))
+        candidates.append(
+            ConfusionMatrix(
+                true_positives=len(matches),
+                false_positives=len(hypothesis_body) - len(matches),
+                false_negatives=len(reference_paragraphs) - len(removed_paragraphs) - len(matches),
+            )
+        )
+    best: ConfusionMatrix = max(candidates, key=lambda matrix: matrix.f1_score())
+    return best.precision(), best.recall(), best.f1_score()
+
+
+@pytest.mark.parametrize("max_optional_paragraphs", [None, 1])
+@pytest.mark.parametrize("seed", range(3))
+def test_fuzzy_paragraph_match_equals_naive_implementation(max_optional_paragraphs: Optional[int], seed: int) -> None:
+    references, hypotheses = generate_fuzzy_articles(100, seed)
+    scores: pd.DataFrame = score_fuzzy_paragraph_match(references, hypotheses, max_optional_paragraphs)
+
+    assert scores.index.tolist() == list(references)
+    expected: pd.DataFrame = pd.DataFrame.from_dict(
+        {
+            article_identifier: naive_fuzzy_paragraph_match(
+                references[article_identifier]["body"],
+                hypotheses[article_identifier]["body"],
+                max_optional_paragraphs,
+            )
+            for article_identifier in references
+        },
+        orient="index",
+        columns=["precision", "recall", "f1_score"],
+    )
+    np.testing.assert_allclose(scores.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+    # The fuzzy matches include all exact matches, such that the best F1-score cannot decrease
+    exact_scores: pd.DataFrame = score_paragraph_match(references, hypotheses, max_optional_paragraphs)
+    assert (scores["f1_score"].fillna(0) >= exact_scores["f1_score"].fillna(0)).all()
+    assert (scores["f1_score"].fillna(0) > exact_scores["f1_score"].fillna(0)).any()
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_summary_level_lcs_equals_rouge_score(seed: int) -> None:
+    rouge_scorer = pytest.importorskip("rouge_score.rouge_scorer")
+    from rouge_score.tokenizers import DefaultTokenizer
+
+    rng: random.Random = random.Random(seed)
+    scorer = rouge_scorer.RougeScorer(["rougeLsum"], use_stemmer=False)
+    tokenizer: DefaultTokenizer = DefaultTokenizer(use_stemmer=False)
+
+    def generate_summary() -> List[str]:
+        return [" ".join(rng.choice(WORDS[:6]) for _ in range(rng.randrange(8))) for _ in range(rng.randrange(4))]
+
+    for _ in range(300):
+        reference_sentences, hypothesis_sentences = generate_summary(), generate_summary()
+        # The scorer splits the summaries into sentences at newlines
+        expected = scorer.score("\n".join(reference_sentences), "\n".join(hypothesis_sentences))["rougeLsum"]
+        scores: Tuple[float, float, float] = _get_summary_level_lcs(
+            [tokenizer.tokenize(sentence) for sentence in reference_sentences if sentence],
+            [tokenizer.tokenize(sentence) for sentence in hypothesis_sentences if sentence],
+            skip_unshared_tokens=False,
+        )
+        assert scores == pytest.approx((expected.precision, expected.recall, expected.fmeasure))
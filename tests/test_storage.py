@@ -0,0 +1,137 @@
+import json
+import random
+from pathlib import Path
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from fundus_evaluation.storage import (
+    _iter_json_object_items,
+    iter_evaluation_articles,
+    iter_scores,
+    load_scores,
+    save_evaluation_articles,
+    save_scores,
+)
+from fundus_evaluation.utils import EvaluationArticle, load_evaluation_articles
+
+# Values that end at chunk boundaries or contain the object's delimiters in strings
+JSON_OBJECT: Dict[str, Any] = {
+    "CNBC_1.html.gz": {"url": "https://cnbc.com/{a,b}", "body": ['"Quoted", {braced}: [bracketed]'], "crawl_date": ""},
+    'escaped " \\ key': '\\"\n\té\U0001F600',
+    "number": 12345678901234567890,
+    "float": -1.5e-10,
+    "nested": [[], {}, [{"a": [1, 2, {"b": None}]}]],
+    "literals": [True, False, None],
+    "empty string": "",
+    "unicode ключ": "значение",
+}
+
+ARTICLES: Dict[str, EvaluationArticle] = {
+    f"{publisher}_{index}.html.gz": {
+        "url": f"https://{publisher.lower()}.com/{index}",
+        "body": [f"Paragraph {paragraph} of {publisher} {index}. ü" for paragraph in range(index % 3)]
+        + ([f"[Optional paragraph of {publisher}]"] if index % 2 else []),
+        "crawl_date": f"2024-01-0{index + 1} 12:00:00",
+    }
+    for publisher in ("APNews", "CNBC", "iNews")
+    for index in range(5)
+}
+
+
+def write_json(content: Any, path: Path, indent: Any) -> Path:
+    with path.open("w", encoding="utf-8") as file:
+        json.dump(content, file, indent=indent, ensure_ascii=False)
+    return path
+
+
+@pytest.mark.parametrize("indent", [None, 4], ids=["compact", "indented"])
+@pytest.mark.parametrize("chunk_size", [1, 2, 7, 1 << 20])
+def test_iter_json_object_items_equals_json_load(tmp_path: Path, indent: Any, chunk_size: int) -> None:
+    path: Path = write_json(JSON_OBJECT, tmp_path / "object.json", indent)
+    with path.open("r", encoding="utf-8") as file:
+        expected: List[Any] = list(json.load(file).items())
+    assert list(_iter_json_object_items(path, chunk_size=chunk_size)) == expected
+
+
+def generate_value(rng: random.Random, depth: int = 0) -> Any:
+    kind: int = rng.randrange(6 if depth < 3 else 4)
+    if kind == 0:
+        return rng.randint(-(10**12), 10**12)
+    if kind == 1:
+        return rng.choice([rng.uniform(-1e3, 1e3), rng.uniform(-1, 1) * 10.0 ** rng.randint(-20, 20)])
+    if kind == 2:
+        return "".join(rng.choice('ab{}[]:," \\\nü') for _ in range(rng.randrange(10)))
+    if kind == 3:
+        return rng.choice([True, False, None])
+    if kind == 4:
+        return [generate_value(rng, depth + 1) for _ in range(rng.randrange(4))]
+    return {str(index): generate_value(rng, depth + 1) for index in range(rng.randrange(4))}
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_iter_json_object_items_equals_json_load_on_random_objects(tmp_path: Path, seed: int) -> None:
+    rng: random.Random = random.Random(seed)
+    content: Dict[str, Any] = {f"key {index}": generate_value(rng) for index in range(rng.randrange(1, 30))}
+    path: Path = write_json(content, tmp_path / "object.json", rng.choice([None, 2]))
+    with path.open("r", encoding="utf-8") as file:
+        expected: List[Any] = list(json.load(file).items())
+    assert list(_iter_json_object_items(path, chunk_size=rng.randint(1, 16))) == expected
+
+
+@pytest.mark.parametrize("content", ["{}", " \n{ \n } \n"])
+def test_iter_json_object_items_of_empty_object(tmp_path: Path, content: str) -> None:
+    path: Path = tmp_path / "empty.json"
+    path.write_text(content, encoding="utf-8")
+    assert list(_iter_json_object_items(path, chunk_size=1)) == []
+
+
+@pytest.mark.parametrize("content", ["", "[1, 2]", '{"a": 1', '{"a": 1,}', '{"a" 1}', "{1: 2}", '{"a": 1} {"b": 2}'])
+def test_iter_json_object_items_rejects_invalid_json(tmp_path: Path, content: str) -> None:
+    path: Path = tmp_path / "invalid.json"
+    path.write_text(content, encoding="utf-8")
+    with pytest.raises(ValueError):
+        list(_iter_json_object_items(path, chunk_size=2))
+
+
+@pytest.mark.parametrize("suffix", [".json", ".arrow", ".parquet"])
+def test_articles_round_trip(tmp_path: Path, suffix: str) -> None:
+    if suffix != ".json":
+        pytest.importorskip("pyarrow")
+    path: Path = tmp_path / f"articles{suffix}"
+    save_evaluation_articles(ARTICLES, path)
+
+    expected: List[Any] = sorted(ARTICLES.items())
+    assert list(load_evaluation_articles(path).items()) == expected
+    batches: List[Dict[str, EvaluationArticle]] = list(iter_evaluation_articles(path, batch_size=4))
+    assert [len(batch) for batch in batches] == [4, 4, 4, 3]
+    assert [item for batch in batches for item in batch.items()] == expected
+
+
+def test_iter_evaluation_articles_rejects_unsorted_files(tmp_path: Path) -> None:
+    path: Path = write_json(dict(reversed(list(ARTICLES.items()))), tmp_path / "articles.json", 4)
+    with pytest.raises(ValueError, match="not sorted"):
+        list(iter_evaluation_articles(path, batch_size=100))
+
+
+@pytest.mark.parametrize("suffix", [".tsv", ".arrow", ".parquet"])
+def test_scores_round_trip(tmp_path: Path, suffix: str) -> None:
+    if suffix != ".tsv":
+        pytest.importorskip("pyarrow")
+    rng: np.random.Generator = np.random.default_rng(0)
+    scores: pd.DataFrame = pd.DataFrame(
+        {
+            "scraper": np.repeat(["bte", "fundus"], len(ARTICLES)),
+            "article": list(ARTICLES) * 2,
+            "precision": rng.random(2 * len(ARTICLES)),
+            "f1_score": np.where(rng.random(2 * len(ARTICLES)) < 0.2, np.nan, rng.random(2 * len(ARTICLES))),
+        }
+    ).set_index(["scraper", "article"])
+    path: Path = tmp_path / f"scores{suffix}"
+    save_scores(scores, path)
+
+    expected: pd.DataFrame = scores.reset_index()
+    pd.testing.assert_frame_equal(load_scores(path), expected)
+    pd.testing.assert_frame_equal(pd.concat(iter_scores(path, chunk_size=7), ignore_index=True), expected)